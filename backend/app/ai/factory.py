@@ -7,12 +7,15 @@ for language analysis and speech-to-text conversion.
 
 import os
 import logging
+import time
 from enum import Enum
 from typing import Dict, Any, Callable, Optional, Union, BinaryIO
 from pathlib import Path
 
 # Import the speech processor and the shared client getter
-from app.ai.speech.whisper_processor import process_audio as whisper_process_audio
+from app.ai.speech.whisper_processor import process_audio as whisper_process_audio, WHISPER_API_MODEL
+from app.utils.metrics import observe_ai_call, record_ai_tokens, record_audio_seconds
+from app.utils.timing import StageTimer
 # Note: get_openai_client will be used by submodules like gpt/speech later
 
 # Initialize logger
@@ -123,40 +126,54 @@ class AIModelFactory:
             Analysis results.
         """
         model_function = self._models.get(self._current_model_type)
+        model_label = self._current_model_type.value
         
         if model_function is None:
-            logger.error(f"Current model {self._current_model_type.value} is not registered or initialized.")
+            logger.error(f"Current model {model_label} is not registered or initialized.")
             return {
                 "success": False,
-                "error": f"Model {self._current_model_type.value} not available or not initialized.",
-                "model_type": self._current_model_type.value
+                "error": f"Model {model_label} not available or not initialized.",
+                "model_type": model_label
             }
         
+        start = time.perf_counter()
+        success = False
         try:
             # Assuming the registered function can handle include_features
             result = model_function(text, include_features=include_features)
-            if isinstance(result, dict) and "model_type" not in result:
-                 result["model_type"] = self._current_model_type.value
+            if isinstance(result, dict):
+                if "model_type" not in result:
+                    result["model_type"] = model_label
+                success = bool(result.get("success", False))
+                record_ai_tokens(model_label, result.get("usage"))
             return result
         except Exception as e:
-            logger.error(f"Error analyzing text with {self._current_model_type.value}: {str(e)}", exc_info=True)
+            logger.error(f"Error analyzing text with {model_label}: {str(e)}", exc_info=True)
             return {
                 "success": False,
                 "error": str(e),
-                "model_type": self._current_model_type.value
+                "model_type": model_label
             }
+        finally:
+            observe_ai_call(model_label, "analyze_text", time.perf_counter() - start, success)
     
     def process_audio(
         self,
         audio_file: Union[BinaryIO, str, Path],
-        language: Optional[str] = None
+        language: Optional[str] = None,
+        timer: Optional[StageTimer] = None
     ) -> Dict[str, Any]:
         """Process audio file using OpenAI Whisper API via whisper_processor."""
+        start = time.perf_counter()
+        success = False
         try:
-            logger.info(f"Processing audio with Whisper model size configuration: {self._whisper_model_size.value}")
+            logger.debug("Processing audio with Whisper model size configuration: %s", self._whisper_model_size.value)
             model_size_str = str(self._whisper_model_size.value) # whisper_process_audio expects a string
             # whisper_process_audio will use the shared client from openai_init
-            result = whisper_process_audio(audio_file, model_size_str, language)
+            result = whisper_process_audio(audio_file, model_size_str, language, timer=timer)
+            success = bool(result.get("success", False))
+            if success:
+                record_audio_seconds(WHISPER_API_MODEL, result.get("audio_duration"))
             return result
         except Exception as e:
             logger.error(f"Error processing audio: {str(e)}", exc_info=True)
@@ -164,6 +181,8 @@ class AIModelFactory:
                 "success": False,
                 "error": str(e)
             }
+        finally:
+            observe_ai_call(WHISPER_API_MODEL, "process_audio", time.perf_counter() - start, success)
 
 # Create a singleton instance of the factory
 model_factory = AIModelFactory()
@@ -181,14 +200,15 @@ def analyze_text(text: str, include_features: bool = False) -> Dict[str, Any]:
 
 def process_audio(
     audio_file: Union[BinaryIO, str, Path],
-    language: Optional[str] = None
+    language: Optional[str] = None,
+    timer: Optional[StageTimer] = None
 ) -> Dict[str, Any]:
     """
     Standalone function to process audio. Uses the model_factory instance.
     DEPRECATED for external use. Prefer using `model_factory.process_audio()` directly.
     """
     logger.debug("Standalone process_audio function called, deferring to model_factory instance. Consider direct use.")
-    return model_factory.process_audio(audio_file, language)
+    return model_factory.process_audio(audio_file, language, timer=timer)
 
 def set_model(model_type_str: str) -> bool:
     """
@@ -30,7 +30,7 @@ def analyze_with_gpt(text: str, include_features: bool = False) -> Dict[str, Any
         - recommendations: list of recommendations
         - features: (optional) detailed linguistic features if requested
     """
-    logger.info(f"Analyzing text with GPT: {text[:50]}...")
+    logger.debug("Analyzing text with GPT (%d characters)", len(text))
     
     try:
         # Call the GPT-based risk assessment function with features flag
@@ -46,8 +46,7 @@ def analyze_with_gpt(text: str, include_features: bool = False) -> Dict[str, Any
         return result
     
     except Exception as e:
-        logger.error(f"Error in GPT analysis: {str(e)}")
-        logger.exception(e)
+        logger.exception("Error in GPT analysis: %s", e)
         return {
             "success": False,
             "error": f"GPT analysis failed: {str(e)}",
@@ -296,6 +296,13 @@ def calculate_cognitive_risk(text: str, include_features: bool = False) -> Dict[
         if include_features and "linguistic_features" in gpt_data:
             result["features"] = gpt_data["linguistic_features"]
 
+        # Token usage is reported for monitoring by the model factory
+        if response.usage is not None:
+            result["usage"] = {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens
+            }
+
         return result
 
     except Exception as e:
@@ -12,6 +12,8 @@ from typing import Optional
 # Import OpenAI package earlier for type hinting if needed, actual import later
 import openai
 
+from app.utils.tracing import tracing_enabled, instrument_http_client
+
 # Initialize logger
 logger = logging.getLogger(__name__)
 
@@ -44,8 +46,11 @@ def initialize_openai_api() -> bool:
         logger.info(f"Found OpenAI API key starting with: {api_key[:8]}...")
     
     try:
-        # Initialize the shared client
-        shared_openai_client = openai.OpenAI(api_key=api_key, timeout=60.0, max_retries=3)
+        # Initialize the shared client; its HTTP transport is traced when tracing is enabled
+        client_options = {}
+        if tracing_enabled():
+            client_options["http_client"] = instrument_http_client(openai.DefaultHttpxClient())
+        shared_openai_client = openai.OpenAI(api_key=api_key, timeout=60.0, max_retries=3, **client_options)
         logger.info("Shared OpenAI client created.")
         
         # Test API connection with a simple request using the shared client
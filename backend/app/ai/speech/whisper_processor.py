@@ -7,10 +7,13 @@ This module provides functions for speech-to-text conversion using the OpenAI Wh
 import logging
 import os
 import tempfile
+import wave
 from pathlib import Path
 from typing import BinaryIO, Dict, Any, Optional, Union
 
 from app.ai.openai_init import get_openai_client
+from app.utils.timing import StageTimer, timed_stage
+from app.utils.tracing import span
 
 # Import openai only when needed to avoid errors if not installed
 try:
@@ -36,6 +39,25 @@ from pydub import AudioSegment
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Model name used for all Whisper API requests
+WHISPER_API_MODEL = "whisper-1"
+
+def get_wav_duration(wav_path: Union[str, Path]) -> Optional[float]:
+    """
+    Read the duration of a WAV file from its header.
+    
+    Args:
+        wav_path: Path to a WAV file
+    
+    Returns:
+        Duration in seconds, or None if the header cannot be read
+    """
+    try:
+        with wave.open(str(wav_path), "rb") as wav_file:
+            return wav_file.getnframes() / float(wav_file.getframerate())
+    except (wave.Error, OSError, ZeroDivisionError):
+        return None
+
 def preprocess_audio(audio_file: Union[BinaryIO, str, Path]) -> str:
     """
     Preprocess audio file for optimal conversion.
@@ -52,20 +74,23 @@ def preprocess_audio(audio_file: Union[BinaryIO, str, Path]) -> str:
         temp_path = temp_file.name
         temp_file.close()
         
-        # Convert the audio file to WAV format with appropriate settings
-        if isinstance(audio_file, (str, Path)):
-            audio = AudioSegment.from_file(audio_file)
-        else:
-            audio_file.seek(0)  # Reset file pointer
-            audio = AudioSegment.from_file(audio_file)
+        # Convert the audio file to WAV format with appropriate settings (ffmpeg decode)
+        with span("audio.decode"):
+            if isinstance(audio_file, (str, Path)):
+                audio = AudioSegment.from_file(audio_file)
+            else:
+                audio_file.seek(0)  # Reset file pointer
+                audio = AudioSegment.from_file(audio_file)
         
         # Normalize audio and convert to mono with 16kHz sample rate (optimal for Whisper)
-        audio = audio.set_channels(1)
-        audio = audio.set_frame_rate(16000)
-        audio = audio.normalize()
+        with span("audio.transform", duration_seconds=audio.duration_seconds):
+            audio = audio.set_channels(1)
+            audio = audio.set_frame_rate(16000)
+            audio = audio.normalize()
         
-        # Export to WAV format
-        audio.export(temp_path, format="wav")
+        # Export to WAV format (ffmpeg encode)
+        with span("audio.export"):
+            audio.export(temp_path, format="wav")
         
         return temp_path
     
@@ -104,7 +129,7 @@ def transcribe_audio_api(
             "error": "OpenAI client not initialized or available for transcription."
         }
     
-    whisper_model = "whisper-1"
+    whisper_model = WHISPER_API_MODEL
     
     try:
         # API key check is implicitly handled by successful client retrieval
@@ -113,18 +138,15 @@ def transcribe_audio_api(
         options = {}
         if language:
             options["language"] = language
-        logger.info(f"Transcription options: {options}")
         
-        logger.info(f"Transcribing audio file with OpenAI Whisper API: {audio_path}")
         if not os.path.exists(audio_path):
-            logger.error(f"Audio file does not exist: {audio_path}")
+            logger.error("Audio file does not exist: %s", audio_path)
             return {"success": False, "error": f"Audio file not found: {audio_path}"}
         if not os.access(audio_path, os.R_OK):
-            logger.error(f"Audio file is not readable: {audio_path}")
+            logger.error("Audio file is not readable: %s", audio_path)
             return {"success": False, "error": f"Audio file is not readable: {audio_path}"}
         
-        file_size = os.path.getsize(audio_path)
-        logger.info(f"Audio file size: {file_size} bytes for transcription.")
+        logger.debug("Transcribing %s (%d bytes) with options %s", audio_path, os.path.getsize(audio_path), options)
         
         try:
             with open(audio_path, "rb") as audio_file_obj:
@@ -154,7 +176,7 @@ def transcribe_audio_api(
             logger.error(f"General connection error with OpenAI API during transcription: {str(general_conn_err)}")
             return {"success": False, "error": f"Connection error: {str(general_conn_err)}. Check internet connection."}
             
-        logger.info(f"Transcription completed. Text: {response.text[:100]}...")
+        logger.info("Transcription completed (%d characters)", len(response.text))
         return {
             "text": response.text,
             "segments": [], 
@@ -169,7 +191,8 @@ def transcribe_audio_api(
 def process_audio(
     audio_file: Union[BinaryIO, str, Path],
     model_name: str = "base",
-    language: Optional[str] = None
+    language: Optional[str] = None,
+    timer: Optional[StageTimer] = None
 ) -> Dict[str, Any]:
     """
     Process audio file: preprocess and transcribe.
@@ -180,6 +203,7 @@ def process_audio(
         model_name: Whisper model identifier (e.g., 'base', 'whisper-1'). 
                     Used for metadata; the API itself uses 'whisper-1'.
         language: Language code (optional, auto-detect if None)
+        timer: Optional stage timer recording 'preprocessing' and 'transcription'
     
     Returns:
         Dictionary containing transcription results
@@ -197,32 +221,29 @@ def process_audio(
             if not os.path.exists(audio_file):
                 logger.error(f"Audio file not found: {audio_file}")
                 return {"success": False, "error": f"Audio file not found: {audio_file}"}
-            logger.info(f"Processing audio file: {audio_file}")
             file_size = os.path.getsize(audio_file)
-            logger.info(f"Audio file size: {file_size} bytes")
         else: # File-like object
             current_pos = audio_file.tell()
             audio_file.seek(0, os.SEEK_END)
             file_size = audio_file.tell()
             audio_file.seek(current_pos) # Reset to original position
-            logger.info(f"Processing audio from file-like object, size: {file_size} bytes")
+        logger.debug("Processing audio (%d bytes, metadata model: %s)", file_size, model_name)
 
-        logger.info("Preprocessing audio file...")
-        temp_path = preprocess_audio(audio_file)
-        logger.info(f"Audio preprocessed successfully: {temp_path}")
+        with timed_stage(timer, "preprocessing"):
+            temp_path = preprocess_audio(audio_file)
+        logger.debug("Audio preprocessed: %s", temp_path)
         
-        logger.info(f"Transcribing audio (metadata model: {model_name})...")
-        result = transcribe_audio_api(temp_path, language)
+        with timed_stage(timer, "transcription"):
+            result = transcribe_audio_api(temp_path, language)
         
         if not result.get("success", False):
-            logger.error(f"Transcription failed: {result.get('error', 'Unknown error')}")
+            logger.error("Transcription failed: %s", result.get('error', 'Unknown error'))
             return result # Propagate error from transcribe_audio_api
-            
-        logger.info("Audio transcription completed successfully.")
         
         # Add additional metadata to result
         result["model_name"] = model_name # For metadata purposes
         result["file_size"] = file_size
+        result["audio_duration"] = get_wav_duration(temp_path)
         
         return result
     
@@ -234,6 +255,6 @@ def process_audio(
         if temp_path and os.path.exists(temp_path):
             try:
                 os.unlink(temp_path)
-                logger.debug(f"Removed temporary file: {temp_path}")
+                logger.debug("Removed temporary file: %s", temp_path)
             except Exception as e:
                 logger.warning(f"Failed to remove temporary file {temp_path}: {str(e)}") 
\ No newline at end of file
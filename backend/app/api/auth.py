@@ -1,10 +1,10 @@
 """
-Authentication API routes for user registration and login.
+Authentication API routes for user registration, login and session refresh.
 """
 from datetime import timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.models.user import UserCreate, UserResponse, UserInDB
@@ -12,12 +12,17 @@ from app.utils.security import (
     authenticate_user, 
     create_access_token, 
     get_current_active_user,
-    get_password_hash,
+    hash_password,
     get_user_by_email,
+    get_user_by_id,
+    invalidate_user_cache,
+    user_token_claims,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from app.db import connect_to_mongodb, get_database, COLLECTION_USERS
-from app.models.token import Token, TokenData
+from app.models.token import Token, TokenData, RefreshTokenRequest
+from app.services.token_service import RefreshTokenService, InvalidRefreshTokenError
+from app.utils.passwords import PasswordHashingBusyError
 
 router = APIRouter(
     prefix="/auth",
@@ -25,6 +30,13 @@ router = APIRouter(
     responses={401: {"description": "Unauthorized"}},
 )
 
+# Returned when the password hashing pool is saturated
+busy_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Authentication service is busy, please retry shortly",
+    headers={"Retry-After": "1"},
+)
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate) -> Any:
     """
@@ -50,9 +62,14 @@ async def register(user_data: UserCreate) -> Any:
         )
     
     # Create user
+    try:
+        hashed_password = await hash_password(user_data.password)
+    except PasswordHashingBusyError:
+        raise busy_exception
+    
     user_in_db = UserInDB(
         **user_data.dict(exclude={"password"}),
-        hashed_password=get_password_hash(user_data.password)
+        hashed_password=hashed_password
     )
     
     # Insert user into database
@@ -77,12 +94,15 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()) -> Any:
         form_data: The OAuth2 form data containing username (email) and password
         
     Returns:
-        An access token and token type
+        An access token, refresh token and token type
         
     Raises:
         HTTPException: If the credentials are invalid
     """
-    user = await authenticate_user(form_data.username, form_data.password)
+    try:
+        user = await authenticate_user(form_data.username, form_data.password)
+    except PasswordHashingBusyError:
+        raise busy_exception
     
     if not user:
         raise HTTPException(
@@ -91,19 +111,76 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()) -> Any:
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
-    )
+    refresh_token, family_id = await RefreshTokenService.issue(user.id)
     
     # Update last login timestamp
     db = get_database()
     await db[COLLECTION_USERS].update_one(
-        {"_id": user.id},
+        {"$or": [{"id": user.id}, {"_id": user.id}]},
         {"$set": {"last_login": user.updated_at}}
     )
+    invalidate_user_cache(user.id)
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    return _token_response(user, refresh_token, family_id)
+
+@router.post("/refresh", response_model=Token)
+async def refresh(request: RefreshTokenRequest) -> Any:
+    """
+    Exchange a refresh token for a new access token without re-entering the password.
+    
+    The refresh token is rotated: the presented token becomes invalid and a
+    new one is returned. Reusing an old refresh token revokes the session.
+    
+    Args:
+        request: The refresh token issued at login or by the previous refresh
+        
+    Returns:
+        A new access token and refresh token
+        
+    Raises:
+        HTTPException: If the refresh token is invalid or the user is inactive
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    try:
+        user_id, refresh_token, family_id = await RefreshTokenService.rotate(request.refresh_token)
+    except InvalidRefreshTokenError:
+        raise credentials_exception
+    
+    user = await get_user_by_id(user_id)
+    if user is None or not user.is_active:
+        await RefreshTokenService.revoke_family(family_id)
+        raise credentials_exception
+    
+    return _token_response(user, refresh_token, family_id)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(request: RefreshTokenRequest) -> Response:
+    """
+    Revoke the session of a refresh token, including its outstanding access tokens.
+    
+    Args:
+        request: The refresh token of the session to end
+    """
+    await RefreshTokenService.revoke(request.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+def _token_response(user: UserInDB, refresh_token: str, family_id: str) -> dict:
+    """Build the token response for a user's session."""
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data=user_token_claims(user, family_id), expires_delta=access_token_expires
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "expires_in": int(access_token_expires.total_seconds()),
+    }
 
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(current_user: UserInDB = Depends(get_current_active_user)) -> Any:
@@ -2,29 +2,41 @@
 API routes for cognitive training exercises.
 Implements endpoints for Word Recall Challenge, Language Fluency Game, and Memory Match Game.
 """
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError
 
 from app.models.training import (
     DifficultyLevel,
     Exercise,
-    ExerciseSession,
     ExerciseType,
-    ProgressMetrics
+    PerformanceHistory,
+    ProgressMetrics,
+    ProgressTrends,
+    ResponseTimeAnalytics
 )
+from app.services.adaptive_difficulty import recommend_level
 from app.services.cognitive_training_service import CognitiveTrainingService
-from app.utils.security import get_current_user
-from app.models.user import UserInDB
-from app.db import get_database, COLLECTION_TRAINING_SESSIONS
+from app.services.cohort_percentiles import rank_sessions
+from app.services.exercise_pool import take_exercise
+from app.services.exercise_registry import get_exercise_plugin
+from app.services.exercise_store import ExerciseStore
+from app.services.performance_series import get_performance_history, record_sessions
+from app.services.session_writer import store_sessions
+from app.utils.response_times import MAX_RESPONSE_TIMES, NUMPY_AVAILABLE, pack_response_times
+from app.utils.security import get_current_principal
+from app.models.user import AuthenticatedUser
 
 router = APIRouter(prefix="/cognitive-training", tags=["cognitive-training"])
 
+# Maximum number of sessions accepted by the batch endpoint
+MAX_BATCH_SESSIONS = 200
+
 # Request and response models
 class ExerciseRequest(BaseModel):
     """Request model for generating exercises."""
-    difficulty: DifficultyLevel
+    difficulty: Optional[DifficultyLevel] = None  # None picks a level from the user's skill rating
     exercise_type: ExerciseType
 
 class WordRecallAnswerRequest(BaseModel):
@@ -32,6 +44,7 @@ class WordRecallAnswerRequest(BaseModel):
     exercise_id: str
     recalled_words: List[str]
     duration: Optional[int] = None  # Time taken in seconds
+    response_times_ms: Optional[List[float]] = Field(None, max_length=MAX_RESPONSE_TIMES)  # Per-item reaction times
 
 class LanguageAnswerData(BaseModel):
     """Model for language fluency answers for a single category."""
@@ -42,6 +55,7 @@ class LanguageFluencyAnswerRequest(BaseModel):
     exercise_id: str
     answers: Dict[str, List[str]]  # Category name -> list of words
     duration: Optional[int] = None  # Time taken in seconds
+    response_times_ms: Optional[List[float]] = Field(None, max_length=MAX_RESPONSE_TIMES)  # Per-item reaction times
 
 class MemoryMatchAnswerRequest(BaseModel):
     """Request model for submitting memory match answers."""
@@ -54,6 +68,7 @@ class MemoryMatchAnswerRequest(BaseModel):
     time_elapsed: int  # Time taken in seconds
     final_score: int
     accuracy: float  # Percentage of pairs matched
+    response_times_ms: Optional[List[float]] = Field(None, max_length=MAX_RESPONSE_TIMES)  # Per-item reaction times
 
 class CategoryNamingRequest(BaseModel):
     """Request model for submitting Category Naming game results."""
@@ -68,6 +83,7 @@ class CategoryNamingRequest(BaseModel):
     rare_bonus: int
     milestone_bonus: int
     final_score: int
+    response_times_ms: Optional[List[float]] = Field(None, max_length=MAX_RESPONSE_TIMES)  # Per-item reaction times
 
 class SequenceOrderingRequest(BaseModel):
     """Request model for submitting Sequence Ordering game results."""
@@ -85,6 +101,35 @@ class SequenceOrderingRequest(BaseModel):
     perfect_bonus: int
     timed_bonus: int
     final_score: int
+    response_times_ms: Optional[List[float]] = Field(None, max_length=MAX_RESPONSE_TIMES)  # Per-item reaction times
+
+class ReadingComprehensionAnswerRequest(BaseModel):
+    """Request model for submitting Reading Comprehension answers."""
+    exercise_id: str
+    answers: Dict[str, int]  # Question ID -> index of the chosen option
+    duration: Optional[int] = None  # Time taken in seconds
+    response_times_ms: Optional[List[float]] = Field(None, max_length=MAX_RESPONSE_TIMES)  # Per-item reaction times
+
+class VerbalMemoryAnswerRequest(BaseModel):
+    """Request model for submitting Verbal Memory responses."""
+    exercise_id: str
+    responses: List[bool]  # Per shown word: True if answered "seen"
+    duration: Optional[int] = None  # Time taken in seconds
+    response_times_ms: Optional[List[float]] = Field(None, max_length=MAX_RESPONSE_TIMES)  # Per-item reaction times
+
+class SemanticAssociationAnswerRequest(BaseModel):
+    """Request model for submitting Semantic Association answers."""
+    exercise_id: str
+    answers: Dict[str, str]  # Item ID -> chosen option
+    duration: Optional[int] = None  # Time taken in seconds
+    response_times_ms: Optional[List[float]] = Field(None, max_length=MAX_RESPONSE_TIMES)  # Per-item reaction times
+
+class AttentionTaskAnswerRequest(BaseModel):
+    """Request model for submitting Attention Task responses."""
+    exercise_id: str
+    responses: List[bool]  # Per stimulus: True if the user responded
+    duration: Optional[int] = None  # Time taken in seconds
+    response_times_ms: Optional[List[float]] = Field(None, max_length=MAX_RESPONSE_TIMES)  # Reaction time of each response, in order
 
 class ExerciseResultResponse(BaseModel):
     """Response model for exercise evaluation results."""
@@ -93,71 +138,141 @@ class ExerciseResultResponse(BaseModel):
     feedback: str
     details: Dict  # Exercise-specific details
     session_id: str
+    percentile: Optional[float] = None  # Accuracy percentile in the user's age band for the exercise's domain
+
+class BatchSessionItem(BaseModel):
+    """A single completed session in a batch submission."""
+    exercise_type: ExerciseType
+    submission: Dict  # Body of the exercise type's single-game submit endpoint
+    completed_at: Optional[datetime] = None  # When the game was played (defaults to now)
+
+class BatchSubmissionRequest(BaseModel):
+    """Request model for submitting many sessions at once."""
+    sessions: List[BatchSessionItem] = Field(..., min_length=1, max_length=MAX_BATCH_SESSIONS)
+
+class BatchSessionResult(BaseModel):
+    """Outcome of one batch item: its evaluation, or why it was rejected."""
+    index: int
+    result: Optional[ExerciseResultResponse] = None
+    error: Optional[str] = None
+
+class BatchSubmissionResponse(BaseModel):
+    """Response model for batch submissions."""
+    accepted: int
+    rejected: int
+    results: List[BatchSessionResult]
+    progress: ProgressMetrics
 
 @router.post("/exercises", response_model=Exercise, summary="Generate a new cognitive training exercise")
 async def generate_exercise(
     request: ExerciseRequest,
-    current_user: UserInDB = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_principal)
 ):
     """
     Generate a new cognitive training exercise based on type and difficulty.
     
-    - **difficulty**: Difficulty level of the exercise (beginner, intermediate, advanced, expert)
-    - **exercise_type**: Type of exercise (word_recall, language_fluency, memory_match)
+    - **difficulty**: Difficulty level of the exercise (beginner, intermediate, advanced, expert);
+      omit it to adapt the exercise to the user's skill rating
+    - **exercise_type**: Type of exercise (word_recall, language_fluency, memory_match,
+      reading_comprehension, verbal_memory, semantic_association, attention_task)
     """
-    if request.exercise_type == ExerciseType.WORD_RECALL:
-        exercise = CognitiveTrainingService.generate_word_recall_exercise(request.difficulty)
-    elif request.exercise_type == ExerciseType.LANGUAGE_FLUENCY:
-        exercise = CognitiveTrainingService.generate_language_fluency_exercise(request.difficulty)
-    elif request.exercise_type == ExerciseType.MEMORY_MATCH:
-        exercise = CognitiveTrainingService.generate_memory_match_exercise(request.difficulty)
-    else:
+    difficulty, progress = request.difficulty, 0.0
+    if difficulty is None:
+        rating = await CognitiveTrainingService.get_skill_rating(current_user.id, request.exercise_type)
+        difficulty, progress = recommend_level(rating)
+    
+    if get_exercise_plugin(request.exercise_type) is None:
         raise HTTPException(status_code=400, detail="Unsupported exercise type")
     
-    # In a real implementation, save the exercise to a database here
-    return exercise
+    # Served from the pre-generated pools when they are enabled
+    exercise = take_exercise(request.exercise_type, difficulty, progress)
+    
+    # Store the exercise so submissions are evaluated against exactly what was served
+    return await ExerciseStore.save(exercise, current_user.id)
 
 @router.get("/exercises/{exercise_id}", response_model=Exercise, summary="Get a specific exercise")
 async def get_exercise(
     exercise_id: str = Path(..., description="The ID of the exercise to retrieve"),
-    current_user: UserInDB = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_principal)
 ):
     """
     Retrieve a specific cognitive training exercise by ID.
     
     - **exercise_id**: The ID of the exercise to retrieve
     """
-    # In a real implementation, fetch the exercise from a database
-    # For now, we'll return a mock error since we don't have a database implementation
-    raise HTTPException(status_code=404, detail="Exercise not found")
+    exercise = await ExerciseStore.get(exercise_id, current_user.id)
+    if exercise is None:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    return exercise
 
-@router.post("/word-recall/submit", response_model=ExerciseResultResponse, summary="Submit Word Recall Challenge answers")
-async def submit_word_recall(
-    request: WordRecallAnswerRequest,
-    current_user: UserInDB = Depends(get_current_user)
-):
-    """
-    Submit answers for a Word Recall Challenge and get evaluation results.
-    
-    - **exercise_id**: ID of the Word Recall exercise
-    - **recalled_words**: List of words recalled by the user
-    - **duration**: Time taken to complete the exercise in seconds
-    """
-    # Extract difficulty from exercise_id (format: wordrecall-[timestamp]-[random]-[difficulty])
-    exercise_parts = request.exercise_id.split('-')
-    if len(exercise_parts) >= 4:
-        difficulty_str = exercise_parts[-1]
-    else:
-        difficulty_str = 'beginner'
-    
-    # Map the difficulty string to the enum
+def _naive_utc(value: datetime) -> datetime:
+    """Convert a client datetime to the naive UTC used in storage (naive values are taken as UTC)."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _difficulty_from_level(level: str) -> DifficultyLevel:
+    """Map a beginner/intermediate/advanced/expert string to the enum (default beginner)."""
     difficulty_map = {
         'beginner': DifficultyLevel.BEGINNER,
         'intermediate': DifficultyLevel.INTERMEDIATE,
         'advanced': DifficultyLevel.ADVANCED,
         'expert': DifficultyLevel.EXPERT
     }
-    difficulty = difficulty_map.get(difficulty_str.lower(), DifficultyLevel.BEGINNER)
+    return difficulty_map.get(level.lower(), DifficultyLevel.BEGINNER)
+
+def _difficulty_from_game_level(level: str) -> DifficultyLevel:
+    """Map the EASY/MEDIUM/HARD levels used by newer games to the enum (default intermediate)."""
+    difficulty_map = {
+        'EASY': DifficultyLevel.BEGINNER,
+        'MEDIUM': DifficultyLevel.INTERMEDIATE,
+        'HARD': DifficultyLevel.ADVANCED
+    }
+    return difficulty_map.get(level, DifficultyLevel.INTERMEDIATE)
+
+def _stored_difficulty(exercise: Optional[Exercise], exercise_type: ExerciseType) -> Optional[DifficultyLevel]:
+    """Difficulty of a stored exercise of the expected type, if there is one."""
+    if exercise is not None and exercise.exercise_type == exercise_type:
+        return exercise.difficulty
+    return None
+
+def _session_document(user_id: str, exercise_id: str, exercise_type: ExerciseType, difficulty: DifficultyLevel,
+                      duration: float, end_time: datetime, score: float, accuracy: float,
+                      answers: Dict, details: Dict, feedback: str,
+                      response_times: Optional[List[float]] = None) -> Dict:
+    """Build a training_sessions document for a completed exercise."""
+    document = {
+        "user_id": user_id,
+        "exercise_id": exercise_id,
+        "exercise_type": exercise_type,
+        "difficulty": difficulty,
+        "start_time": end_time - timedelta(seconds=duration),
+        "end_time": end_time,
+        "duration": duration,
+        "completed": True,
+        "score": score,
+        "accuracy": accuracy,
+        "answers": answers,
+        "details": details,
+        "feedback": feedback,
+        "created_at": end_time
+    }
+    # Stored as packed float32 rather than an array of doubles
+    packed_times = pack_response_times(response_times)
+    if packed_times is not None:
+        document["response_times"] = packed_times
+    return document
+
+def _legacy_word_recall_exercise(exercise_id: str) -> Exercise:
+    """Rebuild a Word Recall exercise from a client-generated exercise ID."""
+    # Extract difficulty from exercise_id (format: wordrecall-[timestamp]-[random]-[difficulty])
+    exercise_parts = exercise_id.split('-')
+    if len(exercise_parts) >= 4:
+        difficulty_str = exercise_parts[-1]
+    else:
+        difficulty_str = 'beginner'
+    
+    difficulty = _difficulty_from_level(difficulty_str)
     
     # We need to extract the words to evaluate from the request
     # Format: wordrecall-timestamp-random-difficulty-word1-word2-word3...
@@ -170,9 +285,12 @@ async def submit_word_recall(
         exercise = CognitiveTrainingService.generate_word_recall_exercise(difficulty)
         target_words = exercise.content["words"]
     
+    display_time = 30 if difficulty == DifficultyLevel.BEGINNER else 25 if difficulty == DifficultyLevel.INTERMEDIATE else 20 if difficulty == DifficultyLevel.ADVANCED else 15
+    recall_time = 60 if difficulty == DifficultyLevel.BEGINNER else 50 if difficulty == DifficultyLevel.INTERMEDIATE else 45 if difficulty == DifficultyLevel.ADVANCED else 40
+    
     # Create a simplified exercise with just the necessary fields for evaluation
-    exercise = Exercise(
-        id=request.exercise_id,
+    return Exercise(
+        id=exercise_id,
         title=f"{difficulty.capitalize()} Word Recall Challenge",
         description="Memorize a list of words, then recall as many as you can.",
         exercise_type=ExerciseType.WORD_RECALL,
@@ -181,12 +299,21 @@ async def submit_word_recall(
         instructions="Recall the words you memorized.",
         content={
             "words": target_words,
+            "display_time": display_time,
+            "recall_time": recall_time,
             "min_score": 0.6 if difficulty == DifficultyLevel.BEGINNER else 
                        0.65 if difficulty == DifficultyLevel.INTERMEDIATE else
                        0.7 if difficulty == DifficultyLevel.ADVANCED else 0.75
         },
         cognitive_domains=["memory", "recall", "verbal processing"]
     )
+
+def _build_word_recall_session(request: WordRecallAnswerRequest, user_id: str, end_time: datetime,
+                               exercise: Optional[Exercise] = None) -> Dict:
+    """Evaluate a Word Recall submission against its stored exercise and build its session document."""
+    if exercise is None or exercise.exercise_type != ExerciseType.WORD_RECALL:
+        exercise = _legacy_word_recall_exercise(request.exercise_id)
+    difficulty = exercise.difficulty
     
     # Evaluate the session
     evaluation_result = CognitiveTrainingService.evaluate_word_recall_session(
@@ -195,86 +322,34 @@ async def submit_word_recall(
     )
     
     # Calculate actual duration
-    display_time = 30 if difficulty == DifficultyLevel.BEGINNER else 25 if difficulty == DifficultyLevel.INTERMEDIATE else 20 if difficulty == DifficultyLevel.ADVANCED else 15
-    recall_time = 60 if difficulty == DifficultyLevel.BEGINNER else 50 if difficulty == DifficultyLevel.INTERMEDIATE else 45 if difficulty == DifficultyLevel.ADVANCED else 40
-    duration = request.duration if request.duration is not None else display_time + recall_time
-    
-    # Calculate start time from end time and duration
-    end_time = datetime.utcnow()
-    start_time = end_time - timedelta(seconds=duration)
+    duration = request.duration if request.duration is not None else (
+        exercise.content["display_time"] + exercise.content["recall_time"]
+    )
     
-    # Create session record
-    session = ExerciseSession(
-        user_id=current_user.id,
+    return _session_document(
+        user_id=user_id,
         exercise_id=request.exercise_id,
-        start_time=start_time,
+        exercise_type=ExerciseType.WORD_RECALL,
+        difficulty=difficulty,
+        duration=duration,
         end_time=end_time,
-        completed=True,
         score=evaluation_result["score"],
         accuracy=evaluation_result["accuracy"],
-        answers={"recalled_words": request.recalled_words}
-    )
-    
-    # Save session to database
-    db = get_database()
-    session_data = {
-        "user_id": current_user.id,
-        "exercise_id": request.exercise_id,
-        "exercise_type": ExerciseType.WORD_RECALL,
-        "difficulty": difficulty,
-        "start_time": session.start_time,
-        "end_time": session.end_time,
-        "duration": duration,
-        "completed": True,
-        "score": evaluation_result["score"],
-        "accuracy": evaluation_result["accuracy"],
-        "answers": {"recalled_words": request.recalled_words},
-        "details": {
-            "correctly_recalled": evaluation_result["correctly_recalled"],
-            "missed_words": evaluation_result["missed_words"]
-        },
-        "feedback": evaluation_result["feedback"],
-        "created_at": datetime.utcnow()
-    }
-    
-    result = await db[COLLECTION_TRAINING_SESSIONS].insert_one(session_data)
-    session_id = str(result.inserted_id)
-    
-    # Update user's progress metrics
-    await CognitiveTrainingService.update_progress_metrics(
-        user_id=current_user.id,
-        exercise_session=session,
-        evaluation_result=evaluation_result,
-        exercise_type=ExerciseType.WORD_RECALL
-    )
-    
-    # Return the results
-    return ExerciseResultResponse(
-        score=evaluation_result["score"],
-        accuracy=evaluation_result["accuracy"],
-        feedback=evaluation_result["feedback"],
+        answers={"recalled_words": request.recalled_words},
         details={
             "correctly_recalled": evaluation_result["correctly_recalled"],
-            "missed_words": evaluation_result["missed_words"]
+            "missed_words": evaluation_result["missed_words"],
+            "matches": evaluation_result["matches"]
         },
-        session_id=session_id
+        feedback=evaluation_result["feedback"],
+        response_times=request.response_times_ms
     )
 
-@router.post("/language-fluency/submit", response_model=ExerciseResultResponse, summary="Submit Language Fluency Game answers")
-async def submit_language_fluency(
-    request: LanguageFluencyAnswerRequest,
-    current_user: UserInDB = Depends(get_current_user)
-):
-    """
-    Submit answers for a Language Fluency Game and get evaluation results.
-    
-    - **exercise_id**: ID of the Language Fluency exercise
-    - **answers**: Dictionary mapping categories to lists of words
-    - **duration**: Time taken to complete the exercise in seconds
-    """
+def _legacy_language_fluency_exercise(exercise_id: str) -> Exercise:
+    """Rebuild a Language Fluency exercise from a client-generated exercise ID."""
     # Parse the exercise ID
     # Format: langfluency-timestamp-random-difficulty-letter-cat1-cat2-cat3...
-    exercise_parts = request.exercise_id.split('-')
+    exercise_parts = exercise_id.split('-')
     
     # Default values in case of parsing issues
     difficulty_str = 'beginner'
@@ -294,14 +369,7 @@ async def submit_language_fluency(
                 for i in range(5, len(exercise_parts)):
                     categories.append(exercise_parts[i])
     
-    # Map the difficulty string to the enum
-    difficulty_map = {
-        'beginner': DifficultyLevel.BEGINNER,
-        'intermediate': DifficultyLevel.INTERMEDIATE,
-        'advanced': DifficultyLevel.ADVANCED,
-        'expert': DifficultyLevel.EXPERT
-    }
-    difficulty = difficulty_map.get(difficulty_str.lower(), DifficultyLevel.BEGINNER)
+    difficulty = _difficulty_from_level(difficulty_str)
     
     # If no categories were extracted, use fallback by generating a new exercise
     if not categories:
@@ -328,8 +396,8 @@ async def submit_language_fluency(
         time_limit = 40
     
     # Create a structured exercise object for evaluation
-    exercise = Exercise(
-        id=request.exercise_id,
+    return Exercise(
+        id=exercise_id,
         title=f"{difficulty.capitalize()} Language Fluency Game",
         description=f"Generate words starting with the letter '{selected_letter}' in different categories.",
         exercise_type=ExerciseType.LANGUAGE_FLUENCY,
@@ -344,6 +412,14 @@ async def submit_language_fluency(
         },
         cognitive_domains=["verbal fluency", "executive function", "processing speed", "semantic memory"]
     )
+
+def _build_language_fluency_session(request: LanguageFluencyAnswerRequest, user_id: str, end_time: datetime,
+                                    exercise: Optional[Exercise] = None) -> Dict:
+    """Evaluate a Language Fluency submission against its stored exercise and build its session document."""
+    if exercise is None or exercise.exercise_type != ExerciseType.LANGUAGE_FLUENCY:
+        exercise = _legacy_language_fluency_exercise(request.exercise_id)
+    difficulty = exercise.difficulty
+    time_limit = exercise.content["time_limit"]
     
     # Evaluate the session
     evaluation_result = CognitiveTrainingService.evaluate_language_fluency_session(
@@ -354,87 +430,25 @@ async def submit_language_fluency(
     # Calculate actual duration
     duration = request.duration if request.duration is not None else time_limit
     
-    # Calculate start time from end time and duration
-    end_time = datetime.utcnow()
-    start_time = end_time - timedelta(seconds=duration)
-    
-    # Create session record
-    session = ExerciseSession(
-        user_id=current_user.id,
+    return _session_document(
+        user_id=user_id,
         exercise_id=request.exercise_id,
-        start_time=start_time,
+        exercise_type=ExerciseType.LANGUAGE_FLUENCY,
+        difficulty=difficulty,
+        duration=duration,
         end_time=end_time,
-        completed=True,
-        score=evaluation_result["score"],
-        accuracy=evaluation_result["accuracy"],
-        answers={"category_answers": request.answers}
-    )
-    
-    # Save session to database
-    db = get_database()
-    session_data = {
-        "user_id": current_user.id,
-        "exercise_id": request.exercise_id,
-        "exercise_type": ExerciseType.LANGUAGE_FLUENCY,
-        "difficulty": difficulty,
-        "start_time": session.start_time,
-        "end_time": session.end_time,
-        "duration": duration,
-        "completed": True,
-        "score": evaluation_result["score"],
-        "accuracy": evaluation_result["accuracy"],
-        "answers": {"category_answers": request.answers},
-        "details": {"category_results": evaluation_result["category_results"]},
-        "feedback": evaluation_result["feedback"],
-        "created_at": datetime.utcnow()
-    }
-    
-    result = await db[COLLECTION_TRAINING_SESSIONS].insert_one(session_data)
-    session_id = str(result.inserted_id)
-    
-    # Update user's progress metrics
-    await CognitiveTrainingService.update_progress_metrics(
-        user_id=current_user.id,
-        exercise_session=session,
-        evaluation_result=evaluation_result,
-        exercise_type=ExerciseType.LANGUAGE_FLUENCY
-    )
-    
-    # Return the results
-    return ExerciseResultResponse(
         score=evaluation_result["score"],
         accuracy=evaluation_result["accuracy"],
-        feedback=evaluation_result["feedback"],
+        answers={"category_answers": request.answers},
         details={"category_results": evaluation_result["category_results"]},
-        session_id=session_id
+        feedback=evaluation_result["feedback"],
+        response_times=request.response_times_ms
     )
 
-@router.post("/memory-match/submit", response_model=ExerciseResultResponse, summary="Submit Memory Match Game results")
-async def submit_memory_match(
-    request: MemoryMatchAnswerRequest,
-    current_user: UserInDB = Depends(get_current_user)
-):
-    """
-    Submit results for a Memory Match Game and get evaluation results.
-    
-    - **exercise_id**: ID of the Memory Match exercise
-    - **difficulty**: Difficulty level played
-    - **game_mode**: Game mode (relaxed, timed, challenge)
-    - **total_pairs**: Total number of pairs in the game
-    - **matched_pairs**: Number of pairs successfully matched
-    - **moves_used**: Total number of moves/flips made
-    - **time_elapsed**: Time taken to complete the game in seconds
-    - **final_score**: Final score calculated by the frontend
-    - **accuracy**: Percentage of pairs matched (0-100)
-    """
-    # Map difficulty string to enum
-    difficulty_map = {
-        'beginner': DifficultyLevel.BEGINNER,
-        'intermediate': DifficultyLevel.INTERMEDIATE,
-        'advanced': DifficultyLevel.ADVANCED,
-        'expert': DifficultyLevel.EXPERT
-    }
-    difficulty = difficulty_map.get(request.difficulty.lower(), DifficultyLevel.BEGINNER)
+def _build_memory_match_session(request: MemoryMatchAnswerRequest, user_id: str, end_time: datetime,
+                                exercise: Optional[Exercise] = None) -> Dict:
+    """Evaluate a Memory Match submission and build its session document."""
+    difficulty = _stored_difficulty(exercise, ExerciseType.MEMORY_MATCH) or _difficulty_from_level(request.difficulty)
     
     # Create a structured exercise object for evaluation
     exercise = Exercise(
@@ -464,17 +478,13 @@ async def submit_memory_match(
         accuracy=request.accuracy
     )
     
-    # Calculate start time from end time and duration
-    end_time = datetime.utcnow()
-    start_time = end_time - timedelta(seconds=request.time_elapsed)
-    
-    # Create session record
-    session = ExerciseSession(
-        user_id=current_user.id,
+    return _session_document(
+        user_id=user_id,
         exercise_id=request.exercise_id,
-        start_time=start_time,
+        exercise_type=ExerciseType.MEMORY_MATCH,
+        difficulty=difficulty,
+        duration=request.time_elapsed,
         end_time=end_time,
-        completed=True,
         score=evaluation_result["score"],
         accuracy=evaluation_result["accuracy"],
         answers={
@@ -482,212 +492,92 @@ async def submit_memory_match(
             "total_pairs": request.total_pairs,
             "moves_used": request.moves_used,
             "game_mode": request.game_mode
-        }
-    )
-    
-    # Save session to database
-    db = get_database()
-    session_data = {
-        "user_id": current_user.id,
-        "exercise_id": request.exercise_id,
-        "exercise_type": ExerciseType.MEMORY_MATCH,
-        "difficulty": difficulty,
-        "start_time": session.start_time,
-        "end_time": session.end_time,
-        "duration": request.time_elapsed,
-        "completed": True,
-        "score": evaluation_result["score"],
-        "accuracy": evaluation_result["accuracy"],
-        "answers": {
-            "matched_pairs": request.matched_pairs,
-            "total_pairs": request.total_pairs,
-            "moves_used": request.moves_used,
-            "game_mode": request.game_mode
         },
-        "details": {
-            "final_score": request.final_score,
-            "efficiency": evaluation_result.get("efficiency", 0),
-            "speed_rating": evaluation_result.get("speed_rating", "average")
-        },
-        "feedback": evaluation_result["feedback"],
-        "created_at": datetime.utcnow()
-    }
-    
-    result = await db[COLLECTION_TRAINING_SESSIONS].insert_one(session_data)
-    session_id = str(result.inserted_id)
-    
-    # Update user's progress metrics
-    await CognitiveTrainingService.update_progress_metrics(
-        user_id=current_user.id,
-        exercise_session=session,
-        evaluation_result=evaluation_result,
-        exercise_type=ExerciseType.MEMORY_MATCH
-    )
-    
-    # Return the results
-    return ExerciseResultResponse(
-        score=evaluation_result["score"],
-        accuracy=evaluation_result["accuracy"],
-        feedback=evaluation_result["feedback"],
         details={
             "final_score": request.final_score,
             "efficiency": evaluation_result.get("efficiency", 0),
             "speed_rating": evaluation_result.get("speed_rating", "average")
         },
-        session_id=session_id
+        feedback=evaluation_result["feedback"],
+        response_times=request.response_times_ms
     )
 
-@router.post("/category-naming/submit", response_model=ExerciseResultResponse, summary="Submit Category Naming Game results")
-async def submit_category_naming(
-    request: CategoryNamingRequest,
-    current_user: UserInDB = Depends(get_current_user)
-):
-    """
-    Submit results for a Category Naming Game and get evaluation results.
+def _build_category_naming_session(request: CategoryNamingRequest, user_id: str, end_time: datetime,
+                                   exercise: Optional[Exercise] = None) -> Dict:
+    """Evaluate a Category Naming submission and build its session document."""
+    difficulty = _stored_difficulty(exercise, ExerciseType.CATEGORY_NAMING) or _difficulty_from_game_level(request.difficulty)
+    expected_entries = 10 if difficulty == DifficultyLevel.BEGINNER else 15 if difficulty == DifficultyLevel.INTERMEDIATE else 20
     
-    - **exercise_id**: ID of the Category Naming exercise
-    - **category_id**: Category ID used in the game
-    - **difficulty**: Difficulty level (EASY, MEDIUM, HARD)
-    - **time_limit**: Time limit in seconds
-    - **time_elapsed**: Time taken to complete the game
-    - **correct_entries**: List of correct entries
-    - **rare_entries_count**: Number of rare entries
-    - **base_score**: Base score from correct entries
-    - **rare_bonus**: Bonus points from rare entries
-    - **milestone_bonus**: Milestone bonus points
-    - **final_score**: Final score calculated
-    """
-    # Convert difficulty format
-    difficulty_map = {
-        'EASY': DifficultyLevel.BEGINNER,
-        'MEDIUM': DifficultyLevel.INTERMEDIATE,
-        'HARD': DifficultyLevel.ADVANCED
-    }
-    difficulty = difficulty_map.get(request.difficulty, DifficultyLevel.INTERMEDIATE)
+    # Validate the client's entries against the local embedding index; when it
+    # is unavailable the client's entries and score are used as reported
+    validation = CognitiveTrainingService.validate_category_naming_entries(
+        request.category_id, request.correct_entries
+    )
+    if validation is not None:
+        correct_entries = validation["accepted"]
+        rare_entries = validation["rare_count"]
+        base_score = len(correct_entries)
+        rare_bonus = rare_entries * 2
+        milestone_bonus = 10 if len(correct_entries) >= expected_entries else 0
+        final_score = base_score + rare_bonus + milestone_bonus
+    else:
+        correct_entries = request.correct_entries
+        rare_entries = request.rare_entries_count
+        base_score = request.base_score
+        rare_bonus = request.rare_bonus
+        milestone_bonus = request.milestone_bonus
+        final_score = request.final_score
     
     # Calculate accuracy based on correct entries and time limit
     # A higher number of entries in less time means higher accuracy
     time_percentage = min(1.0, request.time_limit / max(1, request.time_elapsed))
-    expected_entries = 10 if difficulty == DifficultyLevel.BEGINNER else 15 if difficulty == DifficultyLevel.INTERMEDIATE else 20
-    entry_percentage = min(1.0, len(request.correct_entries) / expected_entries)
+    entry_percentage = min(1.0, len(correct_entries) / expected_entries)
     
     # Weighted accuracy calculation (60% entries, 40% time efficiency)
     accuracy = (entry_percentage * 0.6 + time_percentage * 0.4) * 100
     
     # Generate feedback based on the number of correct entries
-    if len(request.correct_entries) >= expected_entries * 1.25:
+    if len(correct_entries) >= expected_entries * 1.25:
         feedback = "Outstanding! Your semantic fluency is excellent."
-    elif len(request.correct_entries) >= expected_entries:
+    elif len(correct_entries) >= expected_entries:
         feedback = "Great job! You have strong semantic memory skills."
-    elif len(request.correct_entries) >= expected_entries * 0.75:
+    elif len(correct_entries) >= expected_entries * 0.75:
         feedback = "Good effort! Keep practicing to improve your word retrieval speed."
     else:
         feedback = "Nice start! Regular practice will help improve your semantic fluency."
     
-    # Calculate start time from end time and time elapsed
-    end_time = datetime.utcnow()
-    start_time = end_time - timedelta(seconds=request.time_elapsed)
-    
-    # Prepare result details
     details = {
-        "total_entries": len(request.correct_entries),
-        "rare_entries": request.rare_entries_count,
-        "base_score": request.base_score,
-        "rare_bonus": request.rare_bonus,
-        "milestone_bonus": request.milestone_bonus,
-        "category_id": request.category_id
+        "total_entries": len(correct_entries),
+        "rare_entries": rare_entries,
+        "base_score": base_score,
+        "rare_bonus": rare_bonus,
+        "milestone_bonus": milestone_bonus,
+        "category_id": request.category_id,
+        "server_validated": validation is not None
     }
+    if validation is not None:
+        details["rejected_entries"] = validation["rejected"]
+        details["similarities"] = validation["similarities"]
     
-    # Create session record
-    session = ExerciseSession(
-        user_id=current_user.id,
+    return _session_document(
+        user_id=user_id,
         exercise_id=request.exercise_id,
-        start_time=start_time,
+        exercise_type=ExerciseType.CATEGORY_NAMING,
+        difficulty=difficulty,
+        duration=request.time_elapsed,
         end_time=end_time,
-        completed=True,
-        score=request.final_score,
+        score=final_score,
         accuracy=accuracy,
-        answers={"correct_entries": request.correct_entries}
-    )
-    
-    # Save session to database
-    db = get_database()
-    session_data = {
-        "user_id": current_user.id,
-        "exercise_id": request.exercise_id,
-        "exercise_type": ExerciseType.CATEGORY_NAMING,
-        "difficulty": difficulty,
-        "start_time": session.start_time,
-        "end_time": session.end_time,
-        "duration": request.time_elapsed,
-        "completed": True,
-        "score": request.final_score,
-        "accuracy": accuracy,
-        "answers": {"correct_entries": request.correct_entries},
-        "details": details,
-        "feedback": feedback,
-        "created_at": datetime.utcnow()
-    }
-    
-    result = await db[COLLECTION_TRAINING_SESSIONS].insert_one(session_data)
-    session_id = str(result.inserted_id)
-    
-    # Create evaluation result structure
-    evaluation_result = {
-        "score": request.final_score,
-        "accuracy": accuracy,
-        "feedback": feedback,
-        "correctly_named": len(request.correct_entries),
-        "rare_entries": request.rare_entries_count
-    }
-    
-    # Update user's progress metrics
-    await CognitiveTrainingService.update_progress_metrics(
-        user_id=current_user.id,
-        exercise_session=session,
-        evaluation_result=evaluation_result,
-        exercise_type=ExerciseType.CATEGORY_NAMING
-    )
-    
-    # Return the results
-    return ExerciseResultResponse(
-        score=request.final_score,
-        accuracy=accuracy,
-        feedback=feedback,
+        answers={"correct_entries": request.correct_entries},
         details=details,
-        session_id=session_id
+        feedback=feedback,
+        response_times=request.response_times_ms
     )
 
-@router.post("/sequence-ordering/submit", response_model=ExerciseResultResponse, summary="Submit Sequence Ordering Game results")
-async def submit_sequence_ordering(
-    request: SequenceOrderingRequest,
-    current_user: UserInDB = Depends(get_current_user)
-):
-    """
-    Submit results for a Sequence Ordering Game and get evaluation results.
-    
-    - **exercise_id**: ID of the Sequence Ordering exercise
-    - **challenge_id**: Challenge ID used in the game
-    - **difficulty**: Difficulty level (EASY, MEDIUM, HARD)
-    - **game_mode**: Game mode (relaxed, timed, challenge)
-    - **user_order**: Order of step IDs as arranged by user
-    - **moves_used**: Total number of moves/flips made
-    - **time_elapsed**: Time taken to complete the game in seconds
-    - **correct_count**: Number of correct steps
-    - **total_steps**: Total number of steps in the game
-    - **accuracy**: Percentage accuracy
-    - **base_points**: Base points from correct steps
-    - **perfect_bonus**: Perfect bonus points
-    - **timed_bonus**: Timed bonus points
-    - **final_score**: Final score calculated
-    """
-    # Convert difficulty format
-    difficulty_map = {
-        'EASY': DifficultyLevel.BEGINNER,
-        'MEDIUM': DifficultyLevel.INTERMEDIATE,
-        'HARD': DifficultyLevel.ADVANCED
-    }
-    difficulty = difficulty_map.get(request.difficulty, DifficultyLevel.INTERMEDIATE)
+def _build_sequence_ordering_session(request: SequenceOrderingRequest, user_id: str, end_time: datetime,
+                                     exercise: Optional[Exercise] = None) -> Dict:
+    """Evaluate a Sequence Ordering submission and build its session document."""
+    difficulty = _stored_difficulty(exercise, ExerciseType.SEQUENCE_ORDERING) or _difficulty_from_game_level(request.difficulty)
     
     # Create a structured exercise object for evaluation
     exercise = Exercise(
@@ -720,216 +610,435 @@ async def submit_sequence_ordering(
         timed_bonus=request.timed_bonus
     )
     
-    # Calculate start time from end time and duration
-    end_time = datetime.utcnow()
-    start_time = end_time - timedelta(seconds=request.time_elapsed)
-    
-    # Create session record
-    session = ExerciseSession(
-        user_id=current_user.id,
+    return _session_document(
+        user_id=user_id,
         exercise_id=request.exercise_id,
-        start_time=start_time,
+        exercise_type=ExerciseType.SEQUENCE_ORDERING,
+        difficulty=difficulty,
+        duration=request.time_elapsed,
         end_time=end_time,
-        completed=True,
         score=evaluation_result["score"],
         accuracy=evaluation_result["accuracy"],
         answers={
             "user_order": request.user_order,
             "moves_used": request.moves_used,
             "game_mode": request.game_mode
-        }
-    )
-    
-    # Save session to database
-    db = get_database()
-    session_data = {
-        "user_id": current_user.id,
-        "exercise_id": request.exercise_id,
-        "exercise_type": ExerciseType.SEQUENCE_ORDERING,
-        "difficulty": difficulty,
-        "start_time": session.start_time,
-        "end_time": session.end_time,
-        "duration": request.time_elapsed,
-        "completed": True,
-        "score": evaluation_result["score"],
-        "accuracy": evaluation_result["accuracy"],
-        "answers": {
-            "user_order": request.user_order,
-            "moves_used": request.moves_used,
-            "game_mode": request.game_mode
         },
-        "details": {
+        details={
             "final_score": request.final_score,
             "efficiency": evaluation_result.get("efficiency", 0),
             "speed_rating": evaluation_result.get("speed_rating", "average")
         },
-        "feedback": evaluation_result["feedback"],
-        "created_at": datetime.utcnow()
-    }
-    
-    result = await db[COLLECTION_TRAINING_SESSIONS].insert_one(session_data)
-    session_id = str(result.inserted_id)
+        feedback=evaluation_result["feedback"],
+        response_times=request.response_times_ms
+    )
+
+def _build_registered_session(exercise_type: ExerciseType, request: BaseModel, user_id: str, end_time: datetime,
+                              exercise: Optional[Exercise] = None) -> Dict:
+    """
+    Evaluate a submission with its type's registered evaluator and build its session document.
     
-    # Update user's progress metrics
-    await CognitiveTrainingService.update_progress_metrics(
-        user_id=current_user.id,
-        exercise_session=session,
-        evaluation_result=evaluation_result,
-        exercise_type=ExerciseType.SEQUENCE_ORDERING
+    Used by exercise types that have no client-generated legacy exercises, so
+    the stored exercise is required.
+    """
+    if exercise is None or exercise.exercise_type != exercise_type:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    answers = request.dict(exclude={"exercise_id", "duration", "response_times_ms"})
+    evaluation_result = get_exercise_plugin(exercise_type).evaluate(
+        exercise, {**answers, "response_times_ms": request.response_times_ms}
     )
     
-    # Return the results
-    return ExerciseResultResponse(
+    return _session_document(
+        user_id=user_id,
+        exercise_id=request.exercise_id,
+        exercise_type=exercise_type,
+        difficulty=exercise.difficulty,
+        duration=request.duration if request.duration is not None else exercise.estimated_duration,
+        end_time=end_time,
         score=evaluation_result["score"],
         accuracy=evaluation_result["accuracy"],
-        feedback=evaluation_result["feedback"],
+        answers=answers,
         details={
-            "final_score": request.final_score,
-            "efficiency": evaluation_result.get("efficiency", 0),
-            "speed_rating": evaluation_result.get("speed_rating", "average")
+            key: value for key, value in evaluation_result.items()
+            if key not in ("score", "accuracy", "feedback")
         },
-        session_id=session_id
+        feedback=evaluation_result["feedback"],
+        response_times=request.response_times_ms
+    )
+
+def _build_reading_comprehension_session(request: ReadingComprehensionAnswerRequest, user_id: str,
+                                         end_time: datetime, exercise: Optional[Exercise] = None) -> Dict:
+    """Evaluate a Reading Comprehension submission and build its session document."""
+    return _build_registered_session(ExerciseType.READING_COMPREHENSION, request, user_id, end_time, exercise)
+
+def _build_verbal_memory_session(request: VerbalMemoryAnswerRequest, user_id: str,
+                                 end_time: datetime, exercise: Optional[Exercise] = None) -> Dict:
+    """Evaluate a Verbal Memory submission and build its session document."""
+    return _build_registered_session(ExerciseType.VERBAL_MEMORY, request, user_id, end_time, exercise)
+
+def _build_semantic_association_session(request: SemanticAssociationAnswerRequest, user_id: str,
+                                        end_time: datetime, exercise: Optional[Exercise] = None) -> Dict:
+    """Evaluate a Semantic Association submission and build its session document."""
+    return _build_registered_session(ExerciseType.SEMANTIC_ASSOCIATION, request, user_id, end_time, exercise)
+
+def _build_attention_task_session(request: AttentionTaskAnswerRequest, user_id: str,
+                                  end_time: datetime, exercise: Optional[Exercise] = None) -> Dict:
+    """Evaluate an Attention Task submission and build its session document."""
+    return _build_registered_session(ExerciseType.ATTENTION_TASK, request, user_id, end_time, exercise)
+
+# Submission model and session builder per exercise type, shared by the
+# single-game submit endpoints and the batch endpoint
+SUBMISSION_HANDLERS = {
+    ExerciseType.WORD_RECALL: (WordRecallAnswerRequest, _build_word_recall_session),
+    ExerciseType.LANGUAGE_FLUENCY: (LanguageFluencyAnswerRequest, _build_language_fluency_session),
+    ExerciseType.MEMORY_MATCH: (MemoryMatchAnswerRequest, _build_memory_match_session),
+    ExerciseType.CATEGORY_NAMING: (CategoryNamingRequest, _build_category_naming_session),
+    ExerciseType.SEQUENCE_ORDERING: (SequenceOrderingRequest, _build_sequence_ordering_session),
+    ExerciseType.READING_COMPREHENSION: (ReadingComprehensionAnswerRequest, _build_reading_comprehension_session),
+    ExerciseType.VERBAL_MEMORY: (VerbalMemoryAnswerRequest, _build_verbal_memory_session),
+    ExerciseType.SEMANTIC_ASSOCIATION: (SemanticAssociationAnswerRequest, _build_semantic_association_session),
+    ExerciseType.ATTENTION_TASK: (AttentionTaskAnswerRequest, _build_attention_task_session),
+}
+
+def _result_response(session_data: Dict, session_id: str, percentile: Optional[float] = None) -> ExerciseResultResponse:
+    """Build the evaluation response for a stored session."""
+    return ExerciseResultResponse(
+        score=session_data["score"],
+        accuracy=session_data["accuracy"],
+        feedback=session_data["feedback"],
+        details=session_data["details"],
+        session_id=session_id,
+        percentile=percentile
+    )
+
+async def _submit_session(session_data: Dict) -> ExerciseResultResponse:
+    """Store a single session, update the user's progress and build the response."""
+    session_id = (await store_sessions([session_data]))[0]
+    await record_sessions([session_data])
+    percentile = (await rank_sessions(session_data["user_id"], [session_data]))[0]
+    
+    # Update user's progress metrics
+    await CognitiveTrainingService.record_sessions_progress(session_data["user_id"], [session_data])
+    
+    return _result_response(session_data, session_id, percentile)
+
+@router.post("/word-recall/submit", response_model=ExerciseResultResponse, summary="Submit Word Recall Challenge answers")
+async def submit_word_recall(
+    request: WordRecallAnswerRequest,
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Submit answers for a Word Recall Challenge and get evaluation results.
+    
+    - **exercise_id**: ID of the Word Recall exercise
+    - **recalled_words**: List of words recalled by the user
+    - **duration**: Time taken to complete the exercise in seconds
+    - **response_times_ms**: Optional per-item reaction times in milliseconds
+    """
+    exercise = await ExerciseStore.get(request.exercise_id, current_user.id)
+    session_data = _build_word_recall_session(request, current_user.id, datetime.utcnow(), exercise)
+    return await _submit_session(session_data)
+
+@router.post("/language-fluency/submit", response_model=ExerciseResultResponse, summary="Submit Language Fluency Game answers")
+async def submit_language_fluency(
+    request: LanguageFluencyAnswerRequest,
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Submit answers for a Language Fluency Game and get evaluation results.
+    
+    - **exercise_id**: ID of the Language Fluency exercise
+    - **answers**: Dictionary mapping categories to lists of words
+    - **duration**: Time taken to complete the exercise in seconds
+    - **response_times_ms**: Optional per-item reaction times in milliseconds
+    """
+    exercise = await ExerciseStore.get(request.exercise_id, current_user.id)
+    session_data = _build_language_fluency_session(request, current_user.id, datetime.utcnow(), exercise)
+    return await _submit_session(session_data)
+
+@router.post("/memory-match/submit", response_model=ExerciseResultResponse, summary="Submit Memory Match Game results")
+async def submit_memory_match(
+    request: MemoryMatchAnswerRequest,
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Submit results for a Memory Match Game and get evaluation results.
+    
+    - **exercise_id**: ID of the Memory Match exercise
+    - **difficulty**: Difficulty level played
+    - **game_mode**: Game mode (relaxed, timed, challenge)
+    - **total_pairs**: Total number of pairs in the game
+    - **matched_pairs**: Number of pairs successfully matched
+    - **moves_used**: Total number of moves/flips made
+    - **time_elapsed**: Time taken to complete the game in seconds
+    - **final_score**: Final score calculated by the frontend
+    - **accuracy**: Percentage of pairs matched (0-100)
+    - **response_times_ms**: Optional per-item reaction times in milliseconds
+    """
+    exercise = await ExerciseStore.get(request.exercise_id, current_user.id)
+    session_data = _build_memory_match_session(request, current_user.id, datetime.utcnow(), exercise)
+    return await _submit_session(session_data)
+
+@router.post("/category-naming/submit", response_model=ExerciseResultResponse, summary="Submit Category Naming Game results")
+async def submit_category_naming(
+    request: CategoryNamingRequest,
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Submit results for a Category Naming Game and get evaluation results.
+    
+    - **exercise_id**: ID of the Category Naming exercise
+    - **category_id**: Category ID used in the game
+    - **difficulty**: Difficulty level (EASY, MEDIUM, HARD)
+    - **time_limit**: Time limit in seconds
+    - **time_elapsed**: Time taken to complete the game
+    - **correct_entries**: List of correct entries
+    - **rare_entries_count**: Number of rare entries
+    - **base_score**: Base score from correct entries
+    - **rare_bonus**: Bonus points from rare entries
+    - **milestone_bonus**: Milestone bonus points
+    - **final_score**: Final score calculated
+    - **response_times_ms**: Optional per-item reaction times in milliseconds
+    """
+    exercise = await ExerciseStore.get(request.exercise_id, current_user.id)
+    session_data = _build_category_naming_session(request, current_user.id, datetime.utcnow(), exercise)
+    return await _submit_session(session_data)
+
+@router.post("/sequence-ordering/submit", response_model=ExerciseResultResponse, summary="Submit Sequence Ordering Game results")
+async def submit_sequence_ordering(
+    request: SequenceOrderingRequest,
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Submit results for a Sequence Ordering Game and get evaluation results.
+    
+    - **exercise_id**: ID of the Sequence Ordering exercise
+    - **challenge_id**: Challenge ID used in the game
+    - **difficulty**: Difficulty level (EASY, MEDIUM, HARD)
+    - **game_mode**: Game mode (relaxed, timed, challenge)
+    - **user_order**: Order of step IDs as arranged by user
+    - **moves_used**: Total number of moves/flips made
+    - **time_elapsed**: Time taken to complete the game in seconds
+    - **correct_count**: Number of correct steps
+    - **total_steps**: Total number of steps in the game
+    - **accuracy**: Percentage accuracy
+    - **base_points**: Base points from correct steps
+    - **perfect_bonus**: Perfect bonus points
+    - **timed_bonus**: Timed bonus points
+    - **final_score**: Final score calculated
+    - **response_times_ms**: Optional per-item reaction times in milliseconds
+    """
+    exercise = await ExerciseStore.get(request.exercise_id, current_user.id)
+    session_data = _build_sequence_ordering_session(request, current_user.id, datetime.utcnow(), exercise)
+    return await _submit_session(session_data)
+
+@router.post("/reading-comprehension/submit", response_model=ExerciseResultResponse, summary="Submit Reading Comprehension answers")
+async def submit_reading_comprehension(
+    request: ReadingComprehensionAnswerRequest,
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Submit answers for a Reading Comprehension exercise and get evaluation results.
+    
+    - **exercise_id**: ID of the Reading Comprehension exercise
+    - **answers**: Dictionary mapping question IDs to the index of the chosen option
+    - **duration**: Time taken to complete the exercise in seconds
+    - **response_times_ms**: Optional per-item reaction times in milliseconds
+    """
+    exercise = await ExerciseStore.get(request.exercise_id, current_user.id)
+    session_data = _build_reading_comprehension_session(request, current_user.id, datetime.utcnow(), exercise)
+    return await _submit_session(session_data)
+
+@router.post("/verbal-memory/submit", response_model=ExerciseResultResponse, summary="Submit Verbal Memory responses")
+async def submit_verbal_memory(
+    request: VerbalMemoryAnswerRequest,
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Submit responses for a Verbal Memory exercise and get evaluation results.
+    
+    - **exercise_id**: ID of the Verbal Memory exercise
+    - **responses**: For each word shown, true if the user answered "seen"
+    - **duration**: Time taken to complete the exercise in seconds
+    - **response_times_ms**: Optional per-item reaction times in milliseconds
+    """
+    exercise = await ExerciseStore.get(request.exercise_id, current_user.id)
+    session_data = _build_verbal_memory_session(request, current_user.id, datetime.utcnow(), exercise)
+    return await _submit_session(session_data)
+
+@router.post("/semantic-association/submit", response_model=ExerciseResultResponse, summary="Submit Semantic Association answers")
+async def submit_semantic_association(
+    request: SemanticAssociationAnswerRequest,
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Submit answers for a Semantic Association exercise and get evaluation results.
+    
+    - **exercise_id**: ID of the Semantic Association exercise
+    - **answers**: Dictionary mapping item IDs to the chosen option
+    - **duration**: Time taken to complete the exercise in seconds
+    - **response_times_ms**: Optional per-item reaction times in milliseconds
+    """
+    exercise = await ExerciseStore.get(request.exercise_id, current_user.id)
+    session_data = _build_semantic_association_session(request, current_user.id, datetime.utcnow(), exercise)
+    return await _submit_session(session_data)
+
+@router.post("/attention-task/submit", response_model=ExerciseResultResponse, summary="Submit Attention Task responses")
+async def submit_attention_task(
+    request: AttentionTaskAnswerRequest,
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Submit responses for an Attention Task and get evaluation results.
+    
+    - **exercise_id**: ID of the Attention Task exercise
+    - **responses**: For each stimulus, true if the user responded
+    - **response_times_ms**: Reaction time of each response in milliseconds, in order
+    - **duration**: Time taken to complete the exercise in seconds
+    """
+    exercise = await ExerciseStore.get(request.exercise_id, current_user.id)
+    session_data = _build_attention_task_session(request, current_user.id, datetime.utcnow(), exercise)
+    return await _submit_session(session_data)
+
+@router.post("/sessions/batch", response_model=BatchSubmissionResponse, summary="Submit many exercise sessions at once")
+async def submit_sessions_batch(
+    request: BatchSubmissionRequest,
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Submit a batch of completed sessions of mixed types, e.g. games played offline.
+    
+    Each item is validated and evaluated like its single-game endpoint; invalid
+    items are reported individually without rejecting the batch. Valid sessions
+    are stored with one insert_many and the user's progress is updated once.
+    
+    - **sessions**: Items with the exercise type, the single-game submission
+      payload and optionally the time the game was completed
+    """
+    now = datetime.utcnow()
+    results: List[BatchSessionResult] = []
+    submissions = []
+    
+    for index, item in enumerate(request.sessions):
+        handler = SUBMISSION_HANDLERS.get(item.exercise_type)
+        if handler is None:
+            results.append(BatchSessionResult(index=index, error="Unsupported exercise type"))
+            continue
+        
+        submission_model, build_session = handler
+        try:
+            submission = submission_model(**item.submission)
+        except ValidationError as e:
+            results.append(BatchSessionResult(index=index, error=str(e)))
+            continue
+        
+        submissions.append((index, item, submission, build_session))
+        results.append(BatchSessionResult(index=index))
+    
+    # Load every stored exercise of the batch with one query
+    exercises = await ExerciseStore.get_many(
+        (submission.exercise_id for _, _, submission, _ in submissions), current_user.id
+    )
+    
+    accepted: List[Dict] = []
+    accepted_indexes: List[int] = []
+    for index, item, submission, build_session in submissions:
+        # Games played offline keep their completion time (never in the future)
+        end_time = min(_naive_utc(item.completed_at), now) if item.completed_at else now
+        try:
+            session_data = build_session(submission, current_user.id, end_time, exercises.get(submission.exercise_id))
+        except HTTPException as e:
+            results[index] = BatchSessionResult(index=index, error=e.detail)
+            continue
+        accepted.append(session_data)
+        accepted_indexes.append(index)
+    
+    if accepted:
+        session_ids = await store_sessions(accepted)
+        await record_sessions(accepted)
+        percentiles = await rank_sessions(current_user.id, accepted)
+        for index, session_data, session_id, percentile in zip(accepted_indexes, accepted, session_ids, percentiles):
+            results[index] = BatchSessionResult(
+                index=index,
+                result=_result_response(session_data, session_id, percentile)
+            )
+        progress = await CognitiveTrainingService.record_sessions_progress(current_user.id, accepted)
+    else:
+        progress = await CognitiveTrainingService.get_progress_metrics(current_user.id)
+    
+    return BatchSubmissionResponse(
+        accepted=len(accepted),
+        rejected=len(request.sessions) - len(accepted),
+        results=results,
+        progress=progress
     )
 
 @router.get("/progress", response_model=ProgressMetrics, summary="Get user's training progress metrics")
 async def get_progress_metrics(
-    current_user: UserInDB = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_principal)
 ):
     """
     Get the current user's cognitive training progress metrics.
+    
+    Metrics are read from the per-user aggregate maintained at submit time.
     """
-    # Fetch metrics from the database
-    db = get_database()
-    
-    # Get all user's training sessions
-    user_sessions = await db[COLLECTION_TRAINING_SESSIONS].find({"user_id": current_user.id}).to_list(length=100)
-    
-    if not user_sessions:
-        # Return default metrics if user has no sessions
-        return ProgressMetrics(
-            user_id=current_user.id,
-            total_sessions=0,
-            total_time_spent=0,
-            average_scores={},
-            performance_trends={},
-            strengths=[],
-            areas_for_improvement=[],
-            consistency_score=0.0
-        )
-    
-    # Calculate metrics from sessions
-    total_sessions = len(user_sessions)
-    total_time_spent = sum(session.get("duration", 0) for session in user_sessions)
-    
-        # Calculate average scores per exercise type using accuracy (which is consistently percentage-based)
-    exercise_scores = {}
-    for session in user_sessions:
-        exercise_type = session.get("exercise_type")
-        if exercise_type:
-            if exercise_type not in exercise_scores:
-                exercise_scores[exercise_type] = []
-            # Use accuracy instead of score for consistent percentage-based averaging
-            accuracy = session.get("accuracy", 0)
-            # Ensure accuracy is in percentage format (0-100)
-            if accuracy <= 1.0:
-                accuracy = accuracy * 100  # Convert from decimal to percentage
-            exercise_scores[exercise_type].append(accuracy)
-
-    average_scores = {
-        ex_type: sum(scores) / len(scores) if scores else 0 
-        for ex_type, scores in exercise_scores.items()
-    }
+    return await CognitiveTrainingService.get_progress_metrics(current_user.id)
+
+@router.get("/progress/trends", response_model=ProgressTrends, summary="Get user's daily performance trends")
+async def get_progress_trends(
+    days: int = Query(90, ge=1, le=3650, description="Number of most recent days to include"),
+    window: int = Query(7, ge=1, le=90, description="Moving average window in active days"),
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Get daily accuracy and moving-average trends per exercise type.
     
-    # Calculate performance trends (last 10 sessions per exercise type)
-    performance_trends = {}
-    for ex_type, scores in exercise_scores.items():
-        performance_trends[ex_type] = scores[-10:] if len(scores) > 10 else scores
-    
-    # Determine strengths and areas for improvement
-    strengths = []
-    areas_for_improvement = []
-    
-    for ex_type, avg_score in average_scores.items():
-        if avg_score >= 80:
-            if ex_type == ExerciseType.WORD_RECALL:
-                strengths.append("word recall")
-            elif ex_type == ExerciseType.LANGUAGE_FLUENCY:
-                strengths.append("verbal fluency")
-            elif ex_type == ExerciseType.MEMORY_MATCH:
-                strengths.append("memory match")
-            elif ex_type == ExerciseType.CATEGORY_NAMING:
-                strengths.append("category naming")
-            elif ex_type == ExerciseType.SEQUENCE_ORDERING:
-                strengths.append("sequence ordering")
-        elif avg_score <= 60:
-            if ex_type == ExerciseType.WORD_RECALL:
-                areas_for_improvement.append("word recall")
-            elif ex_type == ExerciseType.LANGUAGE_FLUENCY:
-                areas_for_improvement.append("verbal fluency")
-            elif ex_type == ExerciseType.MEMORY_MATCH:
-                areas_for_improvement.append("memory match")
-            elif ex_type == ExerciseType.CATEGORY_NAMING:
-                areas_for_improvement.append("category naming")
-            elif ex_type == ExerciseType.SEQUENCE_ORDERING:
-                areas_for_improvement.append("sequence ordering")
-    
-    # Calculate consistency score (improved implementation)
-    consistency_score = 0.0
-    if len(user_sessions) >= 3:
-        # First, sort sessions by date
-        sessions_by_date = sorted(user_sessions, key=lambda x: x.get("created_at", datetime.min))
-        
-        # Look at time between sessions
-        time_diffs = []
-        for i in range(1, len(sessions_by_date)):
-            current = sessions_by_date[i].get("created_at")
-            previous = sessions_by_date[i-1].get("created_at")
-            if current and previous:
-                diff_days = (current - previous).days
-                # Cap individual differences at 14 days to prevent extreme outliers
-                capped_diff = min(diff_days, 14)
-                time_diffs.append(capped_diff)
-        
-        if time_diffs:
-            # Calculate average time between sessions
-            avg_diff = sum(time_diffs) / len(time_diffs)
-            
-            # Score formula: decreases as average gap increases (ideal is daily = 1)
-            # 1 day = 1.0, 2 days = 0.9, 3 days = 0.8, etc.
-            # Minimum is 0.0 if avg_diff >= 10 days
-            consistency_score = max(0.0, 1.0 - (avg_diff / 10.0))
-            
-            # Bonus for recent activity (if most recent session is within 3 days)
-            most_recent = sessions_by_date[-1].get("created_at")
-            if most_recent and (datetime.utcnow() - most_recent).days <= 3:
-                consistency_score = min(1.0, consistency_score + 0.1)
-        else:
-            consistency_score = 0.1  # Minimum if we can't calculate time diffs
-    elif len(user_sessions) > 0:
-        # If there are sessions but not enough for a trend
-        # Give a score based on recency of the last session
-        sessions_by_date = sorted(user_sessions, key=lambda x: x.get("created_at", datetime.min))
-        most_recent = sessions_by_date[-1].get("created_at")
-        if most_recent:
-            days_since_last = (datetime.utcnow() - most_recent).days
-            if days_since_last <= 1:
-                consistency_score = 0.3  # Session within last day
-            elif days_since_last <= 3:
-                consistency_score = 0.2  # Session within last 3 days
-            else:
-                consistency_score = 0.1  # Older session
-    
-    # Ensure consistency score is between 0 and 1
-    consistency_score = max(0.0, min(1.0, consistency_score))
-    
-    return ProgressMetrics(
-        user_id=current_user.id,
-        last_updated=datetime.utcnow(),
-        total_sessions=total_sessions,
-        total_time_spent=total_time_spent,
-        average_scores=average_scores,
-        performance_trends=performance_trends,
-        strengths=strengths,
-        areas_for_improvement=areas_for_improvement,
-        consistency_score=consistency_score
-    ) 
\ No newline at end of file
+    - **days**: Number of most recent days to include
+    - **window**: Number of active days in the moving average
+    """
+    return await CognitiveTrainingService.get_progress_trends(current_user.id, days=days, window=window)
+
+@router.get("/progress/history", response_model=PerformanceHistory, summary="Get user's long-term performance history")
+async def get_progress_history(
+    interval: str = Query("month", pattern="^(day|week|month|quarter|year)$", description="Period length"),
+    start: Optional[datetime] = Query(None, description="Earliest session time to include (default: all history)"),
+    end: Optional[datetime] = Query(None, description="Latest session time to include (default: now)"),
+    exercise_type: Optional[ExerciseType] = Query(None, description="Only include this exercise type"),
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Get score, accuracy and time spent per exercise type and period.
+    
+    Read from the compact performance time series, so years of history are
+    summarized without loading the training sessions themselves.
+    
+    - **interval**: day, week, month, quarter or year
+    - **start** / **end**: Optional time range
+    - **exercise_type**: Optional exercise type filter
+    """
+    return await get_performance_history(
+        current_user.id,
+        interval=interval,
+        start=_naive_utc(start) if start else None,
+        end=_naive_utc(end) if end else None,
+        exercise_type=exercise_type
+    )
+
+@router.get("/analytics/response-times", response_model=ResponseTimeAnalytics, summary="Get user's response time analytics")
+async def get_response_time_analytics(
+    days: int = Query(365, ge=1, le=3650, description="Number of most recent days to include"),
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Get response time statistics from the reaction times submitted with sessions.
+    
+    Reports the median and interquartile range of all responses, intra-individual
+    variability (mean within-session coefficient of variation), variability of
+    session medians and the slowing trend of session medians in ms per month,
+    overall and per exercise type.
+    
+    - **days**: Number of most recent days to include
+    """
+    if not NUMPY_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Response time analytics are unavailable")
+    return await CognitiveTrainingService.get_response_time_analytics(current_user.id, days=days)
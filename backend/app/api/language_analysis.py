@@ -47,8 +47,8 @@ async def analyze_text_endpoint( # Renamed to avoid conflict if we re-import ana
         Analysis results with risk score and recommendations.
     """
     try:
-        current_model_type = model_factory.get_current_model_type()
-        logger.info(f"Analyzing text using model_factory (model type: {current_model_type}) with input text: '{text[:100]}...'")
+        logger.debug("Analyzing text using model_factory (model type: %s, %d characters)",
+                     model_factory.get_current_model_type(), len(text))
 
         if not text or not text.strip():
             raise HTTPException(status_code=400, detail="Text input cannot be empty.")
@@ -122,7 +122,7 @@ def _segment_text(text: str, min_segment_length: int = 50) -> List[Dict[str, Any
             "char_end_index": len(text)
         })
 
-    logger.info(f"Segmented text into {len(segments_data)} parts.")
+    logger.debug("Segmented text into %d parts.", len(segments_data))
     return segments_data
 
 
@@ -174,7 +174,7 @@ async def analyze_text_segments_endpoint( # Renamed to avoid conflict
         successful_analyses = []
 
         for segment_data in segments:
-            logger.info(f"Analyzing segment ID {segment_data['id']}: '{segment_data['text'][:50]}...'")
+            logger.debug("Analyzing segment %s (%d characters)", segment_data['id'], segment_data['length'])
             analysis_result = model_factory.analyze_text(
                 text=segment_data["text"],
                 include_features=include_features
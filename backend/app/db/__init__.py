@@ -4,23 +4,45 @@ Database module initialization.
 from app.db.mongodb import connect_to_mongodb, close_mongodb_connection, get_database
 from app.db.mongodb import (
     COLLECTION_USERS,
+    COLLECTION_ANALYSES,
     COLLECTION_ANALYSIS_RESULTS,
+    COLLECTION_ASSESSMENTS,
     COLLECTION_COGNITIVE_TRAINING,
     COLLECTION_RESOURCES,
     COLLECTION_TRAINING_SESSIONS,
+    COLLECTION_EXERCISES,
+    COLLECTION_EXERCISE_POOL,
     COLLECTION_USER_METRICS,
-    COLLECTION_JOURNAL_ENTRIES
+    COLLECTION_PERFORMANCE_SERIES,
+    COLLECTION_COHORT_SKETCHES,
+    COLLECTION_ANALYSIS_BASELINES,
+    COLLECTION_JOURNAL_ENTRIES,
+    COLLECTION_REFRESH_TOKENS,
+    COLLECTION_REVOKED_SESSIONS
 )
+from app.db.indexes import ensure_indexes, verify_query_plans, QueryPlanError
 
 __all__ = [
     "connect_to_mongodb",
     "close_mongodb_connection",
     "get_database",
+    "ensure_indexes",
+    "verify_query_plans",
+    "QueryPlanError",
     "COLLECTION_USERS",
+    "COLLECTION_ANALYSES",
     "COLLECTION_ANALYSIS_RESULTS",
+    "COLLECTION_ASSESSMENTS",
     "COLLECTION_COGNITIVE_TRAINING",
     "COLLECTION_RESOURCES",
     "COLLECTION_TRAINING_SESSIONS",
+    "COLLECTION_EXERCISES",
+    "COLLECTION_EXERCISE_POOL",
     "COLLECTION_USER_METRICS",
-    "COLLECTION_JOURNAL_ENTRIES"
+    "COLLECTION_PERFORMANCE_SERIES",
+    "COLLECTION_COHORT_SKETCHES",
+    "COLLECTION_ANALYSIS_BASELINES",
+    "COLLECTION_JOURNAL_ENTRIES",
+    "COLLECTION_REFRESH_TOKENS",
+    "COLLECTION_REVOKED_SESSIONS"
 ] 
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+MongoDB index management.
+
+Declares the indexes each collection needs for the application's hot queries,
+creates them idempotently, and verifies with explain() that none of those
+queries falls back to a collection scan.
+"""
+import logging
+from typing import Any, Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from app.db.mongodb import (
+    COLLECTION_ANALYSES,
+    COLLECTION_EXERCISES,
+    COLLECTION_EXERCISE_POOL,
+    COLLECTION_PERFORMANCE_SERIES,
+    COLLECTION_REFRESH_TOKENS,
+    COLLECTION_RESOURCES,
+    COLLECTION_REVOKED_SESSIONS,
+    COLLECTION_TRAINING_SESSIONS,
+    COLLECTION_USER_METRICS,
+    COLLECTION_USERS,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Required indexes per collection
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    COLLECTION_USERS: [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        # Users created by scripts/add_user.py only have _id, so "id" is sparse
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True, sparse=True),
+    ],
+    COLLECTION_ANALYSES: [
+        IndexModel([("user_id", ASCENDING), ("timestamp", DESCENDING)], name="user_id_timestamp"),
+    ],
+    COLLECTION_TRAINING_SESSIONS: [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_id_created_at"),
+    ],
+    COLLECTION_USER_METRICS: [
+        IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+    ],
+    COLLECTION_EXERCISES: [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    COLLECTION_EXERCISE_POOL: [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    COLLECTION_RESOURCES: [
+        IndexModel([("category", ASCENDING), ("title", ASCENDING)], name="category_title"),
+    ],
+    COLLECTION_REFRESH_TOKENS: [
+        IndexModel([("family_id", ASCENDING)], name="family_id"),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    COLLECTION_REVOKED_SESSIONS: [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    COLLECTION_PERFORMANCE_SERIES: [
+        IndexModel([("user_id", ASCENDING), ("timestamp", ASCENDING)], name="user_id_timestamp"),
+    ],
+}
+
+# Time-series collections: (time field, meta field). Each user plays a few
+# sessions a day, so buckets span 30 days to hold many points per user; servers
+# older than MongoDB 6.3 fall back to the coarsest preset granularity.
+TIME_SERIES_SPECS: Dict[str, Tuple[str, str]] = {
+    COLLECTION_PERFORMANCE_SERIES: ("timestamp", "user_id"),
+}
+TIME_SERIES_BUCKET_SECONDS = 30 * 24 * 3600
+
+# Hot queries checked by verify_query_plans: (collection, filter, sort)
+HOT_QUERIES: List[Tuple[str, Dict[str, Any], List[Tuple[str, int]]]] = [
+    (COLLECTION_ANALYSES, {"user_id": "__explain__"}, [("timestamp", DESCENDING)]),
+    (COLLECTION_TRAINING_SESSIONS, {"user_id": "__explain__"}, [("created_at", DESCENDING)]),
+    (COLLECTION_USER_METRICS, {"user_id": "__explain__"}, []),
+    (COLLECTION_USERS, {"email": "__explain__"}, []),
+    (COLLECTION_USERS, {"id": "__explain__"}, []),
+    (COLLECTION_RESOURCES, {}, [("category", ASCENDING), ("title", ASCENDING)]),
+    (COLLECTION_RESOURCES, {"category": "__explain__"}, [("title", ASCENDING)]),
+    (COLLECTION_REFRESH_TOKENS, {"family_id": "__explain__"}, []),
+]
+
+
+class QueryPlanError(RuntimeError):
+    """Raised when a hot query is planned as a collection scan."""
+
+
+async def ensure_time_series_collections(db) -> List[str]:
+    """
+    Create the declared time-series collections if they do not exist yet.
+
+    Must run before their indexes are created, since creating an index on a
+    missing collection would create it as a regular collection.
+
+    Args:
+        db: Motor database instance
+
+    Returns:
+        Names of the collections that were created
+    """
+    existing = set(await db.list_collection_names())
+    created: List[str] = []
+    for collection_name, (time_field, meta_field) in TIME_SERIES_SPECS.items():
+        if collection_name in existing:
+            continue
+        options = {"timeField": time_field, "metaField": meta_field}
+        try:
+            try:
+                await db.create_collection(collection_name, timeseries={
+                    **options,
+                    "bucketMaxSpanSeconds": TIME_SERIES_BUCKET_SECONDS,
+                    "bucketRoundingSeconds": TIME_SERIES_BUCKET_SECONDS,
+                })
+            except OperationFailure:
+                await db.create_collection(collection_name, timeseries={**options, "granularity": "hours"})
+            created.append(collection_name)
+            logger.info("Created time-series collection '%s'", collection_name)
+        except CollectionInvalid:
+            # Created concurrently by another worker
+            pass
+        except OperationFailure as e:
+            logger.error("Failed to create time-series collection '%s': %s", collection_name, e)
+    return created
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create all declared indexes (and time-series collections). Safe to run repeatedly.
+
+    A collection whose indexes cannot be created (e.g. duplicate keys for a
+    unique index) is logged and skipped so startup is not blocked.
+
+    Args:
+        db: Motor database instance
+
+    Returns:
+        Mapping of collection name to the index names that exist for it
+    """
+    await ensure_time_series_collections(db)
+
+    created: Dict[str, List[str]] = {}
+    for collection_name, indexes in INDEX_SPECS.items():
+        try:
+            created[collection_name] = await db[collection_name].create_indexes(indexes)
+        except OperationFailure as e:
+            logger.error("Failed to create indexes on '%s': %s", collection_name, e)
+    logger.info("Ensured indexes on %d collections", len(created))
+    return created
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """Collect every stage name in an explain() plan tree."""
+    stages: List[str] = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+async def verify_query_plans(db) -> Dict[str, List[str]]:
+    """
+    Explain each hot query and fail if any of them uses a COLLSCAN.
+
+    Args:
+        db: Motor database instance
+
+    Returns:
+        Mapping of query description to the stages of its winning plan
+
+    Raises:
+        QueryPlanError: If one or more hot queries scan their whole collection
+    """
+    plans: Dict[str, List[str]] = {}
+    collection_scans: List[str] = []
+
+    for collection_name, query_filter, sort in HOT_QUERIES:
+        cursor = db[collection_name].find(query_filter)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        stages = _plan_stages(explanation.get("queryPlanner", {}).get("winningPlan", {}))
+
+        description = f"{collection_name}.find({list(query_filter)}).sort({[field for field, _ in sort]})"
+        plans[description] = stages
+        if "COLLSCAN" in stages:
+            collection_scans.append(description)
+
+    if collection_scans:
+        raise QueryPlanError(f"Hot queries fall back to COLLSCAN: {', '.join(collection_scans)}")
+    return plans
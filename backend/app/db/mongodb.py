@@ -1,13 +1,22 @@
 """
 MongoDB connection and configuration module.
+
+This is the single database layer of the application. The Motor client is
+created once at startup with a tuned connection pool, wire compression and
+explicit timeouts, and the pool is warmed so the first requests after a
+deploy do not pay connection setup.
 """
+import asyncio
+import importlib.util
 import os
 import logging
-from typing import Optional
+from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from dotenv import load_dotenv
 
+from app.utils.metrics import mongo_event_listeners
+
 # Load environment variables
 load_dotenv()
 
@@ -21,19 +30,104 @@ MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "alzheimer_db")
 if not MONGODB_URI:
     raise ValueError("MONGODB_URI environment variable is not set")
 
+# Connection pool and driver tuning
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+MONGODB_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+MONGODB_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "10000"))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "30000"))
+MONGODB_READ_PREFERENCE = os.getenv("MONGODB_READ_PREFERENCE", "primary")
+MONGODB_COMPRESSORS = os.getenv("MONGODB_COMPRESSORS", "zstd,snappy,zlib")
+
+# Python modules required by each wire compressor (zlib is always available)
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
 # MongoDB Client
 mongodb_client: Optional[AsyncIOMotorClient] = None
 database = None
 
+
+def _available_compressors(spec: str) -> List[str]:
+    """
+    Filter the configured compressors down to those installed locally.
+
+    pymongo only warns about unavailable compressors, so they are dropped here
+    to keep startup logs clean.
+
+    Args:
+        spec: Comma-separated compressor names in order of preference
+
+    Returns:
+        Compressor names that can be negotiated with the server
+    """
+    compressors = []
+    for name in (item.strip() for item in spec.split(",")):
+        module = _COMPRESSOR_MODULES.get(name)
+        if module and importlib.util.find_spec(module) is not None:
+            compressors.append(name)
+    return compressors
+
+
+def create_client() -> AsyncIOMotorClient:
+    """Create the Motor client with the configured pool, timeouts and compression."""
+    options = {
+        "maxPoolSize": MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGODB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGODB_SOCKET_TIMEOUT_MS,
+        "readPreference": MONGODB_READ_PREFERENCE,
+        "event_listeners": mongo_event_listeners(),
+    }
+    compressors = _available_compressors(MONGODB_COMPRESSORS)
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return AsyncIOMotorClient(MONGODB_URI, **options)
+
+
+async def warm_connection_pool(client: AsyncIOMotorClient, size: int) -> None:
+    """
+    Open `size` pooled connections by issuing concurrent pings.
+
+    Each concurrent command checks out its own connection, so the pool holds
+    at least `size` established (and authenticated) connections afterwards.
+
+    Args:
+        client: Motor client
+        size: Number of connections to open
+    """
+    if size <= 0:
+        return
+    results = await asyncio.gather(
+        *(client.admin.command("ping") for _ in range(size)),
+        return_exceptions=True,
+    )
+    failures = sum(1 for result in results if isinstance(result, Exception))
+    if failures:
+        logger.warning("Connection pool warm-up: %d of %d pings failed", failures, size)
+    else:
+        logger.info("Warmed MongoDB connection pool with %d connections", size)
+
+
 async def connect_to_mongodb():
-    """Connect to MongoDB Atlas."""
+    """Connect to MongoDB Atlas and warm the connection pool."""
     global mongodb_client, database
+    if database is not None:
+        return database
     try:
-        mongodb_client = AsyncIOMotorClient(MONGODB_URI)
+        mongodb_client = create_client()
         # Verify the connection is successful
         await mongodb_client.admin.command("ping")
+        await warm_connection_pool(mongodb_client, MONGODB_MIN_POOL_SIZE)
         database = mongodb_client[MONGODB_DB_NAME]
-        logger.info(f"Connected to MongoDB database: {MONGODB_DB_NAME}")
+        logger.info(
+            "Connected to MongoDB database: %s (pool %d-%d)",
+            MONGODB_DB_NAME, MONGODB_MIN_POOL_SIZE, MONGODB_MAX_POOL_SIZE
+        )
         return database
     except (ConnectionFailure, ServerSelectionTimeoutError) as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
@@ -41,9 +135,11 @@ async def connect_to_mongodb():
 
 async def close_mongodb_connection():
     """Close MongoDB connection."""
-    global mongodb_client
+    global mongodb_client, database
     if mongodb_client:
         mongodb_client.close()
+        mongodb_client = None
+        database = None
         logger.info("MongoDB connection closed")
 
 def get_database():
@@ -54,9 +150,18 @@ def get_database():
 
 # Define collection names as constants for better maintainability
 COLLECTION_USERS = "users"
+COLLECTION_ANALYSES = "analyses"
 COLLECTION_ANALYSIS_RESULTS = "analysis_results"
+COLLECTION_ASSESSMENTS = "assessments"
 COLLECTION_COGNITIVE_TRAINING = "cognitive_training"
 COLLECTION_RESOURCES = "resources"
 COLLECTION_TRAINING_SESSIONS = "training_sessions"
+COLLECTION_EXERCISES = "exercises"
+COLLECTION_EXERCISE_POOL = "exercise_pool"
 COLLECTION_USER_METRICS = "user_metrics"
-COLLECTION_JOURNAL_ENTRIES = "journal_entries" 
\ No newline at end of file
+COLLECTION_PERFORMANCE_SERIES = "performance_series"
+COLLECTION_COHORT_SKETCHES = "cohort_sketches"
+COLLECTION_ANALYSIS_BASELINES = "analysis_baselines"
+COLLECTION_JOURNAL_ENTRIES = "journal_entries"
+COLLECTION_REFRESH_TOKENS = "refresh_tokens"
+COLLECTION_REVOKED_SESSIONS = "revoked_sessions"
@@ -5,6 +5,7 @@ from app.models.user import (
     UserBase,
     UserCreate,
     UserInDB,
+    AuthenticatedUser,
     UserUpdate,
     UserResponse
 )
@@ -13,6 +14,8 @@ from app.models.analysis import (
     LanguageMetrics,
     CognitiveDomain,
     DomainScore,
+    DeclineAlert,
+    AnalysisBaseline,
     AnalysisResult,
     AnalysisRequest
 )
@@ -22,19 +25,25 @@ from app.models.training import (
     Exercise,
     ExerciseSession,
     TrainingPlan,
-    ProgressMetrics
+    ProgressMetrics,
+    DailyPerformance,
+    ExerciseTrend,
+    ProgressTrends
 )
 
 __all__ = [
     "UserBase",
     "UserCreate",
     "UserInDB",
+    "AuthenticatedUser",
     "UserUpdate",
     "UserResponse",
     "AnalysisType",
     "LanguageMetrics",
     "CognitiveDomain",
     "DomainScore",
+    "DeclineAlert",
+    "AnalysisBaseline",
     "AnalysisResult",
     "AnalysisRequest",
     "ExerciseType",
@@ -42,5 +51,8 @@ __all__ = [
     "Exercise", 
     "ExerciseSession",
     "TrainingPlan",
-    "ProgressMetrics"
+    "ProgressMetrics",
+    "DailyPerformance",
+    "ExerciseTrend",
+    "ProgressTrends"
 ] 
\ No newline at end of file
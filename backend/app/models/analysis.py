@@ -57,6 +57,7 @@ class AnalysisResult(BaseModel):
     
     # Comparison to previous results (if available)
     change_from_baseline: Optional[Dict[str, float]] = None
+    declined_scores: List[str] = Field(default_factory=list)  # Scores meaningfully above baseline
     
     # Metadata
     model_version: str = "0.1.0"
@@ -69,6 +70,27 @@ class AnalysisResult(BaseModel):
             uuid.UUID: lambda id: str(id)
         }
 
+class DeclineAlert(BaseModel):
+    """Analysis whose scores rose meaningfully above the user's baseline."""
+    analysis_id: str
+    timestamp: datetime
+    changes: Dict[str, float]  # Change from baseline of each declined score
+    
+    class Config:
+        """Model configuration."""
+        json_encoders = {
+            datetime: lambda dt: dt.isoformat()
+        }
+
+class AnalysisBaseline(BaseModel):
+    """User's rolling baseline of analysis scores (domains and risk_score)."""
+    user_id: str
+    analyses: int = 0
+    established: bool = False  # Whether every score has enough analyses to compare against
+    baseline: Dict[str, float] = Field(default_factory=dict)  # Robust mean per score
+    spread: Dict[str, float] = Field(default_factory=dict)  # Scaled median absolute deviation per score
+    last_decline: Optional[DeclineAlert] = None
+
 class AnalysisRequest(BaseModel):
     """Request for language analysis."""
     user_id: str
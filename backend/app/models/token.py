@@ -9,6 +9,13 @@ class Token(BaseModel):
     """Token model for API responses."""
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    """Request body for refreshing or revoking a session."""
+    refresh_token: str
 
 
 class TokenData(BaseModel):
@@ -37,6 +37,7 @@ class Exercise(BaseModel):
     instructions: str
     content: Dict  # Exercise-specific content structure
     cognitive_domains: List[str]  # Cognitive domains targeted
+    generation_seed: Optional[int] = None  # Seed that reproduces the generated content
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -97,10 +98,81 @@ class ProgressMetrics(BaseModel):
     strengths: List[str] = Field(default_factory=list)
     areas_for_improvement: List[str] = Field(default_factory=list)
     consistency_score: float = 0.0  # Measure of training consistency
+    skill_ratings: Dict[str, float] = Field(default_factory=dict)  # Elo-style rating per exercise type
+    recommended_difficulty: Dict[str, DifficultyLevel] = Field(default_factory=dict)
     
     class Config:
         """Model configuration."""
         json_encoders = {
             datetime: lambda dt: dt.isoformat(),
             uuid.UUID: lambda id: str(id)
-        } 
\ No newline at end of file
+        }
+
+class DailyPerformance(BaseModel):
+    """Performance for one exercise type on one day."""
+    date: datetime
+    sessions: int
+    average_accuracy: float  # Percentage (0-100)
+    moving_average: float  # Average accuracy over the trailing window of active days
+    time_spent: float = 0  # In seconds
+    
+    class Config:
+        """Model configuration."""
+        json_encoders = {
+            datetime: lambda dt: dt.isoformat()
+        }
+
+class ExerciseTrend(BaseModel):
+    """Daily performance trend for one exercise type."""
+    sessions: int
+    active_days: int
+    average_gap_days: Optional[float] = None  # Between consecutive active days
+    change: float = 0.0  # Moving average change from first to last active day
+    daily: List[DailyPerformance] = Field(default_factory=list)
+
+class ProgressTrends(BaseModel):
+    """User's performance trends per exercise type."""
+    user_id: str
+    days: int  # Number of days covered
+    window: int  # Moving average window (active days)
+    trends: Dict[ExerciseType, ExerciseTrend] = Field(default_factory=dict)
+
+class ResponseTimeStatistics(BaseModel):
+    """Response time statistics over a set of sessions."""
+    sessions: int = 0  # Sessions with response times
+    responses: int = 0
+    median_ms: Optional[float] = None
+    iqr_ms: Optional[float] = None  # Interquartile range
+    mean_icv: Optional[float] = None  # Mean within-session coefficient of variation (SD / mean)
+    between_session_cv: Optional[float] = None  # Coefficient of variation of session medians
+    slowing_ms_per_month: Optional[float] = None  # Trend of session medians; positive means slower
+
+class ResponseTimeAnalytics(BaseModel):
+    """User's response time statistics, overall and per exercise type."""
+    user_id: str
+    days: int  # Number of days covered
+    overall: ResponseTimeStatistics
+    by_exercise_type: Dict[ExerciseType, ResponseTimeStatistics] = Field(default_factory=dict)
+
+class PerformancePeriod(BaseModel):
+    """Performance for one exercise type over one period."""
+    period: datetime  # Start of the period
+    sessions: int
+    average_score: float
+    average_accuracy: float  # Percentage (0-100)
+    best_accuracy: float  # Percentage (0-100)
+    time_spent: float = 0  # In seconds
+    
+    class Config:
+        """Model configuration."""
+        json_encoders = {
+            datetime: lambda dt: dt.isoformat()
+        }
+
+class PerformanceHistory(BaseModel):
+    """User's long-term performance per exercise type, grouped by period."""
+    user_id: str
+    interval: str  # day, week, month, quarter or year
+    start: Optional[datetime] = None  # None when the whole history is included
+    end: datetime
+    history: Dict[ExerciseType, List[PerformancePeriod]] = Field(default_factory=dict)
@@ -40,6 +40,7 @@ class UserInDB(UserBase):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     last_login: Optional[datetime] = None
+    roles: List[str] = Field(default_factory=list)
     
     class Config:
         """Model configuration."""
@@ -48,6 +49,17 @@ class UserInDB(UserBase):
             uuid.UUID: lambda id: str(id)
         }
 
+class AuthenticatedUser(BaseModel):
+    """
+    Identity of the caller, built from access token claims.
+
+    Routes that only need the user's ID, active flag and roles depend on this
+    instead of UserInDB so that no database lookup is required.
+    """
+    id: str
+    is_active: bool = True
+    roles: List[str] = Field(default_factory=list)
+
 class UserUpdate(BaseModel):
     """User update model with optional fields."""
     full_name: Optional[str] = None
@@ -15,11 +15,14 @@ import os
 import tempfile
 from pydantic import BaseModel, Field
 
-from app.models.analysis import AnalysisResult, AnalysisType, CognitiveDomain
-from app.utils.security import get_current_user
-from app.db import get_database
-from app.models.user import UserInDB
+from app.models.analysis import AnalysisBaseline, AnalysisResult, AnalysisType, CognitiveDomain
+from app.utils.security import get_current_principal
+from app.db import get_database, COLLECTION_ANALYSES
+from app.models.user import AuthenticatedUser
 from app.ai.factory import analyze_text, set_model, process_audio, set_whisper_model_size
+from app.utils.timing import StageTimer
+from app.services.cohort_percentiles import rank_analysis
+from app.services.analysis_baseline import get_baseline, record_analysis as record_analysis_baseline
 
 # Initialize router
 router = APIRouter(
@@ -85,9 +88,8 @@ async def process_audio_health():
 # Print available endpoints on startup
 async def on_startup_event():
     """Log all endpoints when the application starts."""
-    logger.info("Available AI endpoints:")
-    for route_item in router.routes:
-        logger.info(f"  - {route_item.path} ({route_item.name})")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Available AI endpoints: %s", ", ".join(f"{r.path} ({r.name})" for r in router.routes))
 
 router.on_startup.append(on_startup_event)
 
@@ -103,6 +105,10 @@ class AnalysisInDB(BaseModel):
     analysis_type: AnalysisType
     confidence_score: float
     recommendations: list[str]
+    processing_time: Optional[float] = None  # In seconds, up to the database insert
+    stage_timings: Dict[str, float] = Field(default_factory=dict)  # Seconds per processing stage
+    change_from_baseline: Optional[Dict[str, float]] = None  # Per domain and risk_score
+    declined_scores: List[str] = Field(default_factory=list)  # Scores meaningfully above baseline
 
 @router.post("/analyze", response_model=Dict[str, Any])
 async def analyze_text_endpoint(
@@ -110,7 +116,7 @@ async def analyze_text_endpoint(
     analysis_type: AnalysisType = Body(AnalysisType.TEXT, embed=True),
     include_features: bool = Body(False, embed=True),
     request_id: Optional[str] = Body(None, embed=True),
-    current_user: UserInDB = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db = Depends(get_database)
 ):
     """
@@ -132,7 +138,7 @@ async def analyze_text_endpoint(
     """
     try:
         # Log the request
-        logger.info(f"Analysis request received: ID={request_id}, length={len(text)}, start={text[:20]}")
+        logger.info("Analysis request received: ID=%s, length=%d", request_id, len(text))
         
         # Validate input
         if not text or len(text.strip()) < 10:
@@ -141,11 +147,14 @@ async def analyze_text_endpoint(
                 detail="Text input too short. Please provide at least 10 characters."
             )
         
+        timer = StageTimer()
+        
         # Call AI model to analyze text
-        results = analyze_text(text, include_features)
+        with timer.stage("analysis"):
+            results = analyze_text(text, include_features)
         
         if not results.get("success", False):
-            logger.error(f"Analysis failed: {results.get('error')}")
+            logger.error("Analysis failed: %s", results.get('error'))
             raise HTTPException(
                 status_code=500,
                 detail=f"Analysis failed: {results.get('error', 'Unknown error')}"
@@ -167,10 +176,24 @@ async def analyze_text_endpoint(
             timestamp=datetime.now(),
             analysis_type=analysis_type,
             confidence_score=results.get("confidence_score", 0.0),
-            recommendations=results.get("recommendations", [])
+            recommendations=results.get("recommendations", []),
+            processing_time=timer.total,
+            stage_timings=timer.as_dict()
+        )
+        
+        # Compare with the user's baseline, updated in the same step
+        comparison = await record_analysis_baseline(
+            current_user.id, analysis_record.id, analysis_record.timestamp,
+            domain_scores, analysis_record.cognitive_score
         )
+        analysis_record.change_from_baseline = comparison.changes
+        analysis_record.declined_scores = comparison.declined
+        
+        with timer.stage("db_insert"):
+            await db[COLLECTION_ANALYSES].insert_one(analysis_record.dict())
         
-        await db.analyses.insert_one(analysis_record.dict())
+        # Rank the domain scores against the user's age band
+        domain_percentiles = await rank_analysis(current_user.id, domain_scores)
         
         # Return the analysis results
         response = {
@@ -179,9 +202,16 @@ async def analyze_text_endpoint(
             "overall_score": results.get("overall_score", 0.0),
             "confidence_score": results.get("confidence_score", 0.0),
             "domain_scores": results.get("domain_scores", {}),
+            "domain_percentiles": [score.dict() for score in domain_percentiles],
+            "change_from_baseline": comparison.changes,
+            "declined_scores": comparison.declined,
             "recommendations": results.get("recommendations", []),
             "model_type": results.get("model_type", "gpt4o"),
-            "timestamp": analysis_record.timestamp.isoformat()
+            "timestamp": analysis_record.timestamp.isoformat(),
+            "processing_info": {
+                "processing_time": round(timer.total, 4),
+                "stage_timings": timer.as_dict()
+            }
         }
         
         # Include detailed features if requested
@@ -205,7 +235,7 @@ async def analyze_text_endpoint(
 # async def set_model_endpoint(
 #     model_type: str = Body(..., embed=True),
 #     api_key: Optional[str] = Body(None, embed=True),
-#     current_user: UserInDB = Depends(get_current_user)
+#     current_user: AuthenticatedUser = Depends(get_current_principal)
 # ):
 #     """
 #     Set the API key for the GPT-4o model.
@@ -256,7 +286,7 @@ async def analyze_text_endpoint(
 @router.get("/history")
 async def get_analysis_history(
     limit: int = 10,
-    current_user: UserInDB = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db = Depends(get_database)
 ):
     """
@@ -272,7 +302,7 @@ async def get_analysis_history(
     """
     try:
         # Get analysis history from database
-        cursor = db.analyses.find(
+        cursor = db[COLLECTION_ANALYSES].find(
             {"user_id": current_user.id}
         ).sort("timestamp", -1).limit(limit)
         
@@ -294,6 +324,26 @@ async def get_analysis_history(
             detail=f"An error occurred while fetching analysis history: {str(e)}"
         )
 
+@router.get("/baseline", response_model=AnalysisBaseline)
+async def get_analysis_baseline(
+    current_user: AuthenticatedUser = Depends(get_current_principal)
+):
+    """
+    Get the current user's baseline of analysis scores.
+    
+    The baseline is a robust mean of the user's recent domain and risk scores,
+    maintained as analyses are stored. Each new analysis reports its
+    change_from_baseline, and last_decline is the latest analysis whose scores
+    rose meaningfully above the baseline.
+    
+    Args:
+        current_user: The authenticated user
+        
+    Returns:
+        Baseline, spread and latest decline alert
+    """
+    return await get_baseline(current_user.id)
+
 @router.post("/process-audio", response_model=Dict[str, Any], name="process_audio")
 @router.post("/analyze-speech", response_model=Dict[str, Any], name="analyze_speech", include_in_schema=False)
 async def process_audio_endpoint(
@@ -302,7 +352,7 @@ async def process_audio_endpoint(
     include_analysis: Optional[str] = Form(None),
     include_features: Optional[bool] = Query(None),
     request_id: Optional[str] = Form(None),
-    current_user: Optional[UserInDB] = Depends(get_current_user, use_cache=False),
+    current_user: Optional[AuthenticatedUser] = Depends(get_current_principal, use_cache=False),
     db = Depends(get_database)
 ):
     """
@@ -321,8 +371,6 @@ async def process_audio_endpoint(
     Returns:
         Transcription and optional analysis results
     """
-    logger.info(f"Process audio/analyze-speech endpoint called.")
-    
     # Determine if analysis should be performed and if features should be included
     perform_analysis = False
     if include_analysis is not None and include_analysis.lower() == 'true':
@@ -338,15 +386,17 @@ async def process_audio_endpoint(
     # Create temporary file
     temp_file = None
     
+    # Per-stage timings returned in meta.processing_info and stored with the analysis
+    timer = StageTimer()
+    
     try:
         # Log the request with more details
-        logger.info(f"Audio processing request received: ID={{request_id}}, file={{audio_file.filename}}, perform_analysis={{perform_analysis}}, include_features_in_analysis={{send_features_to_analysis}}")
-        
-        # Log file details for debugging
-        logger.info(f"Audio file details - name: {audio_file.filename}, content_type: {audio_file.content_type}, size: {audio_file.size if hasattr(audio_file, 'size') else 'unknown'}")
-        
-        # Log current user status
-        logger.info(f"Authentication status: {'Authenticated' if current_user else 'Anonymous'}")
+        logger.info(
+            "Audio processing request received: ID=%s, content_type=%s, perform_analysis=%s, "
+            "include_features=%s, authenticated=%s",
+            request_id, audio_file.content_type, perform_analysis,
+            send_features_to_analysis, current_user is not None
+        )
         
         # Validate file
         if not audio_file.filename:
@@ -386,24 +436,25 @@ async def process_audio_endpoint(
         temp_file = tempfile.NamedTemporaryFile(delete=False)
         
         # Read and write the file in chunks
-        while chunk := await audio_file.read(chunk_size):
-            file_size += len(chunk)
-            if file_size > 20 * 1024 * 1024:  # 20MB
-                # Clean up and raise error
-                temp_file.close()
-                os.unlink(temp_file.name)
-                raise HTTPException(
-                    status_code=413,
-                    detail={
-                        "message": "Audio file too large. Maximum size is 20MB.",
-                        "error_type": "file_too_large",
-                        "file_size": file_size,
-                        "max_size": 20 * 1024 * 1024
-                    }
-                )
-            temp_file.write(chunk)
-        
-        temp_file.close()
+        with timer.stage("upload"):
+            while chunk := await audio_file.read(chunk_size):
+                file_size += len(chunk)
+                if file_size > 20 * 1024 * 1024:  # 20MB
+                    # Clean up and raise error
+                    temp_file.close()
+                    os.unlink(temp_file.name)
+                    raise HTTPException(
+                        status_code=413,
+                        detail={
+                            "message": "Audio file too large. Maximum size is 20MB.",
+                            "error_type": "file_too_large",
+                            "file_size": file_size,
+                            "max_size": 20 * 1024 * 1024
+                        }
+                    )
+                temp_file.write(chunk)
+            
+            temp_file.close()
         
         if file_size == 0:
             os.unlink(temp_file.name)
@@ -431,10 +482,10 @@ async def process_audio_endpoint(
             )
         
         # Process audio file - run in threadpool
-        audio_results = await run_in_threadpool(process_audio, temp_file.name, language)
+        audio_results = await run_in_threadpool(process_audio, temp_file.name, language, timer)
         
         if not audio_results.get("success", False):
-            logger.error(f"Audio processing failed: {{audio_results.get('error')}}")
+            logger.error("Audio processing failed: %s", audio_results.get('error'))
             error_message = audio_results.get('error', 'Unknown error')
             
             # Determine specific error category and response code
@@ -531,7 +582,8 @@ async def process_audio_endpoint(
                 response["analysis_skipped"] = "Text too short for analysis"
             else:
                 # Analyze the transcribed text - run in threadpool
-                analysis_results = await run_in_threadpool(analyze_text, transcribed_text, include_features=send_features_to_analysis)
+                with timer.stage("analysis"):
+                    analysis_results = await run_in_threadpool(analyze_text, transcribed_text, include_features=send_features_to_analysis)
                 
                 if analysis_results.get("success", False):
                     # Create analysis record
@@ -550,10 +602,24 @@ async def process_audio_endpoint(
                         timestamp=datetime.now(),
                         analysis_type=AnalysisType.SPEECH,
                         confidence_score=analysis_results.get("confidence_score", 0.0),
-                        recommendations=analysis_results.get("recommendations", [])
+                        recommendations=analysis_results.get("recommendations", []),
+                        processing_time=timer.total,
+                        stage_timings=timer.as_dict()
                     )
                     
-                    await db.analyses.insert_one(analysis_record.dict())
+                    # Compare with the user's baseline, updated in the same step
+                    comparison = await record_analysis_baseline(
+                        current_user.id, analysis_record.id, analysis_record.timestamp,
+                        domain_scores, analysis_record.cognitive_score
+                    )
+                    analysis_record.change_from_baseline = comparison.changes
+                    analysis_record.declined_scores = comparison.declined
+                    
+                    with timer.stage("db_insert"):
+                        await db[COLLECTION_ANALYSES].insert_one(analysis_record.dict())
+                    
+                    # Rank the domain scores against the user's age band
+                    domain_percentiles = await rank_analysis(current_user.id, domain_scores)
                     
                     # Add analysis results to response
                     response["analysis"] = {
@@ -561,6 +627,9 @@ async def process_audio_endpoint(
                         "overall_score": analysis_results.get("overall_score", 0.0),
                         "confidence_score": analysis_results.get("confidence_score", 0.0),
                         "domain_scores": analysis_results.get("domain_scores", {}),
+                        "domain_percentiles": [score.dict() for score in domain_percentiles],
+                        "change_from_baseline": comparison.changes,
+                        "declined_scores": comparison.declined,
                         "recommendations": analysis_results.get("recommendations", []),
                         "model_type": analysis_results.get("model_type", "gpt4o"),
                         "timestamp": analysis_record.timestamp.isoformat()
@@ -574,7 +643,8 @@ async def process_audio_endpoint(
                 response["analysis_skipped"] = "Text too short for analysis"
             else:
                 # Analyze the transcribed text without saving to database - run in threadpool
-                analysis_results = await run_in_threadpool(analyze_text, transcribed_text, include_features=send_features_to_analysis)
+                with timer.stage("analysis"):
+                    analysis_results = await run_in_threadpool(analyze_text, transcribed_text, include_features=send_features_to_analysis)
                 
                 if analysis_results.get("success", False):
                     # Add analysis results to response without saving to database
@@ -591,6 +661,10 @@ async def process_audio_endpoint(
                 else:
                     response["analysis_error"] = analysis_results.get("error", "Unknown error")
         
+        # Attach per-stage timings now that every stage has run
+        response["meta"]["processing_info"]["processing_time"] = round(timer.total, 4)
+        response["meta"]["processing_info"]["stage_timings"] = timer.as_dict()
+        
         return response
     
     except HTTPException:
@@ -630,7 +704,7 @@ async def process_audio_endpoint(
 @router.post("/set-whisper-model")
 async def set_whisper_model_endpoint(
     model_size: str = Body(..., embed=True),
-    current_user: UserInDB = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_principal)
 ):
     """
     Set the Whisper model size to use.
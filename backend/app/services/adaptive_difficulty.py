@@ -0,0 +1,171 @@
+"""
+Adaptive difficulty based on a per-user skill rating.
+
+Each user has an Elo-style rating per exercise type, stored in their
+user_metrics aggregate under ``skill.<exercise_type>``. Every difficulty
+level has a fixed rating, and a session's accuracy (0-1) is its outcome. The
+expected outcome is the logistic Elo curve, and the rating moves by
+K * (outcome - expected). The first few sessions use a larger K so new
+users reach their level quickly.
+
+Sessions recorded in one update (e.g. a batch uploaded after offline play)
+are rated one at a time in chronological order, each with its own K, by a
+$reduce inside the single update. A batch therefore gives exactly the
+ratings that submitting its sessions one by one (or rebuilding from
+history) gives. Ratings are kept within ELO_SCALE of the easiest and
+hardest levels, so a long streak cannot push a rating far beyond the
+levels it selects between.
+
+New exercises target a success rate: the engine solves the Elo curve for
+the item rating the user is expected to succeed on TARGET_SUCCESS_RATE of
+the time, and maps it to a difficulty level and generator parameters.
+"""
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.models.training import DifficultyLevel
+
+# Load environment variables
+load_dotenv()
+
+INITIAL_RATING = 1000.0
+ELO_SCALE = 400.0
+K_FACTOR = 32.0
+PROVISIONAL_K_FACTOR = 96.0
+PROVISIONAL_SESSIONS = 5
+TARGET_SUCCESS_RATE = float(os.getenv("ADAPTIVE_TARGET_SUCCESS_RATE", "0.7"))
+
+# Item rating of each difficulty level, easiest first
+DIFFICULTY_RATINGS: Dict[DifficultyLevel, float] = {
+    DifficultyLevel.BEGINNER: 800.0,
+    DifficultyLevel.INTERMEDIATE: 1000.0,
+    DifficultyLevel.ADVANCED: 1200.0,
+    DifficultyLevel.EXPERT: 1400.0,
+}
+
+# Ratings are clamped to this range
+MIN_RATING = min(DIFFICULTY_RATINGS.values()) - ELO_SCALE
+MAX_RATING = max(DIFFICULTY_RATINGS.values()) + ELO_SCALE
+
+
+def difficulty_rating(difficulty) -> float:
+    """Item rating of a difficulty level (accepts the enum or its value)."""
+    return DIFFICULTY_RATINGS[DifficultyLevel(difficulty)]
+
+
+def expected_success(rating: float, item_rating: float) -> float:
+    """Expected outcome (0-1) of a user with `rating` on an item with `item_rating`."""
+    return 1.0 / (1.0 + 10 ** ((item_rating - rating) / ELO_SCALE))
+
+
+def k_factor(sessions: int) -> float:
+    """Rating step size; larger while the rating is provisional."""
+    return PROVISIONAL_K_FACTOR if sessions < PROVISIONAL_SESSIONS else K_FACTOR
+
+
+def update_rating(rating: float, sessions: int, item_rating: float, outcome: float) -> float:
+    """
+    Rate one session.
+
+    Args:
+        rating: Current rating
+        sessions: Sessions already rated
+        item_rating: Rating of the difficulty played
+        outcome: Session outcome (0-1)
+
+    Returns:
+        The new rating
+    """
+    rating += k_factor(sessions) * (outcome - expected_success(rating, item_rating))
+    return min(MAX_RATING, max(MIN_RATING, rating))
+
+
+def target_item_rating(rating: float, success_rate: float = TARGET_SUCCESS_RATE) -> float:
+    """Item rating on which a user with `rating` is expected to reach `success_rate`."""
+    return rating + ELO_SCALE * math.log10(1.0 / success_rate - 1.0)
+
+
+def recommend_level(rating: Optional[float]) -> Tuple[DifficultyLevel, float]:
+    """
+    Pick the difficulty level for a user's rating.
+
+    Args:
+        rating: The user's rating for the exercise type (None if unrated)
+
+    Returns:
+        Tuple of (level, position between that level and the next, 0-1),
+        which generators use to interpolate their parameters
+    """
+    target = target_item_rating(INITIAL_RATING if rating is None else rating)
+    levels = list(DIFFICULTY_RATINGS.items())
+    if target <= levels[0][1]:
+        return levels[0][0], 0.0
+    for (level, level_rating), (_, next_rating) in zip(levels, levels[1:]):
+        if target < next_rating:
+            return level, (target - level_rating) / (next_rating - level_rating)
+    return levels[-1][0], 0.0
+
+
+def skill_update_expression(exercise_type: str, outcomes: List[Tuple[float, float]]) -> Dict:
+    """
+    Update pipeline fields rating sessions in order into ``skill.<exercise_type>``.
+
+    The pipeline equivalent of calling update_rating for each outcome.
+
+    Args:
+        exercise_type: Exercise type value
+        outcomes: (item rating, outcome 0-1) of the sessions to rate, oldest first
+
+    Returns:
+        $set fields for the progress update pipeline
+    """
+    field = f"skill.{exercise_type}"
+    rating, sessions = "$$value.rating", "$$value.sessions"
+    expected = {"$divide": [1, {"$add": [
+        1, {"$pow": [10, {"$divide": [{"$subtract": ["$$this.item", rating]}, ELO_SCALE]}]}
+    ]}]}
+    k = {"$cond": [{"$lt": [sessions, PROVISIONAL_SESSIONS]}, PROVISIONAL_K_FACTOR, K_FACTOR]}
+    new_rating = {"$add": [rating, {"$multiply": [k, {"$subtract": ["$$this.outcome", expected]}]}]}
+    return {
+        field: {"$reduce": {
+            "input": {"$literal": [{"item": item, "outcome": outcome} for item, outcome in outcomes]},
+            "initialValue": {
+                "rating": {"$ifNull": [f"${field}.rating", INITIAL_RATING]},
+                "sessions": {"$ifNull": [f"${field}.sessions", 0]},
+            },
+            "in": {
+                "rating": {"$min": [MAX_RATING, {"$max": [MIN_RATING, new_rating]}]},
+                "sessions": {"$add": [sessions, 1]},
+            },
+        }},
+    }
+
+
+def session_outcome(accuracy_percent: float) -> float:
+    """Elo outcome (0-1) of a session from its accuracy percentage."""
+    return min(1.0, max(0.0, accuracy_percent / 100.0))
+
+
+def replay_ratings(sessions: List[Dict]) -> Dict[str, Dict]:
+    """
+    Recompute skill state from a user's sessions in chronological order.
+
+    Args:
+        sessions: Sessions with exercise_type, difficulty and accuracy (percentage)
+
+    Returns:
+        The ``skill`` sub-document of the user's aggregate
+    """
+    skill: Dict[str, Dict] = {}
+    for session in sessions:
+        try:
+            item = difficulty_rating(session["difficulty"])
+        except (KeyError, ValueError):
+            continue
+        state = skill.setdefault(session["exercise_type"], {"rating": INITIAL_RATING, "sessions": 0})
+        state["rating"] = update_rating(state["rating"], state["sessions"], item, session_outcome(session["accuracy"]))
+        state["sessions"] += 1
+    return skill
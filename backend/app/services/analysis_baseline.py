@@ -0,0 +1,174 @@
+"""
+Per-user baselines of language analysis scores.
+
+Each user has one small analysis_baselines document holding their last
+ANALYSIS_BASELINE_WINDOW domain and risk scores. A new analysis is pushed
+into that window with one atomic update, which also returns the previous
+window. The baseline is the robust (trimmed) mean of the previous window, so
+change_from_baseline is computed at insert time from that one document,
+without reading the analysis history. A single outlying analysis hardly
+moves the trimmed mean.
+
+Domain and risk scores grow with impairment, so a decline is an increase.
+A score is flagged as a meaningful decline when the baseline has at least
+ANALYSIS_BASELINE_MIN_ANALYSES scores and the increase exceeds both
+ANALYSIS_DECLINE_MIN_CHANGE and ANALYSIS_DECLINE_SPREAD_MULTIPLIER times the
+baseline's robust spread (scaled median absolute deviation). A user whose
+scores normally vary a lot therefore needs a larger change. The latest
+flagged analysis is kept on the baseline document for alerting.
+"""
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+from dotenv import load_dotenv
+from pymongo import ReturnDocument
+
+from app.db.mongodb import get_database, COLLECTION_ANALYSIS_BASELINES
+from app.models.analysis import AnalysisBaseline, DeclineAlert
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ANALYSIS_BASELINE_WINDOW = int(os.getenv("ANALYSIS_BASELINE_WINDOW", "10"))
+ANALYSIS_BASELINE_MIN_ANALYSES = int(os.getenv("ANALYSIS_BASELINE_MIN_ANALYSES", "3"))
+ANALYSIS_DECLINE_MIN_CHANGE = float(os.getenv("ANALYSIS_DECLINE_MIN_CHANGE", "0.1"))
+ANALYSIS_DECLINE_SPREAD_MULTIPLIER = float(os.getenv("ANALYSIS_DECLINE_SPREAD_MULTIPLIER", "2.5"))
+
+# Baseline key of the overall risk score (the other keys are cognitive domains)
+RISK_SCORE_KEY = "risk_score"
+
+# Fraction of the window trimmed from each end for the robust mean
+TRIM_FRACTION = 0.2
+
+# Scales the median absolute deviation to a standard deviation for normal data
+MAD_SCALE = 1.4826
+
+
+class BaselineComparison(NamedTuple):
+    """A new analysis compared to the user's baseline."""
+    # Change per score from the baseline; None until the baseline is established
+    changes: Optional[Dict[str, float]]
+    # Scores that increased meaningfully (a decline)
+    declined: List[str]
+
+
+def robust_mean(values: Sequence[float]) -> float:
+    """Mean of the values without the lowest and highest TRIM_FRACTION of them."""
+    ordered = sorted(values)
+    trim = int(len(ordered) * TRIM_FRACTION)
+    kept = ordered[trim:len(ordered) - trim] if trim else ordered
+    return sum(kept) / len(kept)
+
+
+def _median(values: Sequence[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def robust_spread(values: Sequence[float]) -> float:
+    """Scaled median absolute deviation of the values."""
+    median = _median(values)
+    return MAD_SCALE * _median([abs(value - median) for value in values])
+
+
+def compare_to_baseline(window: Mapping[str, Sequence[float]], scores: Mapping[str, float]) -> BaselineComparison:
+    """
+    Compare new scores to the baseline of the previous scores.
+
+    Args:
+        window: Previous scores per key, oldest first
+        scores: New score per key
+
+    Returns:
+        The change per key with an established baseline and the keys in decline
+    """
+    changes: Dict[str, float] = {}
+    declined: List[str] = []
+    for key, score in scores.items():
+        previous = window.get(key) or []
+        if len(previous) < ANALYSIS_BASELINE_MIN_ANALYSES:
+            continue
+        change = score - robust_mean(previous)
+        changes[key] = round(change, 4)
+        threshold = max(ANALYSIS_DECLINE_MIN_CHANGE, ANALYSIS_DECLINE_SPREAD_MULTIPLIER * robust_spread(previous))
+        if change > threshold:
+            declined.append(key)
+    return BaselineComparison(changes or None, declined)
+
+
+async def record_analysis(user_id: str, analysis_id: str, timestamp: datetime, domain_scores: Mapping,
+                          risk_score: float) -> BaselineComparison:
+    """
+    Add an analysis to the user's baseline and compare it to the previous baseline.
+
+    Args:
+        user_id: ID of the analyzed user
+        analysis_id: ID of the new analysis
+        timestamp: Time of the analysis
+        domain_scores: 0-1 score per cognitive domain
+        risk_score: Overall 0-1 risk score
+
+    Returns:
+        The comparison (no changes if the baseline could not be updated)
+    """
+    scores = {getattr(domain, "value", domain): float(score) for domain, score in domain_scores.items()}
+    scores[RISK_SCORE_KEY] = float(risk_score)
+    try:
+        db = get_database()
+        previous = await db[COLLECTION_ANALYSIS_BASELINES].find_one_and_update(
+            {"_id": user_id},
+            {
+                "$push": {
+                    f"scores.{key}": {"$each": [score], "$slice": -ANALYSIS_BASELINE_WINDOW}
+                    for key, score in scores.items()
+                },
+                "$inc": {"analyses": 1},
+                "$set": {"updated_at": timestamp}
+            },
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+        comparison = compare_to_baseline((previous or {}).get("scores") or {}, scores)
+        if comparison.declined:
+            logger.warning(f"Meaningful decline for user {user_id} in {', '.join(comparison.declined)}")
+            await db[COLLECTION_ANALYSIS_BASELINES].update_one(
+                {"_id": user_id},
+                {"$set": {"last_decline": {
+                    "analysis_id": analysis_id,
+                    "timestamp": timestamp,
+                    "changes": {key: comparison.changes[key] for key in comparison.declined}
+                }}}
+            )
+        return comparison
+    except Exception as e:
+        logger.error(f"Failed to update analysis baseline for user {user_id}: {e}")
+        return BaselineComparison(None, [])
+
+
+async def get_baseline(user_id: str) -> AnalysisBaseline:
+    """
+    Get a user's current baseline.
+
+    Args:
+        user_id: ID of the user
+
+    Returns:
+        Robust mean and spread per score, and the latest decline alert
+    """
+    db = get_database()
+    document = await db[COLLECTION_ANALYSIS_BASELINES].find_one({"_id": user_id}) or {}
+    window = document.get("scores") or {}
+    return AnalysisBaseline(
+        user_id=user_id,
+        analyses=document.get("analyses", 0),
+        established=bool(window) and all(len(values) >= ANALYSIS_BASELINE_MIN_ANALYSES for values in window.values()),
+        baseline={key: robust_mean(values) for key, values in window.items() if values},
+        spread={key: robust_spread(values) for key, values in window.items() if values},
+        last_decline=DeclineAlert(**document["last_decline"]) if document.get("last_decline") else None
+    )
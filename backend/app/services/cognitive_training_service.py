@@ -3,90 +3,107 @@ Service for cognitive training exercises.
 
 Provides methods for generating and evaluating exercises.
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
+import math
 import random
 import string
 
 from app.models.training import (
     DifficultyLevel,
     Exercise,
-    ExerciseSession,
     ExerciseType,
-    ProgressMetrics
+    ProgressMetrics,
+    DailyPerformance,
+    ExerciseTrend,
+    ProgressTrends,
+    ResponseTimeAnalytics,
+    ResponseTimeStatistics
 )
-from app.db import get_database, COLLECTION_USER_METRICS
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.db import get_database, COLLECTION_TRAINING_SESSIONS, COLLECTION_USER_METRICS
+from app.services import exercise_content
+from app.services.adaptive_difficulty import (
+    DIFFICULTY_RATINGS,
+    difficulty_rating,
+    recommend_level,
+    replay_ratings,
+    session_outcome,
+    skill_update_expression
+)
+from app.utils.embeddings import get_category_embeddings
+from app.utils.lexicon import get_category_lexicon
+from app.utils.response_times import response_time_statistics
+from app.utils.word_matching import get_word_matcher
+
+# Recent accuracies kept per exercise type, and recent session times kept for consistency
+PERFORMANCE_TREND_LENGTH = 10
+SESSION_TIMESTAMP_HISTORY = 20
+
+# Gaps between consecutive sessions are capped (in days) when scoring consistency
+MAX_SESSION_GAP_DAYS = 14
+
+# Aggregation expression normalizing a session's accuracy to a percentage (0-100)
+ACCURACY_PERCENT_EXPRESSION = {
+    "$cond": [
+        {"$lte": [{"$ifNull": ["$accuracy", 0]}, 1]},
+        {"$multiply": [{"$ifNull": ["$accuracy", 0]}, 100]},
+        "$accuracy"
+    ]
+}
+
+# Banked Category Naming words at or after this position are "rare" (matches the frontend)
+CATEGORY_NAMING_RARITY_THRESHOLD = 20
+
+# Difficulty values that have a rating for adaptive difficulty
+DIFFICULTY_VALUES = {level.value for level in DIFFICULTY_RATINGS}
+
+# Human-readable names used for strengths and areas for improvement
+EXERCISE_TYPE_LABELS = {
+    ExerciseType.WORD_RECALL.value: "word recall",
+    ExerciseType.LANGUAGE_FLUENCY.value: "verbal fluency",
+    ExerciseType.MEMORY_MATCH.value: "memory match",
+    ExerciseType.CATEGORY_NAMING.value: "category naming",
+    ExerciseType.SEQUENCE_ORDERING.value: "sequence ordering",
+    ExerciseType.READING_COMPREHENSION.value: "reading comprehension",
+    ExerciseType.VERBAL_MEMORY.value: "verbal memory",
+    ExerciseType.SEMANTIC_ASSOCIATION.value: "semantic association",
+    ExerciseType.ATTENTION_TASK.value: "attention",
+}
 
 class CognitiveTrainingService:
     """Service for cognitive training exercises."""
     
     @staticmethod
-    def generate_word_recall_exercise(difficulty: DifficultyLevel) -> Exercise:
+    def generate_word_recall_exercise(difficulty: DifficultyLevel, progress: float = 0.0,
+                                      seed: Optional[int] = None) -> Exercise:
         """
         Generate a Word Recall exercise.
         
         Args:
             difficulty: Difficulty level of the exercise.
+            progress: Position between this level and the next (0-1), used by
+                adaptive difficulty to scale word count and display time.
+            seed: Random seed; the same seed and parameters give the same exercise.
             
         Returns:
             Exercise: The generated exercise.
         """
-        # Difficulty-based parameters
-        if difficulty == DifficultyLevel.BEGINNER:
-            word_count = 10
-            display_time = 30
-            recall_time = 60
-            min_score = 0.6
-            word_pool = [
-                "house", "tree", "dog", "car", "book", "chair", "water", 
-                "food", "sun", "ball", "cup", "door", "bird", "shoe", "fish", 
-                "table", "hat", "cat", "ring", "baby"
-            ]
-        elif difficulty == DifficultyLevel.INTERMEDIATE:
-            word_count = 15
-            display_time = 25
-            recall_time = 50
-            min_score = 0.65
-            word_pool = [
-                "freedom", "science", "journey", "knowledge", "universe", 
-                "beautiful", "dangerous", "important", "happiness", "education",
-                "adventure", "mountain", "terrible", "wonderful", "discovery",
-                "excitement", "community", "challenging", "brilliant", "peaceful"
-            ]
-        elif difficulty == DifficultyLevel.ADVANCED:
-            word_count = 20
-            display_time = 20
-            recall_time = 45
-            min_score = 0.7
-            word_pool = [
-                "algorithm", "philosophy", "correlation", "phenomenon", "microscopic",
-                "innovation", "sustainability", "renaissance", "psychology", "civilization",
-                "perspective", "magnificent", "substantial", "controversy", "extraordinary",
-                "theoretical", "spectacular", "celebration", "imagination", "fundamental",
-                "demonstration", "revolutionary", "appreciation", "consciousness", "intellectual"
-            ]
-        else:  # Expert
-            word_count = 25
-            display_time = 15
-            recall_time = 40
-            min_score = 0.75
-            word_pool = [
-                "verisimilitude", "juxtaposition", "serendipity", "magnanimous", "idiosyncrasy",
-                "sycophantic", "ephemeral", "perspicacious", "obfuscation", "sesquipedalian",
-                "pusillanimous", "mellifluous", "parsimonious", "quintessential", "fastidious",
-                "antediluvian", "cacophonous", "prevarication", "grandiloquent", "perfunctory",
-                "supercilious", "insouciance", "ubiquitous", "deleterious", "vituperative",
-                "obsequious", "loquacious", "irascible", "dilettante", "surreptitious"
-            ]
+        seed, rng = _generation_rng(seed)
+        parameters = exercise_content.WORD_RECALL[difficulty]
+        word_count, display_time, recall_time = parameters.word_count, parameters.display_time, parameters.recall_time
         
-        # Randomly select words from the pool
-        selected_words = random.sample(word_pool, min(word_count, len(word_pool)))
+        # Move part of the way towards the next level (5 more words, 5 seconds less)
+        if difficulty != DifficultyLevel.EXPERT:
+            word_count = _interpolate(word_count, word_count + 5, progress)
+            display_time = _interpolate(display_time, display_time - 5, progress)
         
-        # Generate a unique ID
-        exercise_id = f"wordrecall-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{random.randint(1000, 9999)}"
+        # Randomly select words from the pool
+        selected_words = rng.sample(parameters.words, min(word_count, len(parameters.words)))
         
         return Exercise(
-            id=exercise_id,
             title=f"{difficulty.capitalize()} Word Recall Challenge",
             description="Memorize a list of words, then recall as many as you can.",
             exercise_type=ExerciseType.WORD_RECALL,
@@ -97,69 +114,41 @@ class CognitiveTrainingService:
                 "words": selected_words,
                 "display_time": display_time,
                 "recall_time": recall_time,
-                "min_score": min_score
+                "min_score": parameters.min_score
             },
-            cognitive_domains=["memory", "recall", "verbal processing"]
+            cognitive_domains=["memory", "recall", "verbal processing"],
+            generation_seed=seed
         )
     
     @staticmethod
-    def generate_language_fluency_exercise(difficulty: DifficultyLevel) -> Exercise:
+    def generate_language_fluency_exercise(difficulty: DifficultyLevel, progress: float = 0.0,
+                                           seed: Optional[int] = None) -> Exercise:
         """
         Generate a Language Fluency exercise.
         
         Args:
             difficulty: Difficulty level of the exercise.
+            progress: Position between this level and the next (0-1), used by
+                adaptive difficulty to shorten the time limit.
+            seed: Random seed; the same seed and parameters give the same exercise.
             
         Returns:
             Exercise: The generated exercise.
         """
-        # Define categories for different difficulty levels
-        category_pools = {
-            DifficultyLevel.BEGINNER: ["animals", "foods", "colors", "clothing", "cities"],
-            DifficultyLevel.INTERMEDIATE: ["professions", "sports", "countries", "musical instruments", "vehicles", "body parts"],
-            DifficultyLevel.ADVANCED: ["scientific terms", "historical figures", "literary works", "medical conditions", "geographical features"],
-            DifficultyLevel.EXPERT: ["philosophical concepts", "rare plants", "chemical compounds", "neurological terms", "architectural elements"]
-        }
-        
-        # Define letter probabilities (easier vs. harder letters)
-        easy_letters = list("ASBEMPTR")
-        medium_letters = list("FGHLNOWJKV")
-        hard_letters = list("ICDQUXYZ")
-        
-        # Set difficulty parameters
-        if difficulty == DifficultyLevel.BEGINNER:
-            category_count = 1
-            time_limit = 60
-            min_words = 3
-            letter_pool = easy_letters
-        elif difficulty == DifficultyLevel.INTERMEDIATE:
-            category_count = 2
-            time_limit = 50
-            min_words = 4
-            letter_pool = easy_letters + medium_letters
-        elif difficulty == DifficultyLevel.ADVANCED:
-            category_count = 3
-            time_limit = 45
-            min_words = 5
-            letter_pool = medium_letters + hard_letters
-        else:  # Expert
-            category_count = 4
-            time_limit = 40
-            min_words = 6
-            letter_pool = hard_letters
+        seed, rng = _generation_rng(seed)
+        parameters = exercise_content.LANGUAGE_FLUENCY[difficulty]
+        time_limit = _interpolate(parameters.time_limit, parameters.next_time_limit, progress)
+        min_words = parameters.min_words
         
         # Select random categories based on difficulty
-        available_categories = category_pools[difficulty]
-        selected_categories = random.sample(available_categories, min(category_count, len(available_categories)))
+        selected_categories = rng.sample(
+            parameters.categories, min(parameters.category_count, len(parameters.categories))
+        )
         
         # Select a random letter
-        selected_letter = random.choice(letter_pool)
-        
-        # Generate a unique ID
-        exercise_id = f"langfluency-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{random.randint(1000, 9999)}"
+        selected_letter = rng.choice(parameters.letters)
         
         return Exercise(
-            id=exercise_id,
             title=f"{difficulty.capitalize()} Language Fluency Game",
             description=f"Generate words starting with the letter '{selected_letter}' in different categories.",
             exercise_type=ExerciseType.LANGUAGE_FLUENCY,
@@ -172,60 +161,228 @@ class CognitiveTrainingService:
                 "time_limit": time_limit,
                 "min_words_per_category": min_words
             },
-            cognitive_domains=["verbal fluency", "executive function", "processing speed", "semantic memory"]
+            cognitive_domains=["verbal fluency", "executive function", "processing speed", "semantic memory"],
+            generation_seed=seed
         )
     
     @staticmethod
-    def generate_memory_match_exercise(difficulty: DifficultyLevel) -> Exercise:
+    def generate_memory_match_exercise(difficulty: DifficultyLevel, progress: float = 0.0,
+                                       seed: Optional[int] = None) -> Exercise:
         """
         Generate a Memory Match exercise.
         
         Args:
             difficulty: Difficulty level of the exercise.
+            progress: Unused; Memory Match grids only change between levels.
+            seed: Random seed recorded with the exercise (card layout is dealt by the frontend).
             
         Returns:
             Exercise: The generated exercise.
         """
-        # Difficulty-based parameters matching frontend implementation
-        if difficulty == DifficultyLevel.BEGINNER:
-            grid_size = {"rows": 2, "cols": 2}
-            pairs = 2
-            time_bonus = 15
-            ideal_moves = 4
-        elif difficulty == DifficultyLevel.INTERMEDIATE:
-            grid_size = {"rows": 4, "cols": 4}
-            pairs = 8
-            time_bonus = 60
-            ideal_moves = 16
-        elif difficulty == DifficultyLevel.ADVANCED:
-            grid_size = {"rows": 6, "cols": 6}
-            pairs = 18
-            time_bonus = 120
-            ideal_moves = 36
-        else:  # Expert
-            grid_size = {"rows": 8, "cols": 8}
-            pairs = 32
-            time_bonus = 240
-            ideal_moves = 64
-        
-        # Generate a unique ID
-        exercise_id = f"memorymatch-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{random.randint(1000, 9999)}-{difficulty.value}"
+        seed, _ = _generation_rng(seed)
+        parameters = exercise_content.MEMORY_MATCH[difficulty]
+        grid_size = {"rows": parameters.rows, "cols": parameters.cols}
         
         return Exercise(
-            id=exercise_id,
             title=f"{difficulty.capitalize()} Memory Match Game",
             description="Match question cards with their corresponding answer cards to improve memory and attention.",
             exercise_type=ExerciseType.MEMORY_MATCH,
             difficulty=difficulty,
-            estimated_duration=time_bonus + 60,  # Time bonus threshold plus setup time
-            instructions=f"Match {pairs} pairs of question and answer cards in a {grid_size['rows']}×{grid_size['cols']} grid.",
+            estimated_duration=parameters.time_bonus + 60,  # Time bonus threshold plus setup time
+            instructions=f"Match {parameters.pairs} pairs of question and answer cards in a {grid_size['rows']}×{grid_size['cols']} grid.",
             content={
                 "grid_size": grid_size,
-                "pairs": pairs,
-                "time_bonus": time_bonus,
-                "ideal_moves": ideal_moves
+                "pairs": parameters.pairs,
+                "time_bonus": parameters.time_bonus,
+                "ideal_moves": parameters.ideal_moves
+            },
+            cognitive_domains=["working memory", "visual processing", "attention", "executive function"],
+            generation_seed=seed
+        )
+    
+    @staticmethod
+    def generate_reading_comprehension_exercise(difficulty: DifficultyLevel, progress: float = 0.0,
+                                                seed: Optional[int] = None) -> Exercise:
+        """
+        Generate a Reading Comprehension exercise.
+        
+        The content holds the passage and the questions without their answers;
+        answers are looked up by passage ID when the exercise is evaluated.
+        Options are shown in a shuffled order, kept in `option_orders` as the
+        passage's option index at each shown position.
+        
+        Args:
+            difficulty: Difficulty level of the exercise.
+            progress: Unused; passages are written per level.
+            seed: Random seed; the same seed and parameters give the same exercise.
+            
+        Returns:
+            Exercise: The generated exercise.
+        """
+        seed, rng = _generation_rng(seed)
+        parameters = exercise_content.READING_COMPREHENSION[difficulty]
+        passage = rng.choice(parameters.passages)
+        questions = []
+        option_orders = {}
+        for question in passage.questions:
+            order = list(range(len(question.options)))
+            rng.shuffle(order)
+            option_orders[question.id] = order
+            questions.append({
+                "id": question.id,
+                "question": question.question,
+                "options": [question.options[index] for index in order]
+            })
+        
+        return Exercise(
+            title=f"{difficulty.capitalize()} Reading Comprehension: {passage.title}",
+            description="Read a short passage, then answer questions about it from memory.",
+            exercise_type=ExerciseType.READING_COMPREHENSION,
+            difficulty=difficulty,
+            estimated_duration=parameters.reading_time + parameters.answer_time + 15,  # Extra time for setup
+            instructions=f"Read the passage carefully. After {parameters.reading_time} seconds it will be hidden and you will answer {len(passage.questions)} questions.",
+            content={
+                "passage_id": passage.id,
+                "title": passage.title,
+                "passage": passage.text,
+                "questions": questions,
+                "option_orders": option_orders,
+                "reading_time": parameters.reading_time,
+                "answer_time": parameters.answer_time,
+                "min_score": parameters.min_score
+            },
+            cognitive_domains=["language comprehension", "memory", "attention"],
+            generation_seed=seed
+        )
+    
+    @staticmethod
+    def generate_verbal_memory_exercise(difficulty: DifficultyLevel, progress: float = 0.0,
+                                        seed: Optional[int] = None) -> Exercise:
+        """
+        Generate a Verbal Memory (continuous recognition) exercise.
+        
+        Words are shown one at a time and the user says whether each one has
+        already appeared; every word is shown at least once before it repeats.
+        
+        Args:
+            difficulty: Difficulty level of the exercise.
+            progress: Unused; sequence length only changes between levels.
+            seed: Random seed; the same seed and parameters give the same exercise.
+            
+        Returns:
+            Exercise: The generated exercise.
+        """
+        seed, rng = _generation_rng(seed)
+        parameters = exercise_content.VERBAL_MEMORY[difficulty]
+        words = rng.sample(exercise_content.VERBAL_MEMORY_WORDS, parameters.distinct_words)
+        
+        # Present every word once in order, then insert repeats of earlier words
+        sequence = list(words)
+        for _ in range(parameters.sequence_length - parameters.distinct_words):
+            position = rng.randint(1, len(sequence))
+            sequence.insert(position, rng.choice(sequence[:position]))
+        total_time = parameters.sequence_length * parameters.display_time_ms // 1000
+        
+        return Exercise(
+            title=f"{difficulty.capitalize()} Verbal Memory",
+            description="Decide whether each word has already been shown.",
+            exercise_type=ExerciseType.VERBAL_MEMORY,
+            difficulty=difficulty,
+            estimated_duration=total_time + 15,  # Extra time for setup
+            instructions=f"Words appear one at a time. For each of the {parameters.sequence_length} words, answer 'seen' if it appeared before or 'new' if it did not.",
+            content={
+                "words": sequence,
+                "display_time_ms": parameters.display_time_ms,
+                "min_score": parameters.min_score
             },
-            cognitive_domains=["working memory", "visual processing", "attention", "executive function"]
+            cognitive_domains=["verbal memory", "recognition", "attention"],
+            generation_seed=seed
+        )
+    
+    @staticmethod
+    def generate_semantic_association_exercise(difficulty: DifficultyLevel, progress: float = 0.0,
+                                               seed: Optional[int] = None) -> Exercise:
+        """
+        Generate a Semantic Association exercise.
+        
+        Each item is a cue word with shuffled options; answers are looked up
+        by item ID when the exercise is evaluated.
+        
+        Args:
+            difficulty: Difficulty level of the exercise.
+            progress: Unused; items are written per level.
+            seed: Random seed; the same seed and parameters give the same exercise.
+            
+        Returns:
+            Exercise: The generated exercise.
+        """
+        seed, rng = _generation_rng(seed)
+        parameters = exercise_content.SEMANTIC_ASSOCIATION[difficulty]
+        items = []
+        for item in rng.sample(parameters.items, min(parameters.item_count, len(parameters.items))):
+            options = [item.answer, *item.distractors]
+            rng.shuffle(options)
+            items.append({"id": item.id, "cue": item.cue, "options": options})
+        
+        return Exercise(
+            title=f"{difficulty.capitalize()} Semantic Association",
+            description="Pick the word most closely related to each cue.",
+            exercise_type=ExerciseType.SEMANTIC_ASSOCIATION,
+            difficulty=difficulty,
+            estimated_duration=parameters.time_limit + 15,  # Extra time for setup
+            instructions=f"For each of the {len(items)} cue words, choose the option that is most closely related in meaning. You have {parameters.time_limit} seconds.",
+            content={
+                "items": items,
+                "time_limit": parameters.time_limit,
+                "min_score": parameters.min_score
+            },
+            cognitive_domains=["semantic memory", "executive function", "language"],
+            generation_seed=seed
+        )
+    
+    @staticmethod
+    def generate_attention_task_exercise(difficulty: DifficultyLevel, progress: float = 0.0,
+                                         seed: Optional[int] = None) -> Exercise:
+        """
+        Generate an Attention Task (go/no-go) exercise.
+        
+        Args:
+            difficulty: Difficulty level of the exercise.
+            progress: Unused; timing only changes between levels.
+            seed: Random seed; the same seed and parameters give the same exercise.
+            
+        Returns:
+            Exercise: The generated exercise.
+        """
+        seed, rng = _generation_rng(seed)
+        parameters = exercise_content.ATTENTION_TASK[difficulty]
+        target = exercise_content.ATTENTION_TARGET
+        
+        # Exact number of targets at random positions, never the first stimulus
+        target_count = max(1, round(parameters.stimulus_count * parameters.target_rate))
+        target_positions = set(rng.sample(range(1, parameters.stimulus_count), target_count))
+        stimuli = [
+            target if position in target_positions else rng.choice(parameters.distractors)
+            for position in range(parameters.stimulus_count)
+        ]
+        total_time = parameters.stimulus_count * (parameters.stimulus_time_ms + parameters.interval_ms) // 1000
+        
+        return Exercise(
+            title=f"{difficulty.capitalize()} Attention Task",
+            description=f"Respond as quickly as you can when '{target}' appears, and hold back for every other letter.",
+            exercise_type=ExerciseType.ATTENTION_TASK,
+            difficulty=difficulty,
+            estimated_duration=total_time + 15,  # Extra time for setup
+            instructions=f"{parameters.stimulus_count} letters will flash on the screen. Press the button only when you see '{target}'.",
+            content={
+                "target": target,
+                "stimuli": stimuli,
+                "stimulus_time_ms": parameters.stimulus_time_ms,
+                "interval_ms": parameters.interval_ms,
+                "min_score": parameters.min_score
+            },
+            cognitive_domains=["sustained attention", "inhibitory control", "processing speed"],
+            generation_seed=seed
         )
     
     @staticmethod
@@ -243,34 +400,15 @@ class CognitiveTrainingService:
         target_words = exercise.content["words"]
         min_score = exercise.content["min_score"]
         
-        # Normalize target words for comparison
-        normalized_targets = [word.lower().strip() for word in target_words]
+        # Match answers against the exercise's (cached) target index; each
+        # target counts once and plurals or small typos are accepted
+        matcher = get_word_matcher(target_words)
+        matched_indexes, matches = matcher.match(user_answers)
+        correctly_recalled = [target_words[index] for index in matched_indexes]
         
-        # Count correctly recalled words (case-insensitive and trim whitespace)
-        correctly_recalled = []
-        for word in user_answers:
-            # Normalize user's answer
-            normalized_word = word.lower().strip()
-            
-            # Check if the normalized word matches any target word
-            if normalized_word in normalized_targets:
-                # Find the original casing from target_words
-                original_index = normalized_targets.index(normalized_word)
-                correctly_recalled.append(target_words[original_index])
-            elif any(normalized_word == target.lower().strip() for target in target_words):
-                # This is a fallback in case the first check doesn't catch it
-                # Get the original case version
-                for target in target_words:
-                    if normalized_word == target.lower().strip():
-                        correctly_recalled.append(target)
-                        break
-        
-        # Get words that were missed (using normalized comparison)
-        missed_words = []
-        normalized_correct = [word.lower().strip() for word in correctly_recalled]
-        for target in target_words:
-            if target.lower().strip() not in normalized_correct:
-                missed_words.append(target)
+        # Get words that were missed
+        matched = set(matched_indexes)
+        missed_words = [word for index, word in enumerate(target_words) if index not in matched]
         
         # Calculate accuracy and score
         accuracy = len(correctly_recalled) / len(target_words) if target_words else 0
@@ -289,7 +427,8 @@ class CognitiveTrainingService:
             "accuracy": accuracy,
             "feedback": feedback,
             "correctly_recalled": correctly_recalled,
-            "missed_words": missed_words
+            "missed_words": missed_words,
+            "matches": matches
         }
     
     @staticmethod
@@ -307,6 +446,7 @@ class CognitiveTrainingService:
         target_letter = exercise.content["letter"].lower()
         categories = exercise.content["categories"]
         min_words_per_category = exercise.content["min_words_per_category"]
+        lexicon = get_category_lexicon()
         
         # Process results for each category
         category_results = {}
@@ -317,10 +457,13 @@ class CognitiveTrainingService:
             # Get user's answers for this category (default to empty list if missing)
             user_answers_for_category = user_answers.get(category, [])
             
-            # Filter for valid words (starting with the target letter)
+            # Filter for valid words (starting with the target letter and, where
+            # the lexicon lists words for this category and letter, in the category)
+            validated = lexicon is not None and lexicon.covers(category, target_letter)
             valid_words = [
                 word for word in user_answers_for_category
                 if word.lower().startswith(target_letter)
+                and (not validated or lexicon.contains(category, word))
             ]
             
             # Remove duplicates (case-insensitive)
@@ -345,7 +488,8 @@ class CognitiveTrainingService:
                 "words": unique_valid_words,
                 "valid_count": len(unique_valid_words),
                 "achieved_minimum": achieved_minimum,
-                "score": category_score
+                "score": category_score,
+                "category_validated": validated
             }
         
         # Calculate overall metrics
@@ -428,6 +572,61 @@ class CognitiveTrainingService:
             "time_taken": time_elapsed
         }
 
+    @staticmethod
+    def validate_category_naming_entries(category_id: str, entries: List[str]) -> Optional[Dict]:
+        """
+        Validate Category Naming entries on the server.
+        
+        An entry counts if it is listed in the category's word bank or if its
+        embedding is close enough to the category centroid. All entries are
+        scored against the centroid in one vectorized batch.
+        
+        Args:
+            category_id: ID of the category that was played.
+            entries: Entries the client reported as correct.
+            
+        Returns:
+            Dict with accepted and rejected entries, the number of rare accepted
+            entries and per-entry similarities, or None if the embedding index
+            is unavailable or does not know the category.
+        """
+        index = get_category_embeddings()
+        if index is None or not index.has_category(category_id):
+            return None
+        
+        # Deduplicate case-insensitively, keeping the first spelling
+        seen = set()
+        unique_entries = []
+        for entry in entries:
+            key = entry.strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                unique_entries.append(entry)
+        similarities = index.similarities(category_id, unique_entries)
+        threshold = index.threshold(category_id)
+        
+        accepted, rejected, similarity_by_entry = [], [], {}
+        rare_count = 0
+        for entry, similarity in zip(unique_entries, similarities.tolist()):
+            similarity_by_entry[entry] = None if math.isnan(similarity) else round(similarity, 3)
+            position = index.banked_position(category_id, entry)
+            if position is not None:
+                accepted.append(entry)
+                if position >= CATEGORY_NAMING_RARITY_THRESHOLD:
+                    rare_count += 1
+            elif not math.isnan(similarity) and similarity >= threshold:
+                accepted.append(entry)
+            else:
+                rejected.append(entry)
+        
+        return {
+            "accepted": accepted,
+            "rejected": rejected,
+            "rare_count": rare_count,
+            "similarities": similarity_by_entry,
+            "threshold": threshold
+        }
+    
     @staticmethod
     def evaluate_sequence_ordering_session(exercise: Exercise, user_order: List[str], moves_used: int,
                                          time_elapsed: int, correct_count: int, total_steps: int,
@@ -524,121 +723,831 @@ class CognitiveTrainingService:
         }
     
     @staticmethod
-    async def update_progress_metrics(user_id: str, exercise_session: ExerciseSession, 
-                                    evaluation_result: Dict, exercise_type: ExerciseType) -> None:
+    def evaluate_reading_comprehension_session(exercise: Exercise, user_answers: Dict[str, int]) -> Dict:
         """
-        Update a user's progress metrics after completing an exercise.
+        Evaluate a Reading Comprehension session.
+        
+        Args:
+            exercise: The exercise that was completed.
+            user_answers: Question ID -> index of the chosen option, as shown.
+            
+        Returns:
+            Dict: Evaluation results containing score, accuracy, feedback and per-question results.
+        """
+        passage = exercise_content.READING_PASSAGES[exercise.content["passage_id"]]
+        # Exercises generated before options were shuffled have no option_orders
+        option_orders = exercise.content.get("option_orders") or {}
+        question_results = []
+        for question in passage.questions:
+            order = option_orders.get(question.id) or list(range(len(question.options)))
+            correct_option = order.index(question.answer)
+            chosen = user_answers.get(question.id)
+            question_results.append({
+                "question_id": question.id,
+                "chosen": chosen,
+                "correct_option": correct_option,
+                "correct": chosen == correct_option
+            })
+        
+        correct_count = sum(1 for result in question_results if result["correct"])
+        accuracy = correct_count / len(question_results) if question_results else 0
+        feedback = _threshold_feedback(
+            accuracy, exercise.content["min_score"],
+            "Excellent reading! You understood and remembered the key details.",
+            "Good work! Try pausing after each sentence to picture what it describes.",
+            "Reading for details takes practice. Try summarizing the passage in your head before answering."
+        )
+        
+        return {
+            "score": accuracy * 100,
+            "accuracy": accuracy,
+            "feedback": feedback,
+            "correct_count": correct_count,
+            "question_results": question_results
+        }
+    
+    @staticmethod
+    def evaluate_verbal_memory_session(exercise: Exercise, responses: List[bool]) -> Dict:
+        """
+        Evaluate a Verbal Memory session.
+        
+        Args:
+            exercise: The exercise that was completed.
+            responses: Per shown word, True if the user answered "seen"
+                (missing trailing responses count as "new").
+            
+        Returns:
+            Dict: Evaluation results containing score, accuracy, feedback and recognition counts.
+        """
+        words = exercise.content["words"]
+        seen = set()
+        hits = misses = false_alarms = correct_rejections = 0
+        for position, word in enumerate(words):
+            answered_seen = position < len(responses) and bool(responses[position])
+            if word in seen:
+                hits += answered_seen
+                misses += not answered_seen
+            else:
+                false_alarms += answered_seen
+                correct_rejections += not answered_seen
+                seen.add(word)
+        
+        repeats = hits + misses
+        new_words = false_alarms + correct_rejections
+        hit_rate = hits / repeats if repeats else 0
+        false_alarm_rate = false_alarms / new_words if new_words else 0
+        # Balanced accuracy: answering "new" to every word scores 0.5, not the share of new words
+        accuracy = (hit_rate + (1 - false_alarm_rate)) / 2 if words else 0
+        feedback = _threshold_feedback(
+            accuracy, exercise.content["min_score"],
+            "Great recognition memory! You reliably told new words from repeated ones.",
+            "Good effort! Linking each word to an image can make repeats easier to spot.",
+            "Keep practicing. Try saying each word silently to strengthen the memory trace."
+        )
+        
+        return {
+            "score": accuracy * 100,
+            "accuracy": accuracy,
+            "feedback": feedback,
+            "hits": hits,
+            "misses": misses,
+            "false_alarms": false_alarms,
+            "correct_rejections": correct_rejections,
+            "discrimination": hit_rate - false_alarm_rate
+        }
+    
+    @staticmethod
+    def evaluate_semantic_association_session(exercise: Exercise, user_answers: Dict[str, str]) -> Dict:
+        """
+        Evaluate a Semantic Association session.
+        
+        Args:
+            exercise: The exercise that was completed.
+            user_answers: Item ID -> chosen option.
+            
+        Returns:
+            Dict: Evaluation results containing score, accuracy, feedback and per-item results.
+        """
+        item_results = []
+        for presented in exercise.content["items"]:
+            item = exercise_content.SEMANTIC_ITEMS[presented["id"]]
+            chosen = user_answers.get(item.id)
+            item_results.append({
+                "item_id": item.id,
+                "cue": item.cue,
+                "chosen": chosen,
+                "answer": item.answer,
+                "correct": chosen is not None and chosen.strip().lower() == item.answer
+            })
+        
+        correct_count = sum(1 for result in item_results if result["correct"])
+        accuracy = correct_count / len(item_results) if item_results else 0
+        feedback = _threshold_feedback(
+            accuracy, exercise.content["min_score"],
+            "Excellent! Your semantic knowledge is strong.",
+            "Good work! Think about how the words are used together in everyday life.",
+            "Keep practicing. Try describing each cue word before looking at the options."
+        )
+        
+        return {
+            "score": accuracy * 100,
+            "accuracy": accuracy,
+            "feedback": feedback,
+            "correct_count": correct_count,
+            "item_results": item_results
+        }
+    
+    @staticmethod
+    def evaluate_attention_task_session(exercise: Exercise, responses: List[bool],
+                                        response_times_ms: Optional[List[float]] = None) -> Dict:
+        """
+        Evaluate an Attention Task (go/no-go) session.
+        
+        Args:
+            exercise: The exercise that was completed.
+            responses: Per stimulus, True if the user responded
+                (missing trailing responses count as no response).
+            response_times_ms: Reaction times of the user's responses, in order
+                (ignored unless there is exactly one per response).
+            
+        Returns:
+            Dict: Evaluation results containing score, accuracy, feedback and error counts.
+        """
+        stimuli = exercise.content["stimuli"]
+        target = exercise.content["target"]
+        hits = omissions = commissions = correct_inhibitions = 0
+        for position, stimulus in enumerate(stimuli):
+            responded = position < len(responses) and bool(responses[position])
+            if stimulus == target:
+                hits += responded
+                omissions += not responded
+            else:
+                commissions += responded
+                correct_inhibitions += not responded
+        
+        # Balanced accuracy: never responding scores 0.5, not the share of non-targets
+        targets = hits + omissions
+        non_targets = commissions + correct_inhibitions
+        hit_rate = hits / targets if targets else 1
+        inhibition_rate = correct_inhibitions / non_targets if non_targets else 1
+        accuracy = (hit_rate + inhibition_rate) / 2 if stimuli else 0
+        
+        # Times only line up with the responses when there is one per response
+        response_times_ms = response_times_ms or []
+        if len(response_times_ms) != hits + commissions:
+            response_times_ms = []
+        times = [t for t in response_times_ms if t is not None and t > 0]
+        mean_response_time = sum(times) / len(times) if times else None
+        feedback = _threshold_feedback(
+            accuracy, exercise.content["min_score"],
+            "Sharp focus! You responded to the targets and held back on the rest.",
+            "Good effort! Keep your eyes on the center of the screen between letters.",
+            "Attention improves with practice. Try a slower level and focus on accuracy before speed."
+        )
+        if commissions > omissions and commissions > 2:
+            feedback += " Tip: Wait until you are sure the letter is the target before responding."
+        
+        return {
+            "score": accuracy * 100,
+            "accuracy": accuracy,
+            "feedback": feedback,
+            "hits": hits,
+            "omissions": omissions,
+            "commission_errors": commissions,
+            "correct_inhibitions": correct_inhibitions,
+            "mean_response_time_ms": mean_response_time
+        }
+    
+    @staticmethod
+    async def record_sessions_progress(user_id: str, sessions: List[Dict]) -> ProgressMetrics:
+        """
+        Update a user's progress aggregate for one or more stored sessions at once.
+        
+        All sessions are folded into a single pipeline update, so a batch of
+        sessions costs one round trip regardless of its size.
         
         Args:
             user_id: ID of the user.
-            exercise_session: The completed exercise session.
-            evaluation_result: Evaluation results from the session.
-            exercise_type: Type of exercise (word_recall, language_fluency)
+            sessions: training_sessions documents (exercise_type, difficulty,
+                accuracy, duration and end_time are used).
+            
+        Returns:
+            The user's updated progress metrics.
         """
+        entries = []
+        for session in sessions:
+            entries.append({
+                "exercise_type": ExerciseType(session["exercise_type"]).value,
+                "accuracy": _accuracy_percent(session.get("accuracy", 0)),
+                "duration": session.get("duration") or 0,
+                "completed_at": session.get("end_time") or datetime.utcnow(),
+                "difficulty": DifficultyLevel(session["difficulty"]).value if session.get("difficulty") else None
+            })
+        return await CognitiveTrainingService._apply_progress_update(user_id, entries)
+    
+    @staticmethod
+    async def _apply_progress_update(user_id: str, entries: List[Dict]) -> ProgressMetrics:
+        """Apply the progress update pipeline for `entries` and return the updated metrics."""
         db = get_database()
+        pipeline = _progress_update_pipeline(entries, datetime.utcnow())
+        
+        try:
+            user_metrics = await db[COLLECTION_USER_METRICS].find_one_and_update(
+                {"user_id": user_id}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Two first-ever submissions raced to insert the aggregate; the
+            # unique user_id index let one win, so this retry is an update
+            user_metrics = await db[COLLECTION_USER_METRICS].find_one_and_update(
+                {"user_id": user_id}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+            )
         
-        # Get current metrics or create new ones
+        return progress_metrics_from_aggregate(user_metrics)
+    
+    @staticmethod
+    async def get_progress_metrics(user_id: str) -> ProgressMetrics:
+        """
+        Get a user's progress metrics from their incrementally maintained aggregate.
+        
+        Args:
+            user_id: ID of the user.
+            
+        Returns:
+            The user's progress metrics (defaults if they have no sessions).
+        """
+        db = get_database()
         user_metrics = await db[COLLECTION_USER_METRICS].find_one({"user_id": user_id})
         
         if not user_metrics:
-            # Create default metrics for new user
-            user_metrics = {
-                "user_id": user_id,
-                "total_sessions": 0,
-                "total_time_spent": 0,
-                "average_scores": {},
-                "performance_trends": {},
-                "strengths": [],
-                "areas_for_improvement": [],
-                "consistency_score": 0.0,
-                "exercise_history": {},
-                "last_updated": datetime.utcnow()
-            }
+            return ProgressMetrics(user_id=user_id)
+        
+        return progress_metrics_from_aggregate(user_metrics)
+    
+    @staticmethod
+    async def get_skill_rating(user_id: str, exercise_type: ExerciseType) -> Optional[float]:
+        """
+        Get a user's adaptive difficulty rating for an exercise type.
+        
+        Args:
+            user_id: ID of the user.
+            exercise_type: Type of exercise.
+            
+        Returns:
+            The rating, or None if the user has no rated sessions of this type.
+        """
+        field = f"skill.{ExerciseType(exercise_type).value}"
+        db = get_database()
+        user_metrics = await db[COLLECTION_USER_METRICS].find_one(
+            {"user_id": user_id}, {"_id": 0, field: 1}
+        )
+        state = (user_metrics or {}).get("skill", {}).get(ExerciseType(exercise_type).value)
+        return state["rating"] if state else None
+    
+    @staticmethod
+    async def rebuild_progress_metrics(user_id: str) -> Optional[Dict]:
+        """
+        Rebuild a user's progress aggregate from their training sessions.
+        
+        Used to backfill aggregates for sessions recorded before incremental
+        aggregation, or to repair an aggregate that has drifted.
         
-        # Convert exercise_type to string if needed
-        exercise_type_str = exercise_type if isinstance(exercise_type, str) else exercise_type.value
-        
-        # Update total sessions and time spent
-        user_metrics["total_sessions"] = user_metrics.get("total_sessions", 0) + 1
-        
-        # Calculate session duration 
-        duration = 0
-        if hasattr(exercise_session, "start_time") and hasattr(exercise_session, "end_time"):
-            if exercise_session.start_time and exercise_session.end_time:
-                duration = (exercise_session.end_time - exercise_session.start_time).total_seconds()
-        
-        user_metrics["total_time_spent"] = user_metrics.get("total_time_spent", 0) + duration
-        
-        # Record session timestamp for consistency tracking
-        if "session_timestamps" not in user_metrics:
-            user_metrics["session_timestamps"] = []
-        
-        # Add current timestamp
-        user_metrics["session_timestamps"].append(datetime.utcnow().isoformat())
-        
-        # Keep only the last 20 timestamps
-        user_metrics["session_timestamps"] = user_metrics["session_timestamps"][-20:]
-        
-        # Update performance trends for this exercise type
-        if "performance_trends" not in user_metrics:
-            user_metrics["performance_trends"] = {}
-        
-        if exercise_type_str not in user_metrics["performance_trends"]:
-            user_metrics["performance_trends"][exercise_type_str] = []
-        
-        # Add the latest accuracy score (normalized to percentage), keeping only the last 10 scores
-        accuracy = evaluation_result.get("accuracy", 0)
-        # Ensure accuracy is in percentage format (0-100)
-        if accuracy <= 1.0:
-            accuracy = accuracy * 100  # Convert from decimal to percentage
-        user_metrics["performance_trends"][exercise_type_str].append(accuracy)
-        user_metrics["performance_trends"][exercise_type_str] = user_metrics["performance_trends"][exercise_type_str][-10:]
-        
-        # Update average scores
-        if "average_scores" not in user_metrics:
-            user_metrics["average_scores"] = {}
-        
-        # Calculate new average using accuracy scores
-        scores = user_metrics["performance_trends"][exercise_type_str]
-        user_metrics["average_scores"][exercise_type_str] = sum(scores) / len(scores)
-        
-        # Determine strengths and areas for improvement
-        strengths = []
-        areas_for_improvement = []
-        
-        for ex_type, avg_score in user_metrics["average_scores"].items():
-            if avg_score >= 80:
-                if ex_type == ExerciseType.WORD_RECALL or ex_type == "word_recall":
-                    strengths.append("word recall")
-                elif ex_type == ExerciseType.LANGUAGE_FLUENCY or ex_type == "language_fluency":
-                    strengths.append("verbal fluency")
-                elif ex_type == ExerciseType.MEMORY_MATCH or ex_type == "memory_match":
-                    strengths.append("memory match")
-                elif ex_type == ExerciseType.SEQUENCE_ORDERING or ex_type == "sequence_ordering":
-                    strengths.append("sequence ordering")
-                elif ex_type == ExerciseType.CATEGORY_NAMING or ex_type == "category_naming":
-                    strengths.append("category naming")
-            elif avg_score <= 60:
-                if ex_type == ExerciseType.WORD_RECALL or ex_type == "word_recall":
-                    areas_for_improvement.append("word recall")
-                elif ex_type == ExerciseType.LANGUAGE_FLUENCY or ex_type == "language_fluency":
-                    areas_for_improvement.append("verbal fluency")
-                elif ex_type == ExerciseType.MEMORY_MATCH or ex_type == "memory_match":
-                    areas_for_improvement.append("memory match")
-                elif ex_type == ExerciseType.SEQUENCE_ORDERING or ex_type == "sequence_ordering":
-                    areas_for_improvement.append("sequence ordering")
-                elif ex_type == ExerciseType.CATEGORY_NAMING or ex_type == "category_naming":
-                    areas_for_improvement.append("category naming")
-        
-        user_metrics["strengths"] = list(set(strengths))  # Remove duplicates
-        user_metrics["areas_for_improvement"] = list(set(areas_for_improvement))  # Remove duplicates
-        
-        # Update last_updated timestamp
-        user_metrics["last_updated"] = datetime.utcnow()
-        
-        # Save the updated metrics
-        await db[COLLECTION_USER_METRICS].update_one(
+        Args:
+            user_id: ID of the user.
+            
+        Returns:
+            The rebuilt aggregate, or None if the user has no sessions.
+        """
+        db = get_database()
+        
+        accuracy_percent = ACCURACY_PERCENT_EXPRESSION
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$sort": {"created_at": 1}},
+            {"$group": {
+                "_id": "$exercise_type",
+                "count": {"$sum": 1},
+                "accuracy_sum": {"$sum": accuracy_percent},
+                "duration": {"$sum": {"$ifNull": ["$duration", 0]}},
+                "accuracies": {"$push": accuracy_percent},
+                "timestamps": {"$push": "$created_at"},
+                "first_session_at": {"$min": "$created_at"},
+                "last_session_at": {"$max": "$created_at"}
+            }},
+            {"$project": {
+                "count": 1,
+                "accuracy_sum": 1,
+                "duration": 1,
+                "first_session_at": 1,
+                "last_session_at": 1,
+                "accuracies": {"$slice": ["$accuracies", -PERFORMANCE_TREND_LENGTH]},
+                "timestamps": {"$slice": ["$timestamps", -SESSION_TIMESTAMP_HISTORY]}
+            }}
+        ]
+        groups = await db[COLLECTION_TRAINING_SESSIONS].aggregate(pipeline).to_list(length=None)
+        groups = [group for group in groups if group["_id"]]
+        if not groups:
+            return None
+        
+        # Gaps between consecutive sessions over the full history
+        gap_pipeline = [
+            {"$match": {"user_id": user_id, "created_at": {"$ne": None}}},
+            {"$setWindowFields": {
+                "sortBy": {"created_at": 1},
+                "output": {"previous_at": {"$shift": {"output": "$created_at", "by": -1}}}
+            }},
+            {"$match": {"previous_at": {"$ne": None}}},
+            {"$group": {
+                "_id": None,
+                "gap_sum": {"$sum": _capped_gap_days_expression("$previous_at", "$created_at")},
+                "gap_count": {"$sum": 1}
+            }}
+        ]
+        gaps = await db[COLLECTION_TRAINING_SESSIONS].aggregate(gap_pipeline).to_list(length=1)
+        gap_totals = gaps[0] if gaps else {"gap_sum": 0, "gap_count": 0}
+        
+        # Skill ratings are path dependent, so they are replayed in order
+        rated_sessions = await db[COLLECTION_TRAINING_SESSIONS].find(
             {"user_id": user_id},
-            {"$set": user_metrics},
-            upsert=True
-        ) 
\ No newline at end of file
+            {"_id": 0, "exercise_type": 1, "difficulty": 1, "accuracy": 1}
+        ).sort("created_at", 1).to_list(length=None)
+        skill = replay_ratings([
+            {**session, "accuracy": _accuracy_percent(session.get("accuracy"))}
+            for session in rated_sessions if session.get("exercise_type")
+        ])
+        
+        timestamps = sorted(ts for group in groups for ts in group["timestamps"] if ts)
+        aggregate = {
+            "user_id": user_id,
+            "total_sessions": sum(group["count"] for group in groups),
+            "total_time_spent": sum(group["duration"] for group in groups),
+            "exercise_stats": {
+                group["_id"]: {"count": group["count"], "accuracy_sum": group["accuracy_sum"]}
+                for group in groups
+            },
+            "performance_trends": {group["_id"]: group["accuracies"] for group in groups},
+            "session_timestamps": timestamps[-SESSION_TIMESTAMP_HISTORY:],
+            "first_session_at": min(group["first_session_at"] for group in groups),
+            "last_session_at": max(group["last_session_at"] for group in groups),
+            "gap_sum": gap_totals["gap_sum"],
+            "gap_count": gap_totals["gap_count"],
+            "skill": skill,
+            "last_updated": datetime.utcnow()
+        }
+        
+        # Materialize the same derived fields as the incremental update
+        metrics = progress_metrics_from_aggregate(aggregate)
+        aggregate["average_scores"] = {
+            ex_type: stats["accuracy_sum"] / stats["count"]
+            for ex_type, stats in aggregate["exercise_stats"].items()
+        }
+        aggregate["strengths"] = metrics.strengths
+        aggregate["areas_for_improvement"] = metrics.areas_for_improvement
+        
+        await db[COLLECTION_USER_METRICS].replace_one({"user_id": user_id}, aggregate, upsert=True)
+        return aggregate
+    
+    @staticmethod
+    async def get_progress_trends(user_id: str, days: int = 90, window: int = 7) -> ProgressTrends:
+        """
+        Get daily performance trends per exercise type.
+        
+        Sessions are grouped by exercise type and day, and moving averages are
+        computed with $setWindowFields, all inside MongoDB; only the daily
+        summary is transferred, so the cost does not grow with session count.
+        
+        Args:
+            user_id: ID of the user.
+            days: Number of most recent days to include.
+            window: Number of active days in the moving average.
+            
+        Returns:
+            Daily performance and moving averages per exercise type.
+        """
+        db = get_database()
+        since = datetime.utcnow() - timedelta(days=days)
+        day = {"$dateTrunc": {"date": "$created_at", "unit": "day"}}
+        
+        pipeline = [
+            {"$match": {"user_id": user_id, "created_at": {"$gte": since}}},
+            {"$group": {
+                "_id": {"exercise_type": "$exercise_type", "date": day},
+                "sessions": {"$sum": 1},
+                "average_accuracy": {"$avg": ACCURACY_PERCENT_EXPRESSION},
+                "time_spent": {"$sum": {"$ifNull": ["$duration", 0]}}
+            }},
+            {"$setWindowFields": {
+                "partitionBy": "$_id.exercise_type",
+                "sortBy": {"_id.date": 1},
+                "output": {
+                    "moving_average": {
+                        "$avg": "$average_accuracy",
+                        "window": {"documents": [-(window - 1), 0]}
+                    },
+                    "previous_date": {"$shift": {"output": "$_id.date", "by": -1}}
+                }
+            }},
+            {"$sort": {"_id.exercise_type": 1, "_id.date": 1}},
+            {"$group": {
+                "_id": "$_id.exercise_type",
+                "sessions": {"$sum": "$sessions"},
+                "active_days": {"$sum": 1},
+                "average_gap_days": {"$avg": {
+                    "$cond": [
+                        {"$eq": ["$previous_date", None]},
+                        None,
+                        {"$dateDiff": {"startDate": "$previous_date", "endDate": "$_id.date", "unit": "day"}}
+                    ]
+                }},
+                "daily": {"$push": {
+                    "date": "$_id.date",
+                    "sessions": "$sessions",
+                    "average_accuracy": "$average_accuracy",
+                    "moving_average": "$moving_average",
+                    "time_spent": "$time_spent"
+                }}
+            }}
+        ]
+        groups = await db[COLLECTION_TRAINING_SESSIONS].aggregate(pipeline).to_list(length=None)
+        
+        known_types = {ex_type.value for ex_type in ExerciseType}
+        trends = {}
+        for group in groups:
+            if group["_id"] not in known_types:
+                continue
+            daily = [DailyPerformance(**point) for point in group["daily"]]
+            trends[group["_id"]] = ExerciseTrend(
+                sessions=group["sessions"],
+                active_days=group["active_days"],
+                average_gap_days=group.get("average_gap_days"),
+                change=daily[-1].moving_average - daily[0].moving_average if len(daily) > 1 else 0.0,
+                daily=daily
+            )
+        
+        return ProgressTrends(user_id=user_id, days=days, window=window, trends=trends)
+    
+    @staticmethod
+    async def get_response_time_analytics(user_id: str, days: int = 365) -> ResponseTimeAnalytics:
+        """
+        Get response time statistics overall and per exercise type.
+        
+        Only the packed response times and timestamps are transferred; the
+        statistics are computed with NumPy over all sessions at once.
+        
+        Args:
+            user_id: ID of the user.
+            days: Number of most recent days to include.
+            
+        Returns:
+            Response time statistics (empty if no session has response times).
+        """
+        db = get_database()
+        since = datetime.utcnow() - timedelta(days=days)
+        sessions = await db[COLLECTION_TRAINING_SESSIONS].find(
+            {"user_id": user_id, "created_at": {"$gte": since}, "response_times": {"$type": "binData"}},
+            {"_id": 0, "exercise_type": 1, "created_at": 1, "response_times": 1}
+        ).sort("created_at", 1).to_list(length=None)
+        
+        buffers = [session["response_times"] for session in sessions]
+        timestamps = [session["created_at"] for session in sessions]
+        by_type: Dict[str, List[int]] = {}
+        for index, session in enumerate(sessions):
+            by_type.setdefault(session.get("exercise_type"), []).append(index)
+        
+        known_types = {ex_type.value for ex_type in ExerciseType}
+        return ResponseTimeAnalytics(
+            user_id=user_id,
+            days=days,
+            overall=ResponseTimeStatistics(**response_time_statistics(buffers, timestamps)),
+            by_exercise_type={
+                ex_type: ResponseTimeStatistics(**response_time_statistics(
+                    [buffers[i] for i in indexes], [timestamps[i] for i in indexes]
+                ))
+                for ex_type, indexes in by_type.items() if ex_type in known_types
+            }
+        )
+
+
+def _generation_rng(seed: Optional[int]):
+    """Return (seed, random generator) for an exercise, drawing a seed if none is given."""
+    if seed is None:
+        seed = random.getrandbits(63)  # Fits a BSON int64
+    return seed, random.Random(seed)
+
+
+def _threshold_feedback(accuracy: float, min_score: float, strong: str, fair: str, weak: str) -> str:
+    """Pick feedback by accuracy: at least min_score, at least 75% of it, or below."""
+    if accuracy >= min_score:
+        return strong
+    if accuracy >= min_score * 0.75:
+        return fair
+    return weak
+
+
+def _interpolate(value: int, next_value: int, progress: float) -> int:
+    """Generator parameter `progress` (0-1) of the way from `value` to `next_value`."""
+    return int(round(value + (next_value - value) * min(1.0, max(0.0, progress))))
+
+
+def _accuracy_percent(accuracy: Optional[float]) -> float:
+    """Normalize an accuracy value to a percentage (0-100)."""
+    accuracy = accuracy or 0
+    # Ensure accuracy is in percentage format (0-100)
+    if accuracy <= 1.0:
+        accuracy = accuracy * 100  # Convert from decimal to percentage
+    return accuracy
+
+
+def _exercise_label_expression(type_expression: str) -> Dict:
+    """Aggregation expression mapping an exercise type to its label (or null)."""
+    return {
+        "$switch": {
+            "branches": [
+                {"case": {"$eq": [type_expression, ex_type]}, "then": label}
+                for ex_type, label in EXERCISE_TYPE_LABELS.items()
+            ],
+            "default": None
+        }
+    }
+
+
+def _labels_for_average(condition: Dict) -> Dict:
+    """Aggregation expression listing labels of exercise types whose average matches `condition`."""
+    return {
+        "$filter": {
+            "input": {
+                "$map": {
+                    "input": {
+                        "$filter": {
+                            "input": {"$objectToArray": "$average_scores"},
+                            "as": "average",
+                            "cond": condition
+                        }
+                    },
+                    "as": "average",
+                    "in": _exercise_label_expression("$$average.k")
+                }
+            },
+            "as": "label",
+            "cond": {"$ne": ["$$label", None]}
+        }
+    }
+
+
+def _capped_gap_days_expression(previous, current) -> Dict:
+    """Aggregation expression for whole days between two sessions, capped at MAX_SESSION_GAP_DAYS."""
+    return {
+        "$min": [
+            {"$floor": {"$divide": [{"$subtract": [current, previous]}, 86400000]}},
+            MAX_SESSION_GAP_DAYS
+        ]
+    }
+
+
+def _progress_update_pipeline(entries: List[Dict], now: datetime) -> List[Dict]:
+    """
+    Build the update pipeline recording completed sessions in a user's aggregate.
+    
+    Args:
+        entries: Sessions to record, each with exercise_type (value string),
+            accuracy (percentage), duration (seconds), completed_at and
+            difficulty (None if the session should not update the skill rating).
+        now: Time the update is made.
+        
+    Returns:
+        Update pipeline for find_one_and_update.
+    """
+    entries = sorted(entries, key=lambda entry: entry["completed_at"])
+    completed_times = [entry["completed_at"] for entry in entries]
+    first_time, last_time = completed_times[0], completed_times[-1]
+    
+    counters = {
+        "total_sessions": {"$add": [{"$ifNull": ["$total_sessions", 0]}, len(entries)]},
+        "total_time_spent": {"$add": [
+            {"$ifNull": ["$total_time_spent", 0]}, sum(entry["duration"] for entry in entries)
+        ]},
+    }
+    by_type: Dict[str, List[float]] = {}
+    for entry in entries:
+        by_type.setdefault(entry["exercise_type"], []).append(entry["accuracy"])
+    for exercise_type, accuracies in by_type.items():
+        stats = f"exercise_stats.{exercise_type}"
+        trend = f"performance_trends.{exercise_type}"
+        # Aggregates from before exercise_stats averaged the stored trend, so
+        # their stats start from it rather than from zero
+        previous_trend = {"$ifNull": [f"${trend}", []]}
+        counters[f"{stats}.count"] = {"$add": [
+            {"$ifNull": [f"${stats}.count", {"$size": previous_trend}]}, len(accuracies)
+        ]}
+        counters[f"{stats}.accuracy_sum"] = {"$add": [
+            {"$ifNull": [f"${stats}.accuracy_sum", {"$sum": previous_trend}]}, sum(accuracies)
+        ]}
+        counters[trend] = {"$slice": [
+            {"$concatArrays": [{"$ifNull": [f"${trend}", []]}, accuracies[-PERFORMANCE_TREND_LENGTH:]]},
+            -PERFORMANCE_TREND_LENGTH
+        ]}
+        
+        # Skill rating for adaptive difficulty (sessions rated in chronological order)
+        outcomes = [
+            (difficulty_rating(entry["difficulty"]), session_outcome(entry["accuracy"]))
+            for entry in entries
+            if entry["exercise_type"] == exercise_type and entry.get("difficulty") in DIFFICULTY_VALUES
+        ]
+        if outcomes:
+            counters.update(skill_update_expression(exercise_type, outcomes))
+    
+    # Gaps between the new sessions are known here; only the gap to the
+    # previously recorded last session depends on the stored aggregate
+    new_gaps = [
+        min((current - previous).days, MAX_SESSION_GAP_DAYS)
+        for previous, current in zip(completed_times, completed_times[1:])
+    ]
+    
+    return [
+        # Counters, bounded histories and first/last session times
+        {"$set": {
+            **counters,
+            "session_timestamps": {"$slice": [
+                {"$concatArrays": [
+                    {"$ifNull": ["$session_timestamps", []]}, completed_times[-SESSION_TIMESTAMP_HISTORY:]
+                ]},
+                -SESSION_TIMESTAMP_HISTORY
+            ]},
+            "gap_sum": {"$add": [
+                {"$ifNull": ["$gap_sum", 0]},
+                sum(new_gaps),
+                {"$cond": [
+                    {"$ifNull": ["$last_session_at", False]},
+                    # Sessions played offline may predate the last recorded one
+                    {"$max": [_capped_gap_days_expression("$last_session_at", first_time), 0]},
+                    0
+                ]}
+            ]},
+            "gap_count": {"$add": [
+                {"$ifNull": ["$gap_count", 0]},
+                len(new_gaps),
+                {"$cond": [{"$ifNull": ["$last_session_at", False]}, 1, 0]}
+            ]},
+            "first_session_at": {"$min": [{"$ifNull": ["$first_session_at", first_time]}, first_time]},
+            "last_session_at": {"$max": [{"$ifNull": ["$last_session_at", last_time]}, last_time]},
+            "last_updated": now
+        }},
+        # Materialized full-history averages per exercise type (stored averages
+        # of types without exercise_stats, from older aggregates, are kept)
+        {"$set": {
+            "average_scores": {"$mergeObjects": [
+                {"$ifNull": ["$average_scores", {}]},
+                {"$arrayToObject": {
+                    "$map": {
+                        "input": {"$objectToArray": "$exercise_stats"},
+                        "as": "stat",
+                        "in": {
+                            "k": "$$stat.k",
+                            "v": {"$divide": ["$$stat.v.accuracy_sum", {"$max": ["$$stat.v.count", 1]}]}
+                        }
+                    }
+                }}
+            ]}
+        }},
+        # Materialized strengths and areas for improvement
+        {"$set": {
+            "strengths": _labels_for_average({"$gte": ["$$average.v", 80]}),
+            "areas_for_improvement": _labels_for_average({"$lte": ["$$average.v", 60]})
+        }}
+    ]
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    """Parse a stored session timestamp (datetime, or ISO string in older documents)."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _average_gap_from_timestamps(session_timestamps: List) -> Optional[float]:
+    """Average capped gap in days between recent sessions (aggregates without gap totals)."""
+    timestamps = sorted(ts for ts in (_as_datetime(value) for value in session_timestamps) if ts)
+    if len(timestamps) < 2:
+        return None
+    time_diffs = [
+        min((current - previous).days, MAX_SESSION_GAP_DAYS)
+        for previous, current in zip(timestamps, timestamps[1:])
+    ]
+    return sum(time_diffs) / len(time_diffs)
+
+
+def consistency_score(average_gap_days: Optional[float], session_count: int,
+                      last_session_at: Optional[datetime], now: Optional[datetime] = None) -> float:
+    """
+    Score training consistency.
+    
+    Args:
+        average_gap_days: Average capped gap in days between consecutive sessions.
+        session_count: Number of sessions.
+        last_session_at: Time of the most recent session.
+        now: Reference time (defaults to the current UTC time).
+        
+    Returns:
+        Consistency score between 0 and 1.
+    """
+    now = now or datetime.utcnow()
+    if session_count <= 0 or last_session_at is None:
+        return 0.0
+    
+    days_since_last = (now - last_session_at).days
+    if session_count >= 3 and average_gap_days is not None:
+        # Score formula: decreases as average gap increases (ideal is daily = 1)
+        # 1 day = 1.0, 2 days = 0.9, 3 days = 0.8, etc.
+        # Minimum is 0.0 if avg_diff >= 10 days
+        score = max(0.0, 1.0 - (average_gap_days / 10.0))
+        
+        # Bonus for recent activity (if most recent session is within 3 days)
+        if days_since_last <= 3:
+            score = min(1.0, score + 0.1)
+    elif session_count >= 3:
+        score = 0.1  # Minimum if we can't calculate time diffs
+    else:
+        # If there are sessions but not enough for a trend
+        # Give a score based on recency of the last session
+        if days_since_last <= 1:
+            score = 0.3  # Session within last day
+        elif days_since_last <= 3:
+            score = 0.2  # Session within last 3 days
+        else:
+            score = 0.1  # Older session
+    
+    # Ensure consistency score is between 0 and 1
+    return max(0.0, min(1.0, score))
+
+
+def progress_metrics_from_aggregate(user_metrics: Dict) -> ProgressMetrics:
+    """
+    Build ProgressMetrics from a user_metrics aggregate document.
+    
+    Args:
+        user_metrics: The stored aggregate.
+        
+    Returns:
+        The user's progress metrics.
+    """
+    exercise_stats = user_metrics.get("exercise_stats")
+    if exercise_stats:
+        average_scores = {
+            ex_type: stats["accuracy_sum"] / stats["count"]
+            for ex_type, stats in exercise_stats.items()
+            if stats.get("count")
+        }
+    else:
+        # Aggregates written before exercise_stats existed only kept recent averages
+        average_scores = user_metrics.get("average_scores", {})
+    
+    # Only report exercise types the API knows about
+    known_types = {ex_type.value for ex_type in ExerciseType}
+    average_scores = {ex_type: score for ex_type, score in average_scores.items() if ex_type in known_types}
+    
+    # Determine strengths and areas for improvement
+    strengths = []
+    areas_for_improvement = []
+    for ex_type, avg_score in average_scores.items():
+        label = EXERCISE_TYPE_LABELS.get(ex_type)
+        if label is None:
+            continue
+        if avg_score >= 80:
+            strengths.append(label)
+        elif avg_score <= 60:
+            areas_for_improvement.append(label)
+    
+    # Consistency over the full history from the gap totals; older aggregates
+    # only have the recent session timestamps
+    total_sessions = user_metrics.get("total_sessions", 0)
+    session_timestamps = [ts for ts in map(_as_datetime, user_metrics.get("session_timestamps", [])) if ts]
+    last_session_at = user_metrics.get("last_session_at") or (max(session_timestamps) if session_timestamps else None)
+    if "gap_count" in user_metrics:
+        gap_count = user_metrics["gap_count"]
+        average_gap_days = user_metrics.get("gap_sum", 0) / gap_count if gap_count else None
+    else:
+        average_gap_days = _average_gap_from_timestamps(session_timestamps)
+    
+    skill = user_metrics.get("skill", {})
+    skill_ratings = {ex_type: state["rating"] for ex_type, state in skill.items() if ex_type in known_types}
+    recommended_difficulty = {
+        ex_type: recommend_level(rating)[0].value for ex_type, rating in skill_ratings.items()
+    }
+    
+    return ProgressMetrics(
+        user_id=user_metrics["user_id"],
+        last_updated=user_metrics.get("last_updated") or datetime.utcnow(),
+        total_sessions=total_sessions,
+        total_time_spent=int(user_metrics.get("total_time_spent", 0)),
+        average_scores=average_scores,
+        performance_trends=user_metrics.get("performance_trends", {}),
+        strengths=strengths,
+        areas_for_improvement=areas_for_improvement,
+        consistency_score=consistency_score(average_gap_days, total_sessions, last_session_at),
+        skill_ratings=skill_ratings,
+        recommended_difficulty=recommended_difficulty
+    )
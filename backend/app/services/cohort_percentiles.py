@@ -0,0 +1,402 @@
+"""
+Cohort percentiles of cognitive domain scores.
+
+Each (source, cognitive domain, age band) cohort keeps a KLL quantile
+sketch (see app/utils/quantile_sketch.py). The sources are language
+analyses, which have a 0-1 score per domain, and training sessions, whose
+accuracy counts towards the domain its exercise type trains. The two are
+kept apart because their scores are not on the same scale. Every cohort
+also feeds an "all" band, which is used when the user's age is unknown or
+the age band has fewer than COHORT_MIN_SIZE scores.
+
+Scores are added to in-memory sketches as they are written. Every
+COHORT_SKETCH_FLUSH_SECONDS a background task merges each process's new
+scores into the cohort_sketches collection, with optimistic concurrency so
+that concurrent workers do not overwrite one another. The task then reloads
+the sketches and rebuilds a percentile table per cohort over a fixed grid
+of scores, so looking up a percentile is a single list index. It never scans
+the analyses or training sessions. Percentiles lag new scores by at most one
+flush interval. scripts/rebuild_cohort_sketches.py rebuilds the sketches
+from the stored history.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from dotenv import load_dotenv
+from pymongo.errors import DuplicateKeyError
+
+from app.db.mongodb import get_database, COLLECTION_COHORT_SKETCHES
+from app.models.analysis import CognitiveDomain, DomainScore
+from app.models.training import ExerciseType
+from app.utils.quantile_sketch import KLLSketch
+from app.utils.security import get_user_by_id
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+COHORT_PERCENTILES_ENABLED = os.getenv("COHORT_PERCENTILES_ENABLED", "true").lower() == "true"
+COHORT_SKETCH_K = int(os.getenv("COHORT_SKETCH_K", "200"))
+COHORT_SKETCH_FLUSH_SECONDS = float(os.getenv("COHORT_SKETCH_FLUSH_SECONDS", "60"))
+COHORT_MIN_SIZE = int(os.getenv("COHORT_MIN_SIZE", "30"))
+
+# Score sources
+SOURCE_ANALYSIS = "analysis"
+SOURCE_TRAINING = "training"
+
+# Age bands: (label, lowest age); the last band is open-ended
+AGE_BANDS: Tuple[Tuple[str, int], ...] = (
+    ("under_50", 0),
+    ("50_59", 50),
+    ("60_69", 60),
+    ("70_79", 70),
+    ("80_plus", 80),
+)
+ALL_AGES = "all"
+
+# Cognitive domain trained by each exercise type
+EXERCISE_DOMAINS: Mapping[ExerciseType, CognitiveDomain] = {
+    ExerciseType.WORD_RECALL: CognitiveDomain.MEMORY,
+    ExerciseType.MEMORY_MATCH: CognitiveDomain.MEMORY,
+    ExerciseType.VERBAL_MEMORY: CognitiveDomain.MEMORY,
+    ExerciseType.LANGUAGE_FLUENCY: CognitiveDomain.LANGUAGE,
+    ExerciseType.CATEGORY_NAMING: CognitiveDomain.LANGUAGE,
+    ExerciseType.READING_COMPREHENSION: CognitiveDomain.LANGUAGE,
+    ExerciseType.SEMANTIC_ASSOCIATION: CognitiveDomain.LANGUAGE,
+    ExerciseType.SEQUENCE_ORDERING: CognitiveDomain.EXECUTIVE_FUNCTION,
+    ExerciseType.ATTENTION_TASK: CognitiveDomain.ATTENTION,
+}
+
+# Scores are 0-1; percentile tables have one entry per 0.001
+TABLE_STEPS = 1000
+
+# Cohort key: (source, domain, age band)
+CohortKey = Tuple[str, str, str]
+
+
+def age_band(age: Optional[int]) -> Optional[str]:
+    """Age band label of an age, or None if the age is unknown."""
+    if age is None or age < 0:
+        return None
+    label = None
+    for band_label, lowest in AGE_BANDS:
+        if age >= lowest:
+            label = band_label
+    return label
+
+
+def _cohort_keys(source: str, domain: str, age: Optional[int]) -> List[CohortKey]:
+    band = age_band(age)
+    keys = [(source, domain, ALL_AGES)]
+    if band is not None:
+        keys.append((source, domain, band))
+    return keys
+
+
+def _key_to_str(key: CohortKey) -> str:
+    return ":".join(key)
+
+
+def _clamp(score: float) -> float:
+    return min(1.0, max(0.0, float(score)))
+
+
+def training_domain_score(session: Dict) -> Optional[Tuple[str, float]]:
+    """
+    Domain and 0-1 score of a training session, or None if its type has no domain.
+
+    Args:
+        session: training_sessions document
+
+    Returns:
+        (domain, accuracy as a fraction)
+    """
+    try:
+        domain = EXERCISE_DOMAINS[ExerciseType(session["exercise_type"])]
+    except (KeyError, ValueError):
+        return None
+    accuracy = session.get("accuracy") or 0
+    # Accuracy is stored either as a fraction or as a percentage
+    return domain.value, _clamp(accuracy / 100 if accuracy > 1 else accuracy)
+
+
+def _sketch_document(key: CohortKey, sketch: KLLSketch, version: int) -> Dict:
+    """cohort_sketches document of a cohort (without its _id)."""
+    source, domain, band = key
+    return {
+        "source": source,
+        "domain": domain,
+        "band": band,
+        "count": len(sketch),
+        "sketch": sketch.to_dict(),
+        "version": version,
+        "updated_at": datetime.utcnow()
+    }
+
+
+class CohortPercentiles:
+    """In-memory cohort sketches, periodically merged with the stored ones."""
+
+    def __init__(self, k: int, flush_interval: float, min_size: int):
+        self.k = k
+        self.flush_interval = flush_interval
+        self.min_size = min_size
+        # Sketches as last loaded from the database
+        self._stored: Dict[CohortKey, KLLSketch] = {}
+        # Scores added by this process since the last flush
+        self._pending: Dict[CohortKey, KLLSketch] = {}
+        # Percentile tables and cohort sizes served to lookups
+        self._tables: Dict[CohortKey, Tuple[int, List[Optional[float]]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, source: str, domain: str, age: Optional[int], score: float) -> None:
+        """Add a 0-1 score to its age band and to the all-ages cohort."""
+        for key in _cohort_keys(source, domain, age):
+            sketch = self._pending.get(key)
+            if sketch is None:
+                sketch = self._pending[key] = KLLSketch(self.k)
+            sketch.update(_clamp(score))
+
+    def percentile(self, source: str, domain: str, age: Optional[int], score: float) -> Optional[float]:
+        """
+        Percentile rank (0-100) of a 0-1 score within its cohort.
+
+        Args:
+            source: SOURCE_ANALYSIS or SOURCE_TRAINING
+            domain: Cognitive domain
+            age: User's age (None if unknown)
+            score: Score between 0 and 1
+
+        Returns:
+            The percentile in the user's age band, or in all ages when the band
+            is too small; None when no cohort is large enough
+        """
+        index = int(round(_clamp(score) * TABLE_STEPS))
+        for key in reversed(_cohort_keys(source, domain, age)):
+            size, table = self._tables.get(key, (0, None))
+            if size >= self.min_size:
+                return table[index]
+        return None
+
+    def record_analysis(self, age: Optional[int], domain_scores: Mapping) -> List[DomainScore]:
+        """
+        Rank an analysis's domain scores, then add them to their cohorts.
+
+        Args:
+            age: User's age (None if unknown)
+            domain_scores: 0-1 score per cognitive domain
+
+        Returns:
+            The domain scores with their percentiles
+        """
+        ranked = []
+        for domain, score in domain_scores.items():
+            domain = CognitiveDomain(domain)
+            ranked.append(DomainScore(
+                domain=domain,
+                score=_clamp(score),
+                percentile=self.percentile(SOURCE_ANALYSIS, domain.value, age, score)
+            ))
+            self.add(SOURCE_ANALYSIS, domain.value, age, score)
+        return ranked
+
+    def record_sessions(self, age: Optional[int], sessions: Iterable[Dict]) -> List[Optional[float]]:
+        """
+        Rank training sessions' accuracy within their domain, then add them to their cohorts.
+
+        Args:
+            age: User's age (None if unknown)
+            sessions: training_sessions documents
+
+        Returns:
+            The percentile of each session (None without a domain or cohort)
+        """
+        percentiles = []
+        for session in sessions:
+            domain_score = training_domain_score(session)
+            if domain_score is None:
+                percentiles.append(None)
+                continue
+            domain, score = domain_score
+            percentiles.append(self.percentile(SOURCE_TRAINING, domain, age, score))
+            self.add(SOURCE_TRAINING, domain, age, score)
+        return percentiles
+
+    def _rebuild_tables(self) -> None:
+        """Rebuild the percentile tables from the stored and pending sketches."""
+        tables = {}
+        for key in set(self._stored) | set(self._pending):
+            sketch = KLLSketch(self.k)
+            for part in (self._stored.get(key), self._pending.get(key)):
+                if part is not None:
+                    sketch.merge(part)
+            tables[key] = (len(sketch), sketch.cdf_table(0.0, 1.0, TABLE_STEPS))
+        self._tables = tables
+
+    async def _load(self) -> None:
+        """Load every stored sketch."""
+        db = get_database()
+        stored = {}
+        async for document in db[COLLECTION_COHORT_SKETCHES].find({}):
+            key = (document["source"], document["domain"], document["band"])
+            stored[key] = KLLSketch.from_dict(document["sketch"])
+        self._stored = stored
+
+    async def _merge_into_stored(self, key: CohortKey, pending: KLLSketch, attempts: int = 5) -> bool:
+        """Merge new scores into a stored sketch; retries when another process wrote first."""
+        db = get_database()
+        collection = db[COLLECTION_COHORT_SKETCHES]
+        for _ in range(attempts):
+            document = await collection.find_one({"_id": _key_to_str(key)})
+            sketch = KLLSketch.from_dict(document["sketch"]) if document else KLLSketch(self.k)
+            sketch.merge(pending)
+            replacement = _sketch_document(key, sketch, (document["version"] + 1) if document else 1)
+            if document is None:
+                try:
+                    await collection.insert_one({"_id": _key_to_str(key), **replacement})
+                    return True
+                except DuplicateKeyError:
+                    continue
+            result = await collection.replace_one(
+                {"_id": _key_to_str(key), "version": document["version"]}, replacement
+            )
+            if result.matched_count:
+                return True
+        return False
+
+    async def replace_stored(self) -> int:
+        """
+        Overwrite the stored sketches with the scores added to this instance.
+
+        Used by scripts/rebuild_cohort_sketches.py. Stored cohorts without new
+        scores are removed. Bumping the version makes processes that are
+        merging at the same time retry on top of the rebuilt sketch.
+
+        Returns:
+            Number of cohorts stored
+        """
+        db = get_database()
+        collection = db[COLLECTION_COHORT_SKETCHES]
+        versions = {
+            document["_id"]: document["version"]
+            async for document in collection.find({}, {"version": 1})
+        }
+        for key, sketch in self._pending.items():
+            key_str = _key_to_str(key)
+            await collection.replace_one(
+                {"_id": key_str},
+                _sketch_document(key, sketch, versions.pop(key_str, 0) + 1),
+                upsert=True
+            )
+        if versions:
+            await collection.delete_many({"_id": {"$in": list(versions)}})
+        stored = len(self._pending)
+        self._pending = {}
+        return stored
+
+    async def flush(self) -> None:
+        """Merge this process's new scores into the database, then reload every cohort."""
+        pending, self._pending = self._pending, {}
+        for key, sketch in pending.items():
+            try:
+                merged = await self._merge_into_stored(key, sketch)
+            except Exception as e:
+                logger.error(f"Failed to store cohort sketch {_key_to_str(key)}: {e}")
+                merged = False
+            if not merged:
+                # Keep the scores for the next flush
+                self._pending.setdefault(key, KLLSketch(self.k)).merge(sketch)
+        await self._load()
+        self._rebuild_tables()
+
+    async def start(self) -> None:
+        """Load the stored sketches and start the periodic flush task."""
+        try:
+            await self._load()
+        except Exception as e:
+            logger.warning(f"Could not load cohort sketches: {e}")
+        self._rebuild_tables()
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info(f"Cohort percentiles ready ({len(self._stored)} cohorts)")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush cohort sketches: {e}")
+
+    async def close(self) -> None:
+        """Stop the flush task and store the remaining scores."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Could not store cohort sketches: {e}")
+
+
+cohort_percentiles: Optional[CohortPercentiles] = None
+if COHORT_PERCENTILES_ENABLED:
+    cohort_percentiles = CohortPercentiles(COHORT_SKETCH_K, COHORT_SKETCH_FLUSH_SECONDS, COHORT_MIN_SIZE)
+
+
+async def _user_age(user_id: str) -> Optional[int]:
+    """Age from the user's profile (served from the user cache), or None."""
+    user = await get_user_by_id(user_id)
+    return user.age if user is not None else None
+
+
+async def rank_analysis(user_id: str, domain_scores: Mapping) -> List[DomainScore]:
+    """
+    Domain scores of a new analysis with their cohort percentiles.
+
+    Args:
+        user_id: ID of the analyzed user
+        domain_scores: 0-1 score per cognitive domain
+
+    Returns:
+        The domain scores, with percentiles when cohort percentiles are enabled
+    """
+    if cohort_percentiles is not None:
+        return cohort_percentiles.record_analysis(await _user_age(user_id), domain_scores)
+    return [DomainScore(domain=CognitiveDomain(domain), score=_clamp(score)) for domain, score in domain_scores.items()]
+
+
+async def rank_sessions(user_id: str, sessions: List[Dict]) -> List[Optional[float]]:
+    """
+    Cohort percentiles of new training sessions' accuracy.
+
+    Args:
+        user_id: ID of the user who played the sessions
+        sessions: training_sessions documents
+
+    Returns:
+        The percentile of each session (all None when disabled)
+    """
+    if cohort_percentiles is not None:
+        return cohort_percentiles.record_sessions(await _user_age(user_id), sessions)
+    return [None] * len(sessions)
+
+
+async def start_cohort_percentiles() -> None:
+    """Load the cohort sketches and start flushing them (called on startup)."""
+    if cohort_percentiles is not None:
+        await cohort_percentiles.start()
+
+
+async def close_cohort_percentiles() -> None:
+    """Store the remaining cohort scores (called on shutdown)."""
+    if cohort_percentiles is not None:
+        await cohort_percentiles.close()
@@ -0,0 +1,375 @@
+"""
+Static content and parameters for server-generated exercises.
+
+Everything here is built once at import time into immutable structures
+(tuples and read-only mappings) shared by every request, so generators only
+sample from it. Answer keys for multiple-choice exercises stay here and are
+looked up by item ID when a submission is evaluated; they are never part of
+the exercise content sent to the client.
+"""
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Tuple
+
+from app.models.training import DifficultyLevel
+
+
+class WordRecallParameters(NamedTuple):
+    """Word Recall parameters of one difficulty level."""
+    word_count: int
+    display_time: int  # Seconds
+    recall_time: int  # Seconds
+    min_score: float
+    words: Tuple[str, ...]
+
+
+class LanguageFluencyParameters(NamedTuple):
+    """Language Fluency parameters of one difficulty level."""
+    category_count: int
+    time_limit: int  # Seconds
+    next_time_limit: int  # Time limit of the next level, for adaptive progress
+    min_words: int
+    letters: Tuple[str, ...]
+    categories: Tuple[str, ...]
+
+
+class MemoryMatchParameters(NamedTuple):
+    """Memory Match parameters of one difficulty level (matches the frontend)."""
+    rows: int
+    cols: int
+    pairs: int
+    time_bonus: int  # Seconds
+    ideal_moves: int
+
+
+class ReadingQuestion(NamedTuple):
+    """Multiple-choice question about a passage."""
+    id: str
+    question: str
+    options: Tuple[str, ...]
+    answer: int  # Index of the correct option
+
+
+class ReadingPassage(NamedTuple):
+    """Reading Comprehension passage with its questions."""
+    id: str
+    title: str
+    text: str
+    questions: Tuple[ReadingQuestion, ...]
+
+
+class ReadingComprehensionParameters(NamedTuple):
+    """Reading Comprehension parameters of one difficulty level."""
+    reading_time: int  # Seconds the passage is shown
+    answer_time: int  # Seconds to answer the questions
+    min_score: float
+    passages: Tuple[ReadingPassage, ...]
+
+
+class VerbalMemoryParameters(NamedTuple):
+    """Verbal Memory (continuous recognition) parameters of one difficulty level."""
+    sequence_length: int
+    distinct_words: int
+    display_time_ms: int  # Time each word is shown
+    min_score: float
+
+
+class SemanticItem(NamedTuple):
+    """Semantic Association item: the option most related to the cue is correct."""
+    id: str
+    cue: str
+    answer: str
+    distractors: Tuple[str, ...]
+
+
+class SemanticAssociationParameters(NamedTuple):
+    """Semantic Association parameters of one difficulty level."""
+    item_count: int
+    time_limit: int  # Seconds
+    min_score: float
+    items: Tuple[SemanticItem, ...]
+
+
+class AttentionTaskParameters(NamedTuple):
+    """Attention Task (go/no-go) parameters of one difficulty level."""
+    stimulus_count: int
+    target_rate: float  # Share of stimuli that are the target
+    stimulus_time_ms: int
+    interval_ms: int  # Time between stimuli
+    distractors: Tuple[str, ...]
+    min_score: float
+
+
+# Starting letters for Language Fluency, from easier to harder
+EASY_LETTERS = tuple("ASBEMPTR")
+MEDIUM_LETTERS = tuple("FGHLNOWJKV")
+HARD_LETTERS = tuple("ICDQUXYZ")
+
+WORD_RECALL: Mapping[DifficultyLevel, WordRecallParameters] = MappingProxyType({
+    DifficultyLevel.BEGINNER: WordRecallParameters(10, 30, 60, 0.6, (
+        "house", "tree", "dog", "car", "book", "chair", "water",
+        "food", "sun", "ball", "cup", "door", "bird", "shoe", "fish",
+        "table", "hat", "cat", "ring", "baby"
+    )),
+    DifficultyLevel.INTERMEDIATE: WordRecallParameters(15, 25, 50, 0.65, (
+        "freedom", "science", "journey", "knowledge", "universe",
+        "beautiful", "dangerous", "important", "happiness", "education",
+        "adventure", "mountain", "terrible", "wonderful", "discovery",
+        "excitement", "community", "challenging", "brilliant", "peaceful"
+    )),
+    DifficultyLevel.ADVANCED: WordRecallParameters(20, 20, 45, 0.7, (
+        "algorithm", "philosophy", "correlation", "phenomenon", "microscopic",
+        "innovation", "sustainability", "renaissance", "psychology", "civilization",
+        "perspective", "magnificent", "substantial", "controversy", "extraordinary",
+        "theoretical", "spectacular", "celebration", "imagination", "fundamental",
+        "demonstration", "revolutionary", "appreciation", "consciousness", "intellectual"
+    )),
+    DifficultyLevel.EXPERT: WordRecallParameters(25, 15, 40, 0.75, (
+        "verisimilitude", "juxtaposition", "serendipity", "magnanimous", "idiosyncrasy",
+        "sycophantic", "ephemeral", "perspicacious", "obfuscation", "sesquipedalian",
+        "pusillanimous", "mellifluous", "parsimonious", "quintessential", "fastidious",
+        "antediluvian", "cacophonous", "prevarication", "grandiloquent", "perfunctory",
+        "supercilious", "insouciance", "ubiquitous", "deleterious", "vituperative",
+        "obsequious", "loquacious", "irascible", "dilettante", "surreptitious"
+    )),
+})
+
+LANGUAGE_FLUENCY: Mapping[DifficultyLevel, LanguageFluencyParameters] = MappingProxyType({
+    DifficultyLevel.BEGINNER: LanguageFluencyParameters(
+        1, 60, 50, 3, EASY_LETTERS,
+        ("animals", "foods", "colors", "clothing", "cities")
+    ),
+    DifficultyLevel.INTERMEDIATE: LanguageFluencyParameters(
+        2, 50, 45, 4, EASY_LETTERS + MEDIUM_LETTERS,
+        ("professions", "sports", "countries", "musical instruments", "vehicles", "body parts")
+    ),
+    DifficultyLevel.ADVANCED: LanguageFluencyParameters(
+        3, 45, 40, 5, MEDIUM_LETTERS + HARD_LETTERS,
+        ("scientific terms", "historical figures", "literary works", "medical conditions", "geographical features")
+    ),
+    DifficultyLevel.EXPERT: LanguageFluencyParameters(
+        4, 40, 40, 6, HARD_LETTERS,
+        ("philosophical concepts", "rare plants", "chemical compounds", "neurological terms", "architectural elements")
+    ),
+})
+
+MEMORY_MATCH: Mapping[DifficultyLevel, MemoryMatchParameters] = MappingProxyType({
+    DifficultyLevel.BEGINNER: MemoryMatchParameters(2, 2, 2, 15, 4),
+    DifficultyLevel.INTERMEDIATE: MemoryMatchParameters(4, 4, 8, 60, 16),
+    DifficultyLevel.ADVANCED: MemoryMatchParameters(6, 6, 18, 120, 36),
+    DifficultyLevel.EXPERT: MemoryMatchParameters(8, 8, 32, 240, 64),
+})
+
+READING_COMPREHENSION: Mapping[DifficultyLevel, ReadingComprehensionParameters] = MappingProxyType({
+    DifficultyLevel.BEGINNER: ReadingComprehensionParameters(60, 60, 0.6, (
+        ReadingPassage(
+            "rc-garden", "The Garden",
+            "Maria planted tomatoes and beans in her garden in early spring. She watered them every "
+            "morning before breakfast. In July the tomatoes turned red, and she shared a basket of "
+            "them with her neighbor Tom, who gave her fresh eggs in return.",
+            (
+                ReadingQuestion("q1", "What did Maria plant?", ("Tomatoes and beans", "Carrots and peas", "Apples and pears"), 0),
+                ReadingQuestion("q2", "When did Maria water the garden?", ("In the evening", "Every morning", "Once a week"), 1),
+                ReadingQuestion("q3", "What did Tom give Maria?", ("Bread", "Milk", "Fresh eggs"), 2),
+            )
+        ),
+        ReadingPassage(
+            "rc-bus", "The Morning Bus",
+            "Every weekday, Sam takes the number 12 bus to the library where he works. The bus leaves "
+            "at eight o'clock. One rainy Monday the bus was late, so Sam shared an umbrella with an "
+            "old friend he met at the stop.",
+            (
+                ReadingQuestion("q1", "Where does Sam work?", ("At a school", "At the library", "At a bakery"), 1),
+                ReadingQuestion("q2", "What time does the bus leave?", ("Seven o'clock", "Eight o'clock", "Nine o'clock"), 1),
+                ReadingQuestion("q3", "What was the weather on Monday?", ("Rainy", "Sunny", "Snowy"), 0),
+            )
+        ),
+    )),
+    DifficultyLevel.INTERMEDIATE: ReadingComprehensionParameters(75, 75, 0.65, (
+        ReadingPassage(
+            "rc-lighthouse", "The Lighthouse Keeper",
+            "For thirty years, Eleanor kept the lighthouse on Gull Island. Each evening she climbed "
+            "ninety-two steps to light the lamp, and each morning she wrote the weather in a leather "
+            "logbook. When the lighthouse was automated in 1987, she donated her logbooks to the town "
+            "museum, where visitors can still read them.",
+            (
+                ReadingQuestion("q1", "How long did Eleanor keep the lighthouse?", ("Twenty years", "Thirty years", "Forty years"), 1),
+                ReadingQuestion("q2", "What did she record each morning?", ("The ships that passed", "The weather", "The tides"), 1),
+                ReadingQuestion("q3", "What happened to her logbooks?", ("They were lost at sea", "She kept them at home", "They went to the town museum"), 2),
+                ReadingQuestion("q4", "Why was the keeper no longer needed after 1987?", ("The lighthouse was automated", "The island was abandoned", "The lamp was removed"), 0),
+            )
+        ),
+        ReadingPassage(
+            "rc-market", "The Saturday Market",
+            "The town's Saturday market began with only four stalls selling vegetables. Over ten years "
+            "it grew to more than sixty stalls, including bakers, potters and a man who repairs clocks. "
+            "Because the square became crowded, the council moved the market to the riverside park, "
+            "where there is room for music in the afternoon.",
+            (
+                ReadingQuestion("q1", "How many stalls did the market start with?", ("Four", "Ten", "Sixty"), 0),
+                ReadingQuestion("q2", "Which of these is mentioned as a stall?", ("A shoemaker", "A man who repairs clocks", "A florist"), 1),
+                ReadingQuestion("q3", "Why was the market moved?", ("The rent was too high", "The square became crowded", "The river flooded"), 1),
+                ReadingQuestion("q4", "What is there room for at the new location?", ("Parking", "Music in the afternoon", "A playground"), 1),
+            )
+        ),
+    )),
+    DifficultyLevel.ADVANCED: ReadingComprehensionParameters(90, 90, 0.7, (
+        ReadingPassage(
+            "rc-bees", "Bees and Cities",
+            "Although honeybees are often associated with the countryside, many urban beekeepers report "
+            "healthier colonies than their rural counterparts. Researchers suggest that city gardens, "
+            "parks and balconies offer a wider variety of flowers across the season, while farmland is "
+            "frequently planted with a single crop that blooms only briefly. However, they caution that "
+            "adding too many hives to a city can leave wild bees with too little food.",
+            (
+                ReadingQuestion("q1", "What do many urban beekeepers report?", ("Smaller honey yields", "Healthier colonies", "More aggressive bees"), 1),
+                ReadingQuestion("q2", "Why may cities suit bees, according to researchers?", ("Warmer temperatures", "Fewer predators", "A wider variety of flowers across the season"), 2),
+                ReadingQuestion("q3", "What is the problem with farmland described in the passage?", ("Single crops bloom only briefly", "Pesticides are banned", "Fields are too small"), 0),
+                ReadingQuestion("q4", "What risk do researchers mention?", ("Honey becoming too expensive", "Wild bees having too little food", "Hives being stolen"), 1),
+            )
+        ),
+        ReadingPassage(
+            "rc-canal", "The Old Canal",
+            "Built in 1820 to carry coal to the mills, the canal fell out of use once the railway arrived "
+            "forty years later. For a century it silted up and was nearly filled in to make way for a road. "
+            "A group of volunteers objected, and after fifteen years of weekend work they reopened it in "
+            "1994, this time for narrowboats, anglers and walkers rather than cargo.",
+            (
+                ReadingQuestion("q1", "What was the canal originally built to carry?", ("Passengers", "Grain", "Coal"), 2),
+                ReadingQuestion("q2", "What caused the canal to fall out of use?", ("A drought", "The arrival of the railway", "A new road"), 1),
+                ReadingQuestion("q3", "Approximately when did the railway arrive?", ("1840", "1860", "1920"), 1),
+                ReadingQuestion("q4", "How is the canal used today?", ("For cargo", "For leisure such as boating and walking", "As a reservoir"), 1),
+            )
+        ),
+    )),
+    DifficultyLevel.EXPERT: ReadingComprehensionParameters(100, 100, 0.75, (
+        ReadingPassage(
+            "rc-memory", "Sleep and Memory",
+            "Memories are not fixed at the moment they are formed. During deep sleep, the hippocampus "
+            "appears to replay the day's experiences, gradually transferring them to the cortex for "
+            "long-term storage, a process known as consolidation. Studies in which participants learned "
+            "word pairs before a nap found better recall than in participants who stayed awake, yet the "
+            "benefit was smaller for material that had been rehearsed many times, suggesting that sleep "
+            "matters most for memories that are still fragile.",
+            (
+                ReadingQuestion("q1", "According to the passage, what happens during deep sleep?", ("New memories are erased", "The day's experiences appear to be replayed", "The cortex stops working"), 1),
+                ReadingQuestion("q2", "What is consolidation?", ("Transferring memories to long-term storage", "Forgetting unimportant details", "Learning word pairs"), 0),
+                ReadingQuestion("q3", "Who recalled word pairs better?", ("Participants who stayed awake", "Participants who napped", "Both groups equally"), 1),
+                ReadingQuestion("q4", "For which memories did sleep help least?", ("Recently formed memories", "Material rehearsed many times", "Emotional memories"), 1),
+                ReadingQuestion("q5", "What does the passage conclude?", ("Sleep matters most for fragile memories", "Rehearsal is useless", "Naps harm recall"), 0),
+            )
+        ),
+        ReadingPassage(
+            "rc-maps", "Mapping the Coast",
+            "Early coastal charts were drawn from ships using compass bearings and estimated distances, "
+            "so headlands were often misplaced by several miles. The introduction of triangulation, "
+            "which fixes each point by measuring angles from two known positions, allowed surveyors "
+            "to work from land with far greater precision. Ironically, the most accurate maps of the "
+            "period were of coasts that were easiest to reach on foot, while treacherous shores that "
+            "sailors most needed charted remained the least reliable for decades.",
+            (
+                ReadingQuestion("q1", "How were early coastal charts produced?", ("From balloons", "From ships using bearings and estimates", "From satellite images"), 1),
+                ReadingQuestion("q2", "What does triangulation rely on?", ("Measuring angles from two known positions", "Counting footsteps", "Sounding the depth of water"), 0),
+                ReadingQuestion("q3", "Which coasts were mapped most accurately?", ("Those most dangerous to sailors", "Those easiest to reach on foot", "Those with lighthouses"), 1),
+                ReadingQuestion("q4", "Why does the author call the situation ironic?", ("Sailors disliked the new maps", "The shores sailors most needed charted were the least reliable", "Triangulation was invented by sailors"), 1),
+                ReadingQuestion("q5", "What was a common error in early charts?", ("Misplacing headlands by several miles", "Drawing rivers backwards", "Omitting all towns"), 0),
+            )
+        ),
+    )),
+})
+
+# Reading Comprehension passages by ID, for looking up answer keys
+READING_PASSAGES: Mapping[str, ReadingPassage] = MappingProxyType({
+    passage.id: passage
+    for parameters in READING_COMPREHENSION.values()
+    for passage in parameters.passages
+})
+
+VERBAL_MEMORY_WORDS: Tuple[str, ...] = (
+    "anchor", "basket", "candle", "desert", "engine", "feather", "garden", "harbor",
+    "island", "jacket", "kettle", "ladder", "meadow", "needle", "orchard", "pillow",
+    "quarry", "ribbon", "saddle", "tunnel", "umbrella", "valley", "window", "yogurt",
+    "bridge", "castle", "dragon", "forest", "guitar", "helmet", "insect", "jungle",
+    "kitchen", "lantern", "marble", "napkin", "oyster", "parrot", "rabbit", "silver",
+    "temple", "violin", "walnut", "blanket", "compass", "dolphin", "envelope", "fountain",
+    "glacier", "hammock", "iceberg", "lobster", "mirror", "necklace", "pebble", "rocket",
+    "scarf", "teapot", "wagon", "zipper",
+)
+
+VERBAL_MEMORY: Mapping[DifficultyLevel, VerbalMemoryParameters] = MappingProxyType({
+    DifficultyLevel.BEGINNER: VerbalMemoryParameters(20, 10, 3000, 0.6),
+    DifficultyLevel.INTERMEDIATE: VerbalMemoryParameters(30, 16, 2500, 0.65),
+    DifficultyLevel.ADVANCED: VerbalMemoryParameters(40, 24, 2000, 0.7),
+    DifficultyLevel.EXPERT: VerbalMemoryParameters(50, 32, 1500, 0.75),
+})
+
+SEMANTIC_ASSOCIATION: Mapping[DifficultyLevel, SemanticAssociationParameters] = MappingProxyType({
+    DifficultyLevel.BEGINNER: SemanticAssociationParameters(5, 90, 0.6, (
+        SemanticItem("sa-b1", "bread", "butter", ("ladder", "cloud")),
+        SemanticItem("sa-b2", "rain", "umbrella", ("spoon", "carpet")),
+        SemanticItem("sa-b3", "dog", "bone", ("kettle", "pencil")),
+        SemanticItem("sa-b4", "bed", "pillow", ("hammer", "orange")),
+        SemanticItem("sa-b5", "fish", "water", ("candle", "shoe")),
+        SemanticItem("sa-b6", "key", "lock", ("grape", "cloud")),
+        SemanticItem("sa-b7", "cup", "saucer", ("tiger", "brick")),
+        SemanticItem("sa-b8", "snow", "cold", ("loud", "sweet")),
+    )),
+    DifficultyLevel.INTERMEDIATE: SemanticAssociationParameters(8, 90, 0.65, (
+        SemanticItem("sa-i1", "doctor", "hospital", ("library", "stadium", "bakery")),
+        SemanticItem("sa-i2", "pen", "paper", ("stone", "wheel", "apple")),
+        SemanticItem("sa-i3", "seed", "plant", ("shelf", "coin", "boot")),
+        SemanticItem("sa-i4", "needle", "thread", ("soup", "mirror", "wagon")),
+        SemanticItem("sa-i5", "thunder", "lightning", ("velvet", "pepper", "ticket")),
+        SemanticItem("sa-i6", "nest", "bird", ("piano", "engine", "fence")),
+        SemanticItem("sa-i7", "stage", "actor", ("glacier", "button", "tractor")),
+        SemanticItem("sa-i8", "hive", "bee", ("whale", "owl", "horse")),
+        SemanticItem("sa-i9", "anchor", "ship", ("train", "kite", "bicycle")),
+        SemanticItem("sa-i10", "oven", "bake", ("swim", "paint", "sing")),
+    )),
+    DifficultyLevel.ADVANCED: SemanticAssociationParameters(10, 90, 0.7, (
+        SemanticItem("sa-a1", "telescope", "astronomy", ("geology", "botany", "chemistry")),
+        SemanticItem("sa-a2", "verdict", "jury", ("orchestra", "crew", "audience")),
+        SemanticItem("sa-a3", "drought", "scarcity", ("abundance", "harmony", "velocity")),
+        SemanticItem("sa-a4", "chisel", "sculptor", ("pilot", "banker", "chef")),
+        SemanticItem("sa-a5", "ballot", "election", ("harvest", "voyage", "wedding")),
+        SemanticItem("sa-a6", "fossil", "extinction", ("invention", "migration", "celebration")),
+        SemanticItem("sa-a7", "compass", "navigation", ("digestion", "irrigation", "decoration")),
+        SemanticItem("sa-a8", "vaccine", "immunity", ("gravity", "poverty", "vanity")),
+        SemanticItem("sa-a9", "prism", "spectrum", ("pendulum", "magnet", "lever")),
+        SemanticItem("sa-a10", "archive", "records", ("recipes", "tools", "weapons")),
+        SemanticItem("sa-a11", "glacier", "erosion", ("fermentation", "combustion", "pollination")),
+        SemanticItem("sa-a12", "treaty", "diplomacy", ("carpentry", "astronomy", "poetry")),
+    )),
+    DifficultyLevel.EXPERT: SemanticAssociationParameters(12, 90, 0.75, (
+        SemanticItem("sa-e1", "ephemeral", "transient", ("durable", "ancient", "massive")),
+        SemanticItem("sa-e2", "catalyst", "acceleration", ("obstruction", "sedation", "erosion")),
+        SemanticItem("sa-e3", "palimpsest", "manuscript", ("sculpture", "symphony", "fresco")),
+        SemanticItem("sa-e4", "hegemony", "dominance", ("obscurity", "equality", "poverty")),
+        SemanticItem("sa-e5", "entropy", "disorder", ("symmetry", "velocity", "clarity")),
+        SemanticItem("sa-e6", "sonnet", "quatrain", ("overture", "mosaic", "sonata")),
+        SemanticItem("sa-e7", "tectonic", "earthquake", ("eclipse", "monsoon", "aurora")),
+        SemanticItem("sa-e8", "synapse", "neuron", ("alveolus", "tendon", "follicle")),
+        SemanticItem("sa-e9", "embargo", "trade", ("migration", "worship", "harvest")),
+        SemanticItem("sa-e10", "aqueduct", "water", ("grain", "timber", "salt")),
+        SemanticItem("sa-e11", "cartography", "maps", ("coins", "stars", "bones")),
+        SemanticItem("sa-e12", "photosynthesis", "chlorophyll", ("hemoglobin", "keratin", "insulin")),
+        SemanticItem("sa-e13", "meridian", "longitude", ("altitude", "humidity", "velocity")),
+        SemanticItem("sa-e14", "allegory", "symbolism", ("arithmetic", "acoustics", "anatomy")),
+    )),
+})
+
+# Semantic Association items by ID, for looking up answer keys
+SEMANTIC_ITEMS: Mapping[str, SemanticItem] = MappingProxyType({
+    item.id: item
+    for parameters in SEMANTIC_ASSOCIATION.values()
+    for item in parameters.items
+})
+
+# Attention Task target stimulus; distractors per level get more similar to it
+ATTENTION_TARGET = "X"
+
+ATTENTION_TASK: Mapping[DifficultyLevel, AttentionTaskParameters] = MappingProxyType({
+    DifficultyLevel.BEGINNER: AttentionTaskParameters(30, 0.3, 1000, 1500, tuple("ABCDEFGH"), 0.6),
+    DifficultyLevel.INTERMEDIATE: AttentionTaskParameters(45, 0.25, 800, 1200, tuple("ABCDEFGHKY"), 0.65),
+    DifficultyLevel.ADVANCED: AttentionTaskParameters(60, 0.2, 600, 1000, tuple("KYVZAHNM"), 0.7),
+    DifficultyLevel.EXPERT: AttentionTaskParameters(80, 0.15, 500, 800, tuple("KYVZ"), 0.75),
+})
@@ -0,0 +1,276 @@
+"""
+Pools of pre-generated exercises.
+
+``POST /cognitive-training/exercises`` takes a ready exercise from an
+in-memory pool instead of generating one per request. There is one pool per
+(exercise type, difficulty, adaptive step), where the step is the adaptive
+difficulty progress between two levels rounded down to quarters. A
+background task refills pools that fall below half of EXERCISE_POOL_SIZE.
+An exercise is only pooled after validate_exercise accepts it. If a pool is
+empty, the exercise is generated inline as before.
+
+Every exercise is generated from a recorded seed (``generation_seed``), so
+its content can be reproduced for audit. A served exercise gets a fresh ID
+and timestamps.
+
+On shutdown the pooled exercises are written to the exercise_pool
+collection, and the next process to start claims them instead of
+regenerating. Persisted pools expire after EXERCISE_POOL_PERSIST_HOURS so
+exercises from an older generator version do not linger.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.db.mongodb import get_database, COLLECTION_EXERCISE_POOL
+from app.models.training import DifficultyLevel, Exercise, ExerciseType
+from app.services.exercise_registry import EXERCISE_PLUGINS, get_exercise_plugin
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+EXERCISE_POOL_ENABLED = os.getenv("EXERCISE_POOL_ENABLED", "true").lower() == "true"
+EXERCISE_POOL_SIZE = int(os.getenv("EXERCISE_POOL_SIZE", "16"))
+EXERCISE_POOL_REFILL_INTERVAL_SECONDS = float(os.getenv("EXERCISE_POOL_REFILL_INTERVAL_SECONDS", "30"))
+EXERCISE_POOL_PERSIST_HOURS = float(os.getenv("EXERCISE_POOL_PERSIST_HOURS", "24"))
+
+# Adaptive progress between two levels is pooled in this many steps
+PROGRESS_STEPS = 4
+
+# Pool key: (exercise type, difficulty, progress step)
+PoolKey = Tuple[ExerciseType, DifficultyLevel, int]
+
+
+def pool_key(exercise_type: ExerciseType, difficulty: DifficultyLevel, progress: float = 0.0) -> PoolKey:
+    """Pool an exercise request is served from."""
+    exercise_type, difficulty = ExerciseType(exercise_type), DifficultyLevel(difficulty)
+    plugin = get_exercise_plugin(exercise_type)
+    step = 0
+    if plugin is not None and plugin.progressive:
+        step = min(PROGRESS_STEPS - 1, max(0, int(progress * PROGRESS_STEPS)))
+    return exercise_type, difficulty, step
+
+
+def generate_exercise(exercise_type: ExerciseType, difficulty: DifficultyLevel, progress: float = 0.0,
+                      seed: Optional[int] = None) -> Exercise:
+    """
+    Generate an exercise with its registered generator.
+
+    Args:
+        exercise_type: Type of exercise
+        difficulty: Difficulty level
+        progress: Adaptive position between this level and the next (0-1)
+        seed: Random seed (drawn if not given)
+
+    Returns:
+        The generated exercise
+    """
+    plugin = get_exercise_plugin(exercise_type)
+    if plugin is None:
+        raise ValueError(f"Unsupported exercise type: {exercise_type}")
+    return plugin.generate(difficulty, progress, seed)
+
+
+def validate_exercise(exercise: Exercise) -> bool:
+    """Check that a generated exercise is playable before it is pooled."""
+    plugin = get_exercise_plugin(exercise.exercise_type)
+    if plugin is None or exercise.generation_seed is None or exercise.estimated_duration <= 0:
+        return False
+    return plugin.validate(exercise)
+
+
+def _key_to_str(key: PoolKey) -> str:
+    exercise_type, difficulty, step = key
+    return f"{exercise_type.value}:{difficulty.value}:{step}"
+
+
+def _key_from_str(value: str) -> PoolKey:
+    exercise_type, difficulty, step = value.split(":")
+    return ExerciseType(exercise_type), DifficultyLevel(difficulty), int(step)
+
+
+class ExercisePool:
+    """In-memory pools of pre-generated exercises with a background refill task."""
+
+    def __init__(self, size: int, refill_interval: float):
+        self.size = max(1, size)
+        self.low_water = max(1, self.size // 2)
+        self.refill_interval = refill_interval
+        self._pools: Dict[PoolKey, Deque[Exercise]] = {key: deque() for key in self.keys()}
+        self._refill_needed: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def keys() -> List[PoolKey]:
+        """All pools, one per exercise type, difficulty and progress step."""
+        return [
+            (exercise_type, difficulty, step)
+            for exercise_type, plugin in EXERCISE_PLUGINS.items()
+            for difficulty in DifficultyLevel
+            for step in range(PROGRESS_STEPS if plugin.progressive else 1)
+        ]
+
+    def take(self, exercise_type: ExerciseType, difficulty: DifficultyLevel, progress: float = 0.0) -> Exercise:
+        """
+        Take an exercise from its pool, generating one if the pool is empty.
+
+        Args:
+            exercise_type: Type of exercise
+            difficulty: Difficulty level
+            progress: Adaptive position between this level and the next (0-1)
+
+        Returns:
+            A new exercise with a fresh ID and timestamps
+        """
+        key = pool_key(exercise_type, difficulty, progress)
+        pool = self._pools.get(key)
+        exercise = pool.popleft() if pool else generate_exercise(exercise_type, difficulty, progress)
+        if pool is not None and len(pool) < self.low_water and self._refill_needed is not None:
+            self._refill_needed.set()
+        now = datetime.utcnow()
+        return exercise.copy(update={"id": str(uuid.uuid4()), "created_at": now, "updated_at": now})
+
+    def fill(self, key: PoolKey) -> int:
+        """Top a pool up to its size; returns the number of exercises added."""
+        exercise_type, difficulty, step = key
+        pool = self._pools[key]
+        added = 0
+        # Bounded, so a generator that keeps failing validation cannot stall the loop
+        for _ in range(2 * (self.size - len(pool))):
+            if len(pool) >= self.size:
+                break
+            exercise = generate_exercise(exercise_type, difficulty, step / PROGRESS_STEPS)
+            if not validate_exercise(exercise):
+                logger.warning(f"Discarding invalid {_key_to_str(key)} exercise (seed {exercise.generation_seed})")
+                continue
+            pool.append(exercise)
+            added += 1
+        return added
+
+    async def start(self) -> None:
+        """Claim persisted exercises, fill every pool and start the refill task."""
+        self._refill_needed = asyncio.Event()
+        try:
+            await self._claim_persisted()
+        except Exception as e:
+            logger.warning(f"Could not load persisted exercise pools: {e}")
+        for key in self._pools:
+            self.fill(key)
+        self._task = asyncio.create_task(self._refill_loop())
+        logger.info(f"Exercise pools ready ({len(self._pools)} pools of {self.size})")
+
+    async def _refill_loop(self) -> None:
+        """Refill pools below their low-water mark when signalled or periodically."""
+        while True:
+            try:
+                await asyncio.wait_for(self._refill_needed.wait(), timeout=self.refill_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._refill_needed.clear()
+            for key, pool in self._pools.items():
+                if len(pool) < self.low_water:
+                    try:
+                        self.fill(key)
+                    except Exception as e:
+                        logger.error(f"Failed to refill exercise pool {_key_to_str(key)}: {e}")
+                    # Let requests run between pools
+                    await asyncio.sleep(0)
+
+    async def _claim_persisted(self) -> None:
+        """Move exercises persisted by a previous process into the in-memory pools."""
+        db = get_database()
+        documents = await db[COLLECTION_EXERCISE_POOL].find(
+            {"expires_at": {"$gt": datetime.utcnow()}}
+        ).to_list(length=len(self._pools) * self.size)
+        if not documents:
+            return
+        # Another process starting at the same time may claim the same
+        # exercises; they get fresh IDs when served, so that is harmless
+        await db[COLLECTION_EXERCISE_POOL].delete_many({"_id": {"$in": [document["_id"] for document in documents]}})
+        claimed = 0
+        for document in documents:
+            try:
+                key = _key_from_str(document["pool_key"])
+                exercise = Exercise(**document["exercise"])
+            except Exception as e:
+                logger.warning(f"Skipping persisted pool exercise {document['_id']}: {e}")
+                continue
+            pool = self._pools.get(key)
+            if pool is not None and len(pool) < self.size and validate_exercise(exercise):
+                pool.append(exercise)
+                claimed += 1
+        logger.info(f"Claimed {claimed} persisted exercises")
+
+    async def close(self) -> None:
+        """Stop the refill task and persist the pooled exercises."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        expires_at = datetime.utcnow() + timedelta(hours=EXERCISE_POOL_PERSIST_HOURS)
+        documents = [
+            {
+                "_id": exercise.id,
+                "pool_key": _key_to_str(key),
+                "exercise": exercise.dict(),
+                "expires_at": expires_at
+            }
+            for key, pool in self._pools.items()
+            for exercise in pool
+        ]
+        for pool in self._pools.values():
+            pool.clear()
+        if documents:
+            try:
+                db = get_database()
+                await db[COLLECTION_EXERCISE_POOL].insert_many(documents, ordered=False)
+                logger.info(f"Persisted {len(documents)} pooled exercises")
+            except Exception as e:
+                logger.warning(f"Could not persist exercise pools: {e}")
+
+
+exercise_pool: Optional[ExercisePool] = None
+if EXERCISE_POOL_ENABLED:
+    exercise_pool = ExercisePool(EXERCISE_POOL_SIZE, EXERCISE_POOL_REFILL_INTERVAL_SECONDS)
+
+
+def take_exercise(exercise_type: ExerciseType, difficulty: DifficultyLevel, progress: float = 0.0) -> Exercise:
+    """
+    Get a new exercise, from the pools when they are enabled.
+
+    Args:
+        exercise_type: Type of exercise
+        difficulty: Difficulty level
+        progress: Adaptive position between this level and the next (0-1)
+
+    Returns:
+        The exercise to serve
+    """
+    if exercise_pool is not None:
+        return exercise_pool.take(exercise_type, difficulty, progress)
+    return generate_exercise(exercise_type, difficulty, progress)
+
+
+async def start_exercise_pool() -> None:
+    """Fill the exercise pools and start refilling them (called on startup)."""
+    if exercise_pool is not None:
+        await exercise_pool.start()
+
+
+async def close_exercise_pool() -> None:
+    """Stop refilling the exercise pools and persist them (called on shutdown)."""
+    if exercise_pool is not None:
+        await exercise_pool.close()
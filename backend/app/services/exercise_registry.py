@@ -0,0 +1,132 @@
+"""
+Registry of server-generated exercise types.
+
+Each exercise type the API can generate registers an ExercisePlugin with
+its generator, evaluator and validator. Generation, pooling and evaluation
+look a type up in one read-only mapping instead of branching on the type,
+so adding an exercise type means adding its content (see
+exercise_content.py), its service methods and one entry here.
+"""
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional
+
+from app.models.training import DifficultyLevel, Exercise, ExerciseType
+from app.services.cognitive_training_service import CognitiveTrainingService
+
+
+class ExercisePlugin(NamedTuple):
+    """Generator, evaluator and validator of one exercise type."""
+    # (difficulty, progress 0-1, seed) -> exercise
+    generate: Callable[[DifficultyLevel, float, Optional[int]], Exercise]
+    # (exercise, submitted answers) -> evaluation with score, accuracy and feedback;
+    # None for types scored by the client and evaluated from reported results
+    evaluate: Optional[Callable[[Exercise, Dict], Dict]]
+    # Whether a generated exercise is playable, checked before pooling
+    validate: Callable[[Exercise], bool]
+    # Whether generate interpolates parameters by adaptive progress
+    progressive: bool = False
+
+
+def _unique_nonempty(values: List) -> bool:
+    return bool(values) and len(set(values)) == len(values)
+
+
+def _valid_word_recall(exercise: Exercise) -> bool:
+    content = exercise.content
+    return _unique_nonempty(content.get("words") or []) and content.get("display_time", 0) > 0
+
+
+def _valid_language_fluency(exercise: Exercise) -> bool:
+    content = exercise.content
+    letter = content.get("letter") or ""
+    return (_unique_nonempty(content.get("categories") or [])
+            and len(letter) == 1 and letter.isalpha() and content.get("time_limit", 0) > 0)
+
+
+def _valid_memory_match(exercise: Exercise) -> bool:
+    content = exercise.content
+    grid = content.get("grid_size") or {}
+    return 0 < content.get("pairs", 0) * 2 <= grid.get("rows", 0) * grid.get("cols", 0)
+
+
+def _valid_reading_comprehension(exercise: Exercise) -> bool:
+    questions = exercise.content.get("questions") or []
+    return (bool(exercise.content.get("passage"))
+            and _unique_nonempty([question["id"] for question in questions])
+            and all(len(question["options"]) >= 2 for question in questions))
+
+
+def _valid_verbal_memory(exercise: Exercise) -> bool:
+    words = exercise.content.get("words") or []
+    # The first word is always new and at least one word must repeat
+    return len(words) > len(set(words)) > 0
+
+
+def _valid_semantic_association(exercise: Exercise) -> bool:
+    items = exercise.content.get("items") or []
+    return (_unique_nonempty([item["id"] for item in items])
+            and all(_unique_nonempty(item["options"]) for item in items))
+
+
+def _valid_attention_task(exercise: Exercise) -> bool:
+    stimuli = exercise.content.get("stimuli") or []
+    target = exercise.content.get("target")
+    return target in stimuli and any(stimulus != target for stimulus in stimuli)
+
+
+EXERCISE_PLUGINS: Mapping[ExerciseType, ExercisePlugin] = MappingProxyType({
+    ExerciseType.WORD_RECALL: ExercisePlugin(
+        generate=CognitiveTrainingService.generate_word_recall_exercise,
+        evaluate=lambda exercise, answers: CognitiveTrainingService.evaluate_word_recall_session(
+            exercise, answers["recalled_words"]
+        ),
+        validate=_valid_word_recall,
+        progressive=True,
+    ),
+    ExerciseType.LANGUAGE_FLUENCY: ExercisePlugin(
+        generate=CognitiveTrainingService.generate_language_fluency_exercise,
+        evaluate=lambda exercise, answers: CognitiveTrainingService.evaluate_language_fluency_session(
+            exercise, answers["answers"]
+        ),
+        validate=_valid_language_fluency,
+        progressive=True,
+    ),
+    ExerciseType.MEMORY_MATCH: ExercisePlugin(
+        generate=CognitiveTrainingService.generate_memory_match_exercise,
+        evaluate=None,
+        validate=_valid_memory_match,
+    ),
+    ExerciseType.READING_COMPREHENSION: ExercisePlugin(
+        generate=CognitiveTrainingService.generate_reading_comprehension_exercise,
+        evaluate=lambda exercise, answers: CognitiveTrainingService.evaluate_reading_comprehension_session(
+            exercise, answers["answers"]
+        ),
+        validate=_valid_reading_comprehension,
+    ),
+    ExerciseType.VERBAL_MEMORY: ExercisePlugin(
+        generate=CognitiveTrainingService.generate_verbal_memory_exercise,
+        evaluate=lambda exercise, answers: CognitiveTrainingService.evaluate_verbal_memory_session(
+            exercise, answers["responses"]
+        ),
+        validate=_valid_verbal_memory,
+    ),
+    ExerciseType.SEMANTIC_ASSOCIATION: ExercisePlugin(
+        generate=CognitiveTrainingService.generate_semantic_association_exercise,
+        evaluate=lambda exercise, answers: CognitiveTrainingService.evaluate_semantic_association_session(
+            exercise, answers["answers"]
+        ),
+        validate=_valid_semantic_association,
+    ),
+    ExerciseType.ATTENTION_TASK: ExercisePlugin(
+        generate=CognitiveTrainingService.generate_attention_task_exercise,
+        evaluate=lambda exercise, answers: CognitiveTrainingService.evaluate_attention_task_session(
+            exercise, answers["responses"], answers.get("response_times_ms")
+        ),
+        validate=_valid_attention_task,
+    ),
+})
+
+
+def get_exercise_plugin(exercise_type: ExerciseType) -> Optional[ExercisePlugin]:
+    """Plugin of an exercise type, or None if the server does not generate it."""
+    return EXERCISE_PLUGINS.get(exercise_type)
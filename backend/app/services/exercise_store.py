@@ -0,0 +1,119 @@
+"""
+Persistence for generated exercises.
+
+Exercises created by ``POST /cognitive-training/exercises`` are stored in a
+TTL-indexed collection, so submissions can be evaluated against the exact
+exercise that was served instead of reconstructing it from its ID. Recently
+generated exercises are kept in a small in-process cache; exercises never
+change after generation, so cached copies cannot go stale.
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+
+from app.db.mongodb import get_database, COLLECTION_EXERCISES
+from app.models.training import Exercise
+from app.utils.cache import TTLCache
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How long a generated exercise can still be submitted
+EXERCISE_TTL_HOURS = float(os.getenv("EXERCISE_TTL_HOURS", "24"))
+EXERCISE_CACHE_TTL_SECONDS = float(os.getenv("EXERCISE_CACHE_TTL_SECONDS", "900"))
+EXERCISE_CACHE_MAX_SIZE = int(os.getenv("EXERCISE_CACHE_MAX_SIZE", "5000"))
+
+# Cached (owner user ID, exercise) by exercise ID
+_exercise_cache: TTLCache = TTLCache(maxsize=EXERCISE_CACHE_MAX_SIZE, ttl=EXERCISE_CACHE_TTL_SECONDS)
+
+
+def _exercise_from_document(document: Dict) -> Exercise:
+    """Build an Exercise from a stored document."""
+    return Exercise(id=document["_id"], **{
+        key: value for key, value in document.items()
+        if key not in ("_id", "user_id", "expires_at")
+    })
+
+
+class ExerciseStore:
+    """
+    Service for storing and loading generated exercises.
+    """
+
+    @staticmethod
+    async def save(exercise: Exercise, user_id: str) -> Exercise:
+        """
+        Store a generated exercise for the user it was generated for.
+
+        Args:
+            exercise: The generated exercise
+            user_id: ID of the user the exercise was served to
+
+        Returns:
+            The stored exercise
+        """
+        document = exercise.dict(exclude={"id"})
+        document["_id"] = exercise.id
+        document["user_id"] = user_id
+        document["expires_at"] = exercise.created_at + timedelta(hours=EXERCISE_TTL_HOURS)
+
+        db = get_database()
+        await db[COLLECTION_EXERCISES].insert_one(document)
+        _exercise_cache.set(exercise.id, (user_id, exercise))
+        return exercise
+
+    @staticmethod
+    async def get(exercise_id: str, user_id: str) -> Optional[Exercise]:
+        """
+        Load an exercise served to a user.
+
+        Args:
+            exercise_id: ID of the exercise
+            user_id: ID of the requesting user
+
+        Returns:
+            The exercise, or None if it is unknown, expired or belongs to another user
+        """
+        return (await ExerciseStore.get_many([exercise_id], user_id)).get(exercise_id)
+
+    @staticmethod
+    async def get_many(exercise_ids: Iterable[str], user_id: str) -> Dict[str, Exercise]:
+        """
+        Load several exercises served to a user with at most one query.
+
+        Args:
+            exercise_ids: IDs of the exercises
+            user_id: ID of the requesting user
+
+        Returns:
+            Mapping of exercise ID to exercise for the IDs that were found
+        """
+        exercises: Dict[str, Exercise] = {}
+        missing = []
+        for exercise_id in set(exercise_ids):
+            cached = _exercise_cache.get(exercise_id)
+            if cached is None:
+                missing.append(exercise_id)
+            elif cached[0] == user_id:
+                exercises[exercise_id] = cached[1]
+
+        if missing:
+            db = get_database()
+            cursor = db[COLLECTION_EXERCISES].find({
+                "_id": {"$in": missing},
+                "user_id": user_id,
+                # The TTL monitor only runs periodically
+                "expires_at": {"$gt": datetime.utcnow()}
+            })
+            async for document in cursor:
+                exercise = _exercise_from_document(document)
+                _exercise_cache.set(exercise.id, (user_id, exercise))
+                exercises[exercise.id] = exercise
+
+        return exercises
@@ -0,0 +1,138 @@
+"""
+Long-term performance time series.
+
+Every completed session is also written as one point (timestamp, score,
+accuracy, duration) to the performance_series collection. That collection
+is a MongoDB time-series collection with the user as its meta field (see
+app/db/indexes.py): the server packs each user's points into compressed,
+column-oriented buckets spanning up to 30 days instead of keeping one
+document per session. A multi-year history therefore reads a few dozen
+buckets holding only the charted fields, rather than thousands of full
+session documents with their answers and details.
+
+training_sessions stays the source of truth. A point that fails to be
+written is only logged, and scripts/backfill_performance_series.py adds the
+points of any session that is missing from the series.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.db.mongodb import get_database, COLLECTION_PERFORMANCE_SERIES
+from app.models.training import ExerciseType, PerformanceHistory, PerformancePeriod
+from app.services.cognitive_training_service import _accuracy_percent
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Period lengths supported by the history query ($dateTrunc units)
+HISTORY_INTERVALS = ("day", "week", "month", "quarter", "year")
+
+
+def _enum_value(value):
+    return getattr(value, "value", value)
+
+
+def series_point(session: Dict) -> Dict:
+    """
+    Build the performance_series point of a stored training session.
+
+    Args:
+        session: training_sessions document (with its _id)
+
+    Returns:
+        The time-series point
+    """
+    return {
+        "timestamp": session.get("end_time") or session["created_at"],
+        "user_id": session["user_id"],
+        "session_id": session["_id"],
+        "exercise_type": _enum_value(session["exercise_type"]),
+        "difficulty": _enum_value(session.get("difficulty")),
+        "score": float(session.get("score") or 0),
+        "accuracy": float(_accuracy_percent(session.get("accuracy"))),
+        "duration": float(session.get("duration") or 0)
+    }
+
+
+async def record_sessions(sessions: List[Dict]) -> None:
+    """
+    Append stored sessions to the performance series.
+
+    Failures are logged and never fail the submission; the backfill script
+    repairs missing points.
+
+    Args:
+        sessions: training_sessions documents that have been inserted
+    """
+    if not sessions:
+        return
+    try:
+        db = get_database()
+        await db[COLLECTION_PERFORMANCE_SERIES].insert_many(
+            [series_point(session) for session in sessions], ordered=False
+        )
+    except Exception as e:
+        logger.error(f"Failed to record {len(sessions)} performance series points: {e}")
+
+
+async def get_performance_history(user_id: str, interval: str = "month", start: Optional[datetime] = None,
+                                  end: Optional[datetime] = None,
+                                  exercise_type: Optional[ExerciseType] = None) -> PerformanceHistory:
+    """
+    Summarize a user's performance per exercise type and period.
+
+    Args:
+        user_id: ID of the user
+        interval: Period length (day, week, month, quarter or year)
+        start: Earliest point to include (default: the whole history)
+        end: Latest point to include (default: now)
+        exercise_type: Only include this exercise type
+
+    Returns:
+        Per-period performance for each exercise type, oldest period first
+    """
+    if interval not in HISTORY_INTERVALS:
+        raise ValueError(f"Unsupported interval: {interval}")
+    end = end or datetime.utcnow()
+    time_range = {"$lte": end}
+    if start is not None:
+        time_range["$gte"] = start
+    match = {"user_id": user_id, "timestamp": time_range}
+    if exercise_type is not None:
+        match["exercise_type"] = _enum_value(exercise_type)
+
+    db = get_database()
+    pipeline = [
+        {"$match": match},
+        {"$group": {
+            "_id": {
+                "exercise_type": "$exercise_type",
+                "period": {"$dateTrunc": {"date": "$timestamp", "unit": interval}}
+            },
+            "sessions": {"$sum": 1},
+            "average_score": {"$avg": "$score"},
+            "average_accuracy": {"$avg": "$accuracy"},
+            "best_accuracy": {"$max": "$accuracy"},
+            "time_spent": {"$sum": "$duration"}
+        }},
+        {"$sort": {"_id.exercise_type": 1, "_id.period": 1}}
+    ]
+    groups = await db[COLLECTION_PERFORMANCE_SERIES].aggregate(pipeline).to_list(length=None)
+
+    known_types = {ex_type.value for ex_type in ExerciseType}
+    history: Dict[str, List[PerformancePeriod]] = {}
+    for group in groups:
+        group_type = group["_id"]["exercise_type"]
+        if group_type not in known_types:
+            continue
+        history.setdefault(group_type, []).append(PerformancePeriod(
+            period=group["_id"]["period"],
+            sessions=group["sessions"],
+            average_score=group["average_score"],
+            average_accuracy=group["average_accuracy"],
+            best_accuracy=group["best_accuracy"],
+            time_spent=group["time_spent"]
+        ))
+
+    return PerformanceHistory(user_id=user_id, interval=interval, start=start, end=end, history=history)
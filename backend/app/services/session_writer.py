@@ -0,0 +1,217 @@
+"""
+Write-behind buffer for training session inserts.
+
+When enabled, sessions are not inserted one at a time: documents accumulate
+for up to SESSION_WRITE_BUFFER_MAX_DELAY_MS milliseconds (or until
+SESSION_WRITE_BUFFER_MAX_DOCUMENTS are pending) and are then written with a
+single unordered insert_many. Session IDs are generated client-side, so the
+caller knows the ID of its session before the write happens.
+
+Acknowledgement is configurable with SESSION_WRITE_ACK:
+
+- ``flushed`` (default): the caller waits until the batch containing its
+  session has been written, so errors still reach the request.
+- ``buffered``: the caller returns as soon as the session is queued. Writes
+  that fail afterwards are only logged, and sessions still queued when the
+  process dies are lost.
+
+SESSION_WRITE_CONCERN optionally overrides the write concern of the batched
+inserts (e.g. ``majority`` or ``1``). With the buffer disabled, sessions are
+inserted directly as before.
+"""
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo import WriteConcern
+from pymongo.errors import BulkWriteError
+
+from app.db.mongodb import get_database, COLLECTION_TRAINING_SESSIONS
+from app.utils.metrics import observe_write_buffer_flush
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SESSION_WRITE_BUFFER_ENABLED = os.getenv("SESSION_WRITE_BUFFER_ENABLED", "false").lower() == "true"
+SESSION_WRITE_BUFFER_MAX_DOCUMENTS = int(os.getenv("SESSION_WRITE_BUFFER_MAX_DOCUMENTS", "200"))
+SESSION_WRITE_BUFFER_MAX_DELAY_MS = float(os.getenv("SESSION_WRITE_BUFFER_MAX_DELAY_MS", "5"))
+SESSION_WRITE_ACK = os.getenv("SESSION_WRITE_ACK", "flushed").lower()
+SESSION_WRITE_CONCERN = os.getenv("SESSION_WRITE_CONCERN", "")
+
+# Supported acknowledgement modes
+ACK_FLUSHED = "flushed"
+ACK_BUFFERED = "buffered"
+
+
+def _write_concern(spec: str) -> Optional[WriteConcern]:
+    """Parse a write concern setting ('', 'majority' or a number of nodes)."""
+    if not spec:
+        return None
+    return WriteConcern(w=int(spec) if spec.isdigit() else spec)
+
+
+class WriteBehindBuffer:
+    """Accumulates inserts for one collection and flushes them in batches."""
+
+    def __init__(self, collection_name: str, max_documents: int, max_delay_ms: float,
+                 acknowledge: str = ACK_FLUSHED, write_concern: Optional[WriteConcern] = None):
+        if acknowledge not in (ACK_FLUSHED, ACK_BUFFERED):
+            raise ValueError(f"Unsupported acknowledgement mode: {acknowledge}")
+        self.collection_name = collection_name
+        self.max_documents = max(1, max_documents)
+        self.max_delay = max_delay_ms / 1000
+        self.acknowledge = acknowledge
+        self.write_concern = write_concern
+        self._pending: List[Tuple[Dict, Optional[asyncio.Future]]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def insert(self, document: Dict) -> ObjectId:
+        """
+        Queue a document for insertion.
+
+        Args:
+            document: Document to insert; an ``_id`` is assigned if missing
+
+        Returns:
+            The document's ``_id``
+
+        Raises:
+            RuntimeError: If the buffer has been closed
+        """
+        return (await self.insert_many([document]))[0]
+
+    async def insert_many(self, documents: List[Dict]) -> List[ObjectId]:
+        """
+        Queue several documents for insertion.
+
+        Args:
+            documents: Documents to insert; ``_id`` values are assigned if missing
+
+        Returns:
+            The documents' ``_id`` values, in order
+        """
+        if self._closed:
+            raise RuntimeError("Write buffer is closed")
+
+        loop = asyncio.get_running_loop()
+        waiters = []
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+            waiter = loop.create_future() if self.acknowledge == ACK_FLUSHED else None
+            self._pending.append((document, waiter))
+            if waiter is not None:
+                waiters.append(waiter)
+            if len(self._pending) >= self.max_documents:
+                self._start_flush()
+
+        if self._pending and self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+
+        if waiters:
+            await asyncio.gather(*waiters)
+        return [document["_id"] for document in documents]
+
+    def _start_flush(self) -> None:
+        """Hand the pending documents to a background write."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._write(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _write(self, batch: List[Tuple[Dict, Optional[asyncio.Future]]]) -> None:
+        """Write a batch with one unordered insert_many and settle its waiters."""
+        collection = get_database()[self.collection_name]
+        if self.write_concern is not None:
+            collection = collection.with_options(write_concern=self.write_concern)
+
+        errors: Dict[int, Exception] = {}
+        try:
+            await collection.insert_many([document for document, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            # Unordered: every document without a write error was inserted
+            for write_error in e.details.get("writeErrors", []):
+                errors[write_error["index"]] = RuntimeError(write_error.get("errmsg", "write failed"))
+        except Exception as e:
+            errors = {index: e for index in range(len(batch))}
+
+        observe_write_buffer_flush(self.collection_name, len(batch), len(errors))
+        if errors:
+            logger.error(
+                "Failed to write %d of %d buffered %s documents: %s",
+                len(errors), len(batch), self.collection_name, next(iter(errors.values()))
+            )
+
+        for index, (_, waiter) in enumerate(batch):
+            if waiter is None or waiter.done():
+                continue
+            if index in errors:
+                waiter.set_exception(errors[index])
+            else:
+                waiter.set_result(None)
+
+    async def flush(self) -> None:
+        """Write everything queued so far and wait for in-flight writes."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Stop accepting documents and flush the remaining ones."""
+        self._closed = True
+        await self.flush()
+
+
+session_write_buffer: Optional[WriteBehindBuffer] = None
+if SESSION_WRITE_BUFFER_ENABLED:
+    session_write_buffer = WriteBehindBuffer(
+        COLLECTION_TRAINING_SESSIONS,
+        SESSION_WRITE_BUFFER_MAX_DOCUMENTS,
+        SESSION_WRITE_BUFFER_MAX_DELAY_MS,
+        SESSION_WRITE_ACK,
+        _write_concern(SESSION_WRITE_CONCERN),
+    )
+
+
+async def store_sessions(sessions: List[Dict]) -> List[str]:
+    """
+    Store training sessions, through the write-behind buffer when it is enabled.
+
+    Args:
+        sessions: training_sessions documents
+
+    Returns:
+        The inserted session IDs, in order
+    """
+    if session_write_buffer is not None:
+        inserted_ids = await session_write_buffer.insert_many(sessions)
+    else:
+        db = get_database()
+        if len(sessions) == 1:
+            inserted_ids = [(await db[COLLECTION_TRAINING_SESSIONS].insert_one(sessions[0])).inserted_id]
+        else:
+            result = await db[COLLECTION_TRAINING_SESSIONS].insert_many(sessions, ordered=False)
+            inserted_ids = result.inserted_ids
+    return [str(inserted_id) for inserted_id in inserted_ids]
+
+
+async def flush_session_writes() -> None:
+    """Flush and close the session write buffer (called on shutdown)."""
+    if session_write_buffer is not None:
+        await session_write_buffer.close()
+        logger.info("Flushed buffered training session writes")
@@ -0,0 +1,192 @@
+"""
+Refresh token service for MongoDB.
+
+Refresh tokens are opaque random strings; only their SHA-256 digest is
+stored. Every refresh rotates the token: the presented token is marked as
+used and a new one is issued in the same family (one family per login).
+Presenting an already used token means it was stolen or replayed, so the
+whole family is revoked.
+
+Revoked families are also recorded in a short-lived revocation list that
+access tokens are checked against. The list is cached in memory and reloaded
+at most every REVOCATION_REFRESH_SECONDS, so validating an access token
+normally costs only a signature check.
+"""
+import hashlib
+import logging
+import os
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Set, Tuple
+
+from dotenv import load_dotenv
+from pymongo import ReturnDocument
+
+from app.db.mongodb import get_database, COLLECTION_REFRESH_TOKENS, COLLECTION_REVOKED_SESSIONS
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+# Revocations only need to outlive the access tokens issued for the family
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "30"))
+
+
+class InvalidRefreshTokenError(Exception):
+    """Raised when a refresh token is unknown, expired, revoked or reused."""
+
+
+def _digest(refresh_token: str) -> str:
+    """Return the stored form of a refresh token."""
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
+
+
+class RevocationList:
+    """In-memory copy of the revoked session families."""
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._families: Set[str] = set()
+        self._loaded_at = float("-inf")
+
+    async def refresh(self) -> None:
+        """Reload the revoked families from MongoDB."""
+        # Mark as fresh first so concurrent requests don't all reload at once
+        self._loaded_at = time.monotonic()
+        db = get_database()
+        docs = await db[COLLECTION_REVOKED_SESSIONS].find(
+            {"expires_at": {"$gt": datetime.utcnow()}}, {"_id": 1}
+        ).to_list(length=None)
+        self._families = {doc["_id"] for doc in docs}
+
+    async def is_revoked(self, family_id: str) -> bool:
+        """Check a family, reloading the list if it is older than the refresh interval."""
+        if time.monotonic() - self._loaded_at >= self.refresh_interval:
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Keep serving the last known list rather than failing auth
+                logger.warning("Failed to reload revocation list: %s", e)
+        return family_id in self._families
+
+    def add(self, family_id: str) -> None:
+        """Record a revocation made by this process immediately."""
+        self._families.add(family_id)
+
+
+revocation_list = RevocationList(REVOCATION_REFRESH_SECONDS)
+
+
+class RefreshTokenService:
+    """
+    Service for issuing, rotating and revoking refresh tokens.
+    """
+
+    @staticmethod
+    async def issue(user_id: str, family_id: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Issue a new refresh token.
+
+        Args:
+            user_id: Owner of the token
+            family_id: Session family to continue; a new family is started if omitted
+
+        Returns:
+            Tuple of (refresh token, family ID)
+        """
+        refresh_token = secrets.token_urlsafe(32)
+        family_id = family_id or str(uuid.uuid4())
+        now = datetime.utcnow()
+
+        db = get_database()
+        await db[COLLECTION_REFRESH_TOKENS].insert_one({
+            "_id": _digest(refresh_token),
+            "user_id": user_id,
+            "family_id": family_id,
+            "created_at": now,
+            "expires_at": now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+            "used_at": None,
+            "revoked": False,
+        })
+        return refresh_token, family_id
+
+    @staticmethod
+    async def rotate(refresh_token: str) -> Tuple[str, str, str]:
+        """
+        Consume a refresh token and issue its successor in the same family.
+
+        Args:
+            refresh_token: The token presented by the client
+
+        Returns:
+            Tuple of (user ID, new refresh token, family ID)
+
+        Raises:
+            InvalidRefreshTokenError: If the token cannot be used
+        """
+        db = get_database()
+        now = datetime.utcnow()
+        token_hash = _digest(refresh_token)
+
+        # Atomically claim the token so it can only be rotated once
+        token_doc = await db[COLLECTION_REFRESH_TOKENS].find_one_and_update(
+            {"_id": token_hash, "used_at": None, "revoked": False, "expires_at": {"$gt": now}},
+            {"$set": {"used_at": now}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if token_doc is None:
+            existing = await db[COLLECTION_REFRESH_TOKENS].find_one({"_id": token_hash})
+            if existing is not None and existing.get("used_at") is not None and not existing.get("revoked"):
+                logger.warning("Refresh token reuse detected for user %s; revoking session", existing["user_id"])
+                await RefreshTokenService.revoke_family(existing["family_id"])
+            raise InvalidRefreshTokenError("Invalid refresh token")
+
+        new_token, family_id = await RefreshTokenService.issue(token_doc["user_id"], token_doc["family_id"])
+        return token_doc["user_id"], new_token, family_id
+
+    @staticmethod
+    async def revoke_family(family_id: str) -> None:
+        """
+        Revoke every refresh token of a session and the access tokens issued for it.
+
+        Args:
+            family_id: Session family to revoke
+        """
+        db = get_database()
+        now = datetime.utcnow()
+        await db[COLLECTION_REFRESH_TOKENS].update_many(
+            {"family_id": family_id}, {"$set": {"revoked": True}}
+        )
+        await db[COLLECTION_REVOKED_SESSIONS].update_one(
+            {"_id": family_id},
+            {"$set": {"expires_at": now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)}},
+            upsert=True,
+        )
+        revocation_list.add(family_id)
+
+    @staticmethod
+    async def revoke(refresh_token: str) -> bool:
+        """
+        Revoke the session a refresh token belongs to (logout).
+
+        Args:
+            refresh_token: The token presented by the client
+
+        Returns:
+            True if the token was known, False otherwise
+        """
+        db = get_database()
+        token_doc = await db[COLLECTION_REFRESH_TOKENS].find_one(
+            {"_id": _digest(refresh_token)}, {"family_id": 1}
+        )
+        if token_doc is None:
+            return False
+        await RefreshTokenService.revoke_family(token_doc["family_id"])
+        return True
@@ -0,0 +1,165 @@
+"""
+Local word-embedding index for validating Category Naming answers.
+
+scripts/build_category_embeddings.py precomputes, from the spaCy vectors in
+requirements.txt, a directory containing:
+
+- ``vectors.npy``: unit-length word vectors as a float16 matrix,
+- ``vocab.marisa``: a marisa-trie of the vocabulary,
+- ``rows.npy``: the matrix row of each vocabulary entry (by trie key ID),
+- ``centroids.npy``: one unit-length centroid per category,
+- ``categories.json``: category IDs, banked words and similarity thresholds.
+
+The arrays and the trie are memory-mapped, so all workers share one copy
+and no model is loaded at runtime. A submission is scored with one
+vectorized gather and one matrix-vector product.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+from app.utils.lexicon import normalize_word, word_forms
+
+# Import numpy and marisa_trie only when available to keep validation optional
+try:
+    import numpy as np
+    import marisa_trie
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CATEGORY_EMBEDDINGS_DIR = os.getenv(
+    "CATEGORY_EMBEDDINGS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 "data", "category_embeddings")
+)
+
+
+class CategoryEmbeddingIndex:
+    """Memory-mapped word vectors and category centroids."""
+
+    def __init__(self, vectors, rows, vocab, centroids, categories: Dict[str, Dict]):
+        self._vectors = vectors
+        self._rows = rows
+        self._vocab = vocab
+        self._centroids = centroids
+        self._categories = categories
+        self._category_rows = {category_id: index for index, category_id in enumerate(categories)}
+        self._banked = {
+            category_id: {normalize_word(word): position for position, word in enumerate(info["words"])}
+            for category_id, info in categories.items()
+        }
+
+    @classmethod
+    def load(cls, directory: str) -> "CategoryEmbeddingIndex":
+        """Memory-map an index built by scripts/build_category_embeddings.py."""
+        with open(os.path.join(directory, "categories.json"), "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        vocab = marisa_trie.Trie()
+        vocab.mmap(os.path.join(directory, "vocab.marisa"))
+        return cls(
+            vectors=np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r"),
+            rows=np.load(os.path.join(directory, "rows.npy"), mmap_mode="r"),
+            vocab=vocab,
+            centroids=np.load(os.path.join(directory, "centroids.npy"), mmap_mode="r"),
+            categories=metadata["categories"],
+        )
+
+    def has_category(self, category_id: str) -> bool:
+        """Whether the index has a centroid for the category."""
+        return category_id in self._category_rows
+
+    def threshold(self, category_id: str) -> float:
+        """Minimum cosine similarity to the centroid for an answer to count."""
+        return self._categories[category_id]["threshold"]
+
+    def banked_position(self, category_id: str, word: str) -> Optional[int]:
+        """Position of a word (or its singular) in the category's word bank, if listed."""
+        banked = self._banked[category_id]
+        for form in word_forms(word):
+            if form in banked:
+                return banked[form]
+        return None
+
+    def _vocab_row(self, token: str) -> int:
+        """Matrix row of a token, or -1 if it has no vector."""
+        try:
+            return int(self._rows[self._vocab.key_id(token)])
+        except KeyError:
+            return -1
+
+    def similarities(self, category_id: str, words: List[str]):
+        """
+        Cosine similarity of each word to the category centroid, in one batch.
+
+        Multi-word answers use the mean of their token vectors.
+
+        Args:
+            category_id: Category to compare against
+            words: Answers as entered by the user
+
+        Returns:
+            float32 array of similarities (NaN for words without vectors)
+        """
+        token_rows: List[int] = []
+        owners: List[int] = []
+        for position, word in enumerate(words):
+            for token in normalize_word(word).split():
+                row = self._vocab_row(token)
+                if row >= 0:
+                    token_rows.append(row)
+                    owners.append(position)
+
+        similarities = np.full(len(words), np.nan, dtype=np.float32)
+        if not token_rows:
+            return similarities
+
+        token_vectors = np.asarray(self._vectors[np.asarray(token_rows)], dtype=np.float32)
+        owners_array = np.asarray(owners)
+        sums = np.zeros((len(words), token_vectors.shape[1]), dtype=np.float32)
+        np.add.at(sums, owners_array, token_vectors)
+        norms = np.linalg.norm(sums, axis=1)
+        known = norms > 0
+        centroid = np.asarray(self._centroids[self._category_rows[category_id]], dtype=np.float32)
+        similarities[known] = (sums[known] @ centroid) / norms[known]
+        return similarities
+
+
+_index: Optional[CategoryEmbeddingIndex] = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def get_category_embeddings() -> Optional[CategoryEmbeddingIndex]:
+    """
+    Get the process-wide embedding index, loading it on first use.
+
+    Returns:
+        The index, or None if numpy/marisa-trie are missing or the index has
+        not been built (Category Naming then trusts the client's entries)
+    """
+    global _index, _index_loaded
+    if _index_loaded:
+        return _index
+    with _index_lock:
+        if not _index_loaded:
+            if not EMBEDDINGS_AVAILABLE:
+                logger.warning("numpy or marisa-trie is not installed; Category Naming validation is disabled")
+            elif not os.path.exists(os.path.join(CATEGORY_EMBEDDINGS_DIR, "categories.json")):
+                logger.warning(
+                    "Category embeddings not found in %s; run scripts/build_category_embeddings.py",
+                    CATEGORY_EMBEDDINGS_DIR
+                )
+            else:
+                try:
+                    _index = CategoryEmbeddingIndex.load(CATEGORY_EMBEDDINGS_DIR)
+                    logger.info("Loaded category embeddings from %s", CATEGORY_EMBEDDINGS_DIR)
+                except Exception as e:
+                    logger.error(f"Failed to load category embeddings: {e}")
+            _index_loaded = True
+    return _index
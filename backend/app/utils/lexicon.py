@@ -0,0 +1,168 @@
+"""
+Category lexicon for validating Language Fluency answers.
+
+The lexicon is built offline by scripts/build_category_lexicon.py from the
+game's word banks into a marisa-trie file. Keys are
+``<category>\\x1f<normalized word>``, so a membership test costs O(len(word)).
+The trie is memory-mapped rather than read into memory, so every worker
+process shares the same pages.
+
+Banked words are stored normalized (case, accents, punctuation and
+parenthetical notes removed). Lookups normalize the answer the same way and
+also try its possible singular forms (regular and common irregular plurals),
+so "Wolves", "wolf" and "Knives" match the banked "wolf" and "knife".
+"""
+import logging
+import os
+import re
+import threading
+import unicodedata
+from typing import List, Optional
+
+# Import marisa_trie only when available to keep validation optional
+try:
+    import marisa_trie
+    MARISA_AVAILABLE = True
+except ImportError:
+    MARISA_AVAILABLE = False
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CATEGORY_LEXICON_PATH = os.getenv(
+    "CATEGORY_LEXICON_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 "data", "category_lexicon.marisa")
+)
+
+# Separates the category from the word in trie keys
+KEY_SEPARATOR = "\x1f"
+
+# Irregular plurals folded to their singular form
+IRREGULAR_PLURALS = {
+    "children": "child", "feet": "foot", "geese": "goose", "men": "man",
+    "mice": "mouse", "oxen": "ox", "people": "person", "teeth": "tooth",
+    "women": "woman", "lice": "louse", "dice": "die", "cacti": "cactus",
+    "fungi": "fungus", "nuclei": "nucleus", "radii": "radius", "phenomena": "phenomenon",
+    "criteria": "criterion", "bacteria": "bacterium", "larvae": "larva", "vertebrae": "vertebra",
+}
+
+# Words ending in "s" that are not plurals
+_SINGULAR_S_ENDINGS = ("ss", "us", "is", "os", "as")
+
+_PARENTHETICAL = re.compile(r"\([^)]*\)")
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_category(category: str) -> str:
+    """Normalize a category name ('Musical Instruments' -> 'musical_instruments')."""
+    return _WHITESPACE.sub("_", category.strip().lower())
+
+
+def normalize_word(word: str) -> str:
+    """Lowercase a word, strip accents, parenthetical notes and punctuation."""
+    word = unicodedata.normalize("NFKD", word).encode("ascii", "ignore").decode("ascii")
+    word = _PARENTHETICAL.sub(" ", word.lower())
+    word = _NON_WORD.sub(" ", word.replace("-", " "))
+    return _WHITESPACE.sub(" ", word).strip()
+
+
+def _singular_candidates(token: str) -> List[str]:
+    """Possible singular forms of a token (the token itself first)."""
+    if token in IRREGULAR_PLURALS:
+        return [token, IRREGULAR_PLURALS[token]]
+    if len(token) <= 3 or not token.endswith("s") or token.endswith(_SINGULAR_S_ENDINGS):
+        return [token]
+    candidates = [token, token[:-1]]
+    if token.endswith("ies"):
+        candidates.append(token[:-3] + "y")
+    elif token.endswith("ves"):
+        candidates.extend((token[:-3] + "f", token[:-3] + "fe"))
+    elif token.endswith("es"):
+        candidates.append(token[:-2])
+    return candidates
+
+
+def word_forms(word: str) -> List[str]:
+    """
+    Lookup forms of a word: its normalized form and, for plurals, the
+    possible singulars (of the last token for multi-word terms).
+
+    Args:
+        word: Word as entered by the user
+
+    Returns:
+        Normalized forms to look up, most likely first
+    """
+    normalized = normalize_word(word)
+    head, _, last = normalized.rpartition(" ")
+    prefix = f"{head} " if head else ""
+    return [prefix + candidate for candidate in _singular_candidates(last)]
+
+
+def lexicon_key(category: str, word: str) -> str:
+    """Build the trie key for a normalized word of a category."""
+    return f"{normalize_category(category)}{KEY_SEPARATOR}{word}"
+
+
+class CategoryLexicon:
+    """Read-only view of the memory-mapped category lexicon."""
+
+    def __init__(self, trie):
+        self._trie = trie
+
+    @classmethod
+    def load(cls, path: str) -> "CategoryLexicon":
+        """Memory-map a lexicon built by scripts/build_category_lexicon.py."""
+        trie = marisa_trie.Trie()
+        trie.mmap(path)
+        return cls(trie)
+
+    def __len__(self) -> int:
+        return len(self._trie)
+
+    def covers(self, category: str, letter: str) -> bool:
+        """Whether the lexicon lists any word of `category` starting with `letter`."""
+        return self._trie.has_keys_with_prefix(
+            f"{normalize_category(category)}{KEY_SEPARATOR}{letter.lower()}"
+        )
+
+    def contains(self, category: str, word: str) -> bool:
+        """Whether `word` (or its singular form) is a known member of `category`."""
+        return any(lexicon_key(category, form) in self._trie for form in word_forms(word))
+
+
+_lexicon: Optional[CategoryLexicon] = None
+_lexicon_loaded = False
+_lexicon_lock = threading.Lock()
+
+
+def get_category_lexicon() -> Optional[CategoryLexicon]:
+    """
+    Get the process-wide category lexicon, loading it on first use.
+
+    Returns:
+        The lexicon, or None if marisa-trie is not installed or the lexicon
+        has not been built (answers are then only checked by letter)
+    """
+    global _lexicon, _lexicon_loaded
+    if _lexicon_loaded:
+        return _lexicon
+    with _lexicon_lock:
+        if not _lexicon_loaded:
+            if not MARISA_AVAILABLE:
+                logger.warning("marisa-trie is not installed; category validation is disabled")
+            elif not os.path.exists(CATEGORY_LEXICON_PATH):
+                logger.warning(
+                    "Category lexicon not found at %s; run scripts/build_category_lexicon.py",
+                    CATEGORY_LEXICON_PATH
+                )
+            else:
+                try:
+                    _lexicon = CategoryLexicon.load(CATEGORY_LEXICON_PATH)
+                    logger.info("Loaded category lexicon with %d entries", len(_lexicon))
+                except Exception as e:
+                    logger.error(f"Failed to load category lexicon: {e}")
+            _lexicon_loaded = True
+    return _lexicon
@@ -0,0 +1,188 @@
+"""
+Structured, non-blocking logging configuration.
+
+Log records are pushed onto an in-memory queue by a lock-free handler and
+formatted/written by a background listener thread, so request handlers never
+wait on I/O or on a handler lock. Records are emitted as JSON lines (or plain
+text with LOG_FORMAT=text), and high-volume loggers can be sampled per logger.
+
+Configuration (environment variables):
+    LOG_LEVEL: Root log level (default INFO)
+    LOG_FORMAT: 'json' (default) or 'text'
+    LOG_SAMPLING: Comma-separated 'logger=rate' pairs, e.g.
+        'app.utils.security=0.1,app.routes.ai=0.5'. Records below WARNING from
+        those loggers (and their children) are kept with the given probability.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+# Sampling applied when LOG_SAMPLING is not set: authentication failures can
+# arrive in bursts (expired tokens, scanners) and are only useful in aggregate
+DEFAULT_SAMPLE_RATES: Dict[str, float] = {
+    "app.utils.security": 0.1,
+}
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None)).keys()
+) | {"message", "asctime", "taskName"}
+
+# Active queue listener, set by configure_logging()
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of sub-WARNING records from configured loggers."""
+
+    def __init__(self, sample_rates: Dict[str, float]):
+        super().__init__()
+        self._sample_rates = sample_rates
+        self._resolved: Dict[str, float] = {}
+
+    def _rate_for(self, logger_name: str) -> float:
+        rate = self._resolved.get(logger_name)
+        if rate is None:
+            # Longest configured prefix wins (e.g. 'app.routes' applies to 'app.routes.ai')
+            rate = 1.0
+            best = -1
+            for prefix, prefix_rate in self._sample_rates.items():
+                if (logger_name == prefix or logger_name.startswith(prefix + ".")) and len(prefix) > best:
+                    rate, best = prefix_rate, len(prefix)
+            self._resolved[logger_name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that neither formats nor locks in the calling thread.
+
+    The queue is thread-safe, so the per-handler lock taken by Handler.handle
+    is unnecessary. Message formatting is deferred to the listener thread.
+    """
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return bool(rv)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records stay in-process, so message args are formatted by the listener
+        return record
+
+
+def parse_sample_rates(spec: Optional[str]) -> Dict[str, float]:
+    """
+    Parse a LOG_SAMPLING specification.
+
+    Args:
+        spec: Comma-separated 'logger=rate' pairs
+
+    Returns:
+        Mapping of logger name to sample rate (0-1)
+    """
+    if spec is None:
+        return dict(DEFAULT_SAMPLE_RATES)
+    rates = {}
+    for item in spec.split(","):
+        name, sep, value = item.partition("=")
+        if not sep:
+            continue
+        try:
+            rates[name.strip()] = max(0.0, min(1.0, float(value)))
+        except ValueError:
+            continue
+    return rates
+
+
+def configure_logging() -> QueueListener:
+    """
+    Install the queue-based handler on the root logger.
+
+    Returns:
+        The started QueueListener
+    """
+    global _listener
+
+    if _listener is not None:
+        return _listener
+
+    if os.getenv("LOG_FORMAT", "json").lower() == "text":
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    else:
+        formatter = JsonFormatter()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(parse_sample_rates(os.getenv("LOG_SAMPLING"))))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper()))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and stop the listener thread.
+
+    The root logger then writes through the listener's handlers directly, so
+    records logged after shutdown are not left on a queue nobody reads.
+    """
+    global _listener
+
+    if _listener is None:
+        return
+
+    root = logging.getLogger()
+    for queue_handler in [h for h in root.handlers if isinstance(h, NonBlockingQueueHandler)]:
+        root.removeHandler(queue_handler)
+        for handler in _listener.handlers:
+            for record_filter in queue_handler.filters:
+                handler.addFilter(record_filter)
+            root.addHandler(handler)
+    _listener.stop()
+    _listener = None
@@ -0,0 +1,359 @@
+"""
+Prometheus metrics for the API, AI model calls, MongoDB commands and the
+MongoDB connection pool.
+
+Metrics are exposed at ``/metrics`` in the Prometheus text format. When
+``prometheus_client`` is not installed every recorder becomes a no-op so the
+application keeps working without the monitoring stack.
+"""
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+# Import prometheus_client only when available to keep it an optional dependency
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Histogram buckets (seconds) tuned for each kind of operation
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+AI_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+WRITE_BATCH_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Commands issued by the driver itself (handshake/auth/session cleanup)
+IGNORED_MONGO_COMMANDS = frozenset({
+    "hello", "ismaster", "isMaster", "saslStart", "saslContinue",
+    "authenticate", "getnonce", "endSessions", "buildInfo"
+})
+
+
+class _NoopMetric:
+    """Stand-in used when prometheus_client is not installed."""
+
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+if PROMETHEUS_AVAILABLE:
+    HTTP_REQUEST_DURATION = Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template",
+        ["method", "route", "status"],
+        buckets=HTTP_BUCKETS,
+    )
+    HTTP_REQUESTS_IN_PROGRESS = Gauge(
+        "http_requests_in_progress",
+        "HTTP requests currently being processed",
+        ["method", "route"],
+        multiprocess_mode="livesum",
+    )
+    AI_REQUEST_DURATION = Histogram(
+        "ai_request_duration_seconds",
+        "Latency of AI model calls",
+        ["model", "operation"],
+        buckets=AI_BUCKETS,
+    )
+    AI_REQUEST_ERRORS = Counter(
+        "ai_request_errors_total",
+        "AI model calls that returned an error",
+        ["model", "operation"],
+    )
+    AI_TOKENS = Counter(
+        "ai_tokens_total",
+        "Tokens consumed by AI model calls",
+        ["model", "kind"],
+    )
+    WHISPER_AUDIO_SECONDS = Counter(
+        "whisper_audio_seconds_total",
+        "Seconds of audio sent to Whisper for transcription",
+        ["model"],
+    )
+    MONGO_COMMAND_DURATION = Histogram(
+        "mongodb_command_duration_seconds",
+        "MongoDB command latency by collection and operation",
+        ["collection", "command"],
+        buckets=MONGO_BUCKETS,
+    )
+    MONGO_COMMAND_ERRORS = Counter(
+        "mongodb_command_errors_total",
+        "MongoDB commands that failed",
+        ["collection", "command"],
+    )
+    MONGO_POOL_CONNECTIONS = Gauge(
+        "mongodb_pool_connections",
+        "Open connections in the MongoDB connection pool",
+        ["address"],
+        multiprocess_mode="livesum",
+    )
+    MONGO_POOL_CHECKED_OUT = Gauge(
+        "mongodb_pool_checked_out_connections",
+        "MongoDB connections currently checked out by the application",
+        ["address"],
+        multiprocess_mode="livesum",
+    )
+    MONGO_POOL_CHECKOUT_WAIT = Histogram(
+        "mongodb_pool_checkout_wait_seconds",
+        "Time spent waiting to check out a MongoDB connection",
+        ["address"],
+        buckets=POOL_WAIT_BUCKETS,
+    )
+    MONGO_POOL_CHECKOUT_FAILURES = Counter(
+        "mongodb_pool_checkout_failures_total",
+        "MongoDB connection checkouts that failed",
+        ["address", "reason"],
+    )
+    WRITE_BUFFER_BATCH_SIZE = Histogram(
+        "mongodb_write_buffer_batch_size",
+        "Documents written per write-behind buffer flush",
+        ["collection"],
+        buckets=WRITE_BATCH_BUCKETS,
+    )
+    WRITE_BUFFER_FAILURES = Counter(
+        "mongodb_write_buffer_failed_documents_total",
+        "Buffered documents that could not be written",
+        ["collection"],
+    )
+else:
+    HTTP_REQUEST_DURATION = _NoopMetric()
+    HTTP_REQUESTS_IN_PROGRESS = _NoopMetric()
+    AI_REQUEST_DURATION = _NoopMetric()
+    AI_REQUEST_ERRORS = _NoopMetric()
+    AI_TOKENS = _NoopMetric()
+    WHISPER_AUDIO_SECONDS = _NoopMetric()
+    MONGO_COMMAND_DURATION = _NoopMetric()
+    MONGO_COMMAND_ERRORS = _NoopMetric()
+    MONGO_POOL_CONNECTIONS = _NoopMetric()
+    MONGO_POOL_CHECKED_OUT = _NoopMetric()
+    MONGO_POOL_CHECKOUT_WAIT = _NoopMetric()
+    MONGO_POOL_CHECKOUT_FAILURES = _NoopMetric()
+    WRITE_BUFFER_BATCH_SIZE = _NoopMetric()
+    WRITE_BUFFER_FAILURES = _NoopMetric()
+
+
+def observe_ai_call(model: str, operation: str, duration: float, success: bool) -> None:
+    """
+    Record the latency and outcome of an AI model call.
+
+    Args:
+        model: Model label (e.g. 'gpt4o', 'whisper-1')
+        operation: Operation label (e.g. 'analyze_text', 'process_audio')
+        duration: Call duration in seconds
+        success: Whether the call succeeded
+    """
+    AI_REQUEST_DURATION.labels(model, operation).observe(duration)
+    if not success:
+        AI_REQUEST_ERRORS.labels(model, operation).inc()
+
+
+def record_ai_tokens(model: str, usage: Optional[Dict[str, Any]]) -> None:
+    """
+    Record token usage reported by the OpenAI API.
+
+    Args:
+        model: Model label
+        usage: Usage dictionary with prompt_tokens/completion_tokens
+    """
+    if not usage:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        count = usage.get(kind)
+        if count:
+            AI_TOKENS.labels(model, kind.replace("_tokens", "")).inc(count)
+
+
+def record_audio_seconds(model: str, seconds: Optional[float]) -> None:
+    """Record seconds of audio processed by Whisper."""
+    if seconds:
+        WHISPER_AUDIO_SECONDS.labels(model).inc(seconds)
+
+
+def observe_write_buffer_flush(collection: str, size: int, failed: int = 0) -> None:
+    """Record the size of a write-behind buffer flush and its failed documents."""
+    WRITE_BUFFER_BATCH_SIZE.labels(collection).observe(size)
+    if failed:
+        WRITE_BUFFER_FAILURES.labels(collection).inc(failed)
+
+
+def _route_template(scope: Dict[str, Any]) -> str:
+    """Resolve the route template for a request to keep label cardinality bounded."""
+    # Imported here so the module has no hard dependency on starlette
+    from starlette.routing import Match
+
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    for route in getattr(router, "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope.get("path", ""))
+    return "unmatched"
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording per-route latency and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+            in_progress.dec()
+
+
+class MongoCommandMetricsListener(monitoring.CommandListener):
+    """pymongo command listener recording latency per collection and command."""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[Any, int], Tuple[str, str]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        command_name = event.command_name
+        if command_name in IGNORED_MONGO_COMMANDS:
+            return
+        # getMore stores the collection under "collection", other commands under their own name
+        field = "collection" if command_name == "getMore" else command_name
+        collection = event.command.get(field)
+        if not isinstance(collection, str):
+            collection = "none"
+        self._pending[(event.connection_id, event.request_id)] = (collection, command_name)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        labels = self._pending.pop((event.connection_id, event.request_id), None)
+        if labels is not None:
+            MONGO_COMMAND_DURATION.labels(*labels).observe(event.duration_micros / 1_000_000)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        labels = self._pending.pop((event.connection_id, event.request_id), None)
+        if labels is not None:
+            MONGO_COMMAND_DURATION.labels(*labels).observe(event.duration_micros / 1_000_000)
+            MONGO_COMMAND_ERRORS.labels(*labels).inc()
+
+
+def _address_label(address: Tuple[str, Optional[int]]) -> str:
+    """Format a (host, port) server address as a metric label."""
+    host, port = address
+    return f"{host}:{port}" if port is not None else host
+
+
+class MongoPoolMetricsListener(monitoring.ConnectionPoolListener):
+    """pymongo pool listener tracking open/checked-out connections and checkout waits."""
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        MONGO_POOL_CONNECTIONS.labels(_address_label(event.address)).inc()
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        MONGO_POOL_CONNECTIONS.labels(_address_label(event.address)).dec()
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        pass
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        address = _address_label(event.address)
+        MONGO_POOL_CHECKOUT_FAILURES.labels(address, str(event.reason)).inc()
+        # "duration" is only reported by pymongo >= 4.7
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            MONGO_POOL_CHECKOUT_WAIT.labels(address).observe(duration)
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        address = _address_label(event.address)
+        MONGO_POOL_CHECKED_OUT.labels(address).inc()
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            MONGO_POOL_CHECKOUT_WAIT.labels(address).observe(duration)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        MONGO_POOL_CHECKED_OUT.labels(_address_label(event.address)).dec()
+
+
+def mongo_event_listeners() -> List[Any]:
+    """Return the pymongo event listeners to register on the Motor client."""
+    if not PROMETHEUS_AVAILABLE:
+        return []
+    return [MongoCommandMetricsListener(), MongoPoolMetricsListener()]
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    Aggregates across worker processes when PROMETHEUS_MULTIPROC_DIR is set.
+
+    Returns:
+        Tuple of (payload, content type)
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return b"", CONTENT_TYPE_LATEST
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,132 @@
+"""
+Password hashing on a bounded process pool.
+
+bcrypt is deliberately CPU-expensive (hundreds of milliseconds per hash at
+the default cost), so hashing and verification run in worker processes
+instead of on the event loop. At most PASSWORD_HASH_MAX_PENDING operations
+may be queued; beyond that callers get PasswordHashingBusyError and should
+answer 503 so a login burst cannot build an unbounded backlog.
+
+This module is imported by the worker processes, so it must stay free of
+application imports (database, settings, ...).
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# bcrypt cost factor; hashes with a different cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Worker processes and the maximum number of queued/running operations
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 8)))
+
+# Password context for hashing; min/max rounds make needs_update() flag any cost change
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# Process pool, created on first use
+_executor: Optional[ProcessPoolExecutor] = None
+_pending = 0
+
+
+class PasswordHashingBusyError(RuntimeError):
+    """Raised when too many password operations are already queued."""
+
+
+def _hash(password: str) -> str:
+    """Hash a password (runs in a worker process)."""
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and rehash it if needed (runs in a worker process)."""
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the process pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        # spawn avoids forking the event loop, driver and logging threads
+        _executor = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info("Started password hashing pool with %d workers", PASSWORD_HASH_WORKERS)
+    return _executor
+
+
+async def _run(func, *args):
+    """Run `func` on the pool, rejecting the call when the queue is full."""
+    global _pending
+    if _pending >= PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHashingBusyError("Password hashing queue is full")
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hash a password off the event loop.
+
+    Args:
+        password: Plain-text password
+
+    Returns:
+        bcrypt hash
+
+    Raises:
+        PasswordHashingBusyError: If the hashing queue is full
+    """
+    return await _run(_hash, password)
+
+
+async def verify_password_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password off the event loop.
+
+    Args:
+        password: Plain-text password
+        hashed_password: Stored hash
+
+    Returns:
+        Tuple of (valid, new_hash); new_hash is set when the stored hash uses
+        outdated parameters and should be replaced
+
+    Raises:
+        PasswordHashingBusyError: If the hashing queue is full
+    """
+    return await _run(_verify_and_update, password, hashed_password)
+
+
+def warm_password_pool() -> None:
+    """Start the worker processes ahead of the first login."""
+    executor = _get_executor()
+    for _ in range(PASSWORD_HASH_WORKERS):
+        executor.submit(int)
+
+
+def shutdown_password_pool() -> None:
+    """Stop the worker processes."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
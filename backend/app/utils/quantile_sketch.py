@@ -0,0 +1,145 @@
+"""
+KLL streaming quantile sketch.
+
+A KLL sketch (Karnin, Lang and Liberty, 2016) summarizes a stream of
+numbers in a stack of compactors. Level h holds items that each stand for
+2^h stream items. When a level is full, it is sorted and every other item
+is promoted to the next level, starting at a random offset. With the default
+k=200 the rank error is about 1%, and a sketch of millions of scores holds
+only a few hundred items. Sketches built in different processes can be
+merged, which is how per-process updates are combined in the database.
+"""
+import bisect
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+# Default accuracy parameter (number of items kept at the top level)
+DEFAULT_K = 200
+
+# Capacity shrinks by this factor per level below the top
+CAPACITY_DECAY = 2 / 3
+
+_random = random.Random()
+
+
+class KLLSketch:
+    """Mergeable streaming quantile sketch of float values."""
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.k = k
+        self.n = 0
+        self.compactors: List[List[float]] = [[]]
+        self._max_size = self._capacity(0)
+
+    def __len__(self) -> int:
+        """Number of values the sketch summarizes."""
+        return self.n
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * CAPACITY_DECAY ** depth)) + 1
+
+    def _grow(self) -> None:
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def _size(self) -> int:
+        return sum(len(compactor) for compactor in self.compactors)
+
+    def _compress(self) -> None:
+        """Compact full levels until the sketch fits its size budget."""
+        while self._size() >= self._max_size:
+            for level, compactor in enumerate(self.compactors):
+                if len(compactor) >= self._capacity(level):
+                    if level + 1 >= len(self.compactors):
+                        self._grow()
+                    compactor.sort()
+                    # An odd item out stays at this level
+                    keep = [compactor.pop()] if len(compactor) % 2 else []
+                    self.compactors[level + 1].extend(compactor[_random.getrandbits(1)::2])
+                    self.compactors[level] = keep
+                    break
+            else:
+                return
+
+    def update(self, value: float) -> None:
+        """Add a value to the sketch."""
+        self.compactors[0].append(float(value))
+        self.n += 1
+        if len(self.compactors[0]) >= self._capacity(0):
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Add every value summarized by another sketch."""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.n += other.n
+        self._compress()
+
+    def weighted_items(self) -> Tuple[List[float], List[int]]:
+        """Sorted retained values and the cumulative weight up to each of them."""
+        items = sorted(
+            (value, 1 << level)
+            for level, compactor in enumerate(self.compactors)
+            for value in compactor
+        )
+        cumulative = []
+        total = 0
+        for _, weight in items:
+            total += weight
+            cumulative.append(total)
+        return [value for value, _ in items], cumulative
+
+    def cdf_table(self, low: float, high: float, steps: int) -> List[Optional[float]]:
+        """
+        Percentile rank (0-100) of evenly spaced values from `low` to `high`.
+
+        The rank of a value counts half of the items equal to it, so a score
+        shared by everyone is at the 50th percentile.
+
+        Args:
+            low: First value of the table
+            high: Last value of the table
+            steps: Number of intervals between `low` and `high`
+
+        Returns:
+            steps + 1 percentile ranks, or all None for an empty sketch
+        """
+        values, cumulative = self.weighted_items()
+        if not values:
+            return [None] * (steps + 1)
+        total = cumulative[-1]
+        table = []
+        for step in range(steps + 1):
+            point = low + (high - low) * step / steps
+            below = bisect.bisect_left(values, point)
+            at_or_below = bisect.bisect_right(values, point)
+            weight_below = cumulative[below - 1] if below else 0
+            weight_at_or_below = cumulative[at_or_below - 1] if at_or_below else 0
+            table.append(100.0 * (weight_below + weight_at_or_below) / (2 * total))
+        return table
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile q (0-1), or None for an empty sketch."""
+        values, cumulative = self.weighted_items()
+        if not values:
+            return None
+        target = q * cumulative[-1]
+        return values[min(len(values) - 1, bisect.bisect_left(cumulative, target))]
+
+    def to_dict(self) -> Dict:
+        """Serializable form for storage."""
+        return {"k": self.k, "n": self.n, "compactors": [list(compactor) for compactor in self.compactors]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KLLSketch":
+        """Rebuild a sketch stored with to_dict."""
+        sketch = cls(data.get("k", DEFAULT_K))
+        sketch.compactors = [list(compactor) for compactor in data.get("compactors") or [[]]]
+        sketch.n = data.get("n", 0)
+        sketch._max_size = sum(sketch._capacity(level) for level in range(len(sketch.compactors)))
+        sketch._compress()
+        return sketch
@@ -0,0 +1,146 @@
+"""
+Compact storage and vectorized analysis of per-item response times.
+
+Response times are stored on training sessions as packed little-endian
+float32 BSON binary (4 bytes per item, instead of 9+ bytes per element of
+a BSON array of doubles plus its index key). Missing or invalid items are
+stored as NaN, so positions still line up with the exercise's items.
+
+Analytics concatenate every session's buffer into one array and compute
+per-session statistics on a NaN-padded matrix, so the work stays in NumPy
+regardless of how many sessions a user has.
+"""
+import array
+import math
+import sys
+import warnings
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from bson import Binary
+
+# Import numpy only when available to keep analytics optional
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Most response times accepted per session
+MAX_RESPONSE_TIMES = 1000
+
+# Session medians needed before a slowing trend is reported
+MIN_TREND_SESSIONS = 3
+
+SECONDS_PER_DAY = 86400
+
+
+def pack_response_times(values: Optional[Sequence[float]]) -> Optional[Binary]:
+    """
+    Pack response times (milliseconds) as little-endian float32 binary.
+
+    Args:
+        values: Response times; non-positive or non-finite values become NaN
+
+    Returns:
+        The packed times, or None if there are none
+    """
+    if not values:
+        return None
+    packed = array.array("f", (
+        value if value is not None and math.isfinite(value) and value > 0 else math.nan
+        for value in values[:MAX_RESPONSE_TIMES]
+    ))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return Binary(packed.tobytes())
+
+
+def unpack_response_times(data: Optional[bytes]) -> List[float]:
+    """Unpack response times packed by pack_response_times (NaN for missing items)."""
+    if not data:
+        return []
+    unpacked = array.array("f")
+    unpacked.frombytes(bytes(data))
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked.tolist()
+
+
+def _finite_or_none(value) -> Optional[float]:
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def response_time_statistics(buffers: Sequence[bytes], timestamps: Sequence[datetime]) -> Dict:
+    """
+    Summarize response times across sessions.
+
+    Args:
+        buffers: Packed response times of each session
+        timestamps: When each session was completed (same order)
+
+    Returns:
+        Dict with sessions and responses (counts), median_ms and iqr_ms over
+        all responses, mean_icv (mean per-session coefficient of variation,
+        i.e. intra-individual variability), between_session_cv (variation
+        of session medians) and slowing_ms_per_month (least-squares trend of
+        session medians; positive means slower). Statistics are None when
+        there is not enough data.
+    """
+    summary = {
+        "sessions": 0,
+        "responses": 0,
+        "median_ms": None,
+        "iqr_ms": None,
+        "mean_icv": None,
+        "between_session_cv": None,
+        "slowing_ms_per_month": None,
+    }
+    if not buffers:
+        return summary
+
+    lengths = np.fromiter((len(buffer) // 4 for buffer in buffers), dtype=np.int64, count=len(buffers))
+    values = np.frombuffer(b"".join(bytes(buffer) for buffer in buffers), dtype="<f4").astype(np.float64)
+    seconds = np.fromiter((timestamp.timestamp() for timestamp in timestamps), dtype=np.float64, count=len(timestamps))
+
+    # One row per session, padded with NaN
+    matrix = np.full((len(buffers), max(1, int(lengths.max()))), np.nan)
+    matrix[np.arange(matrix.shape[1]) < lengths[:, None]] = values
+    counts = np.count_nonzero(~np.isnan(matrix), axis=1)
+    rated = counts > 0
+    matrix, counts, seconds = matrix[rated], counts[rated], seconds[rated]
+    if not len(counts):
+        return summary
+
+    valid = values[~np.isnan(values)]
+    q25, median, q75 = np.percentile(valid, [25, 50, 75])
+    summary.update({
+        "sessions": int(len(counts)),
+        "responses": int(counts.sum()),
+        "median_ms": float(median),
+        "iqr_ms": float(q75 - q25),
+    })
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        session_medians = np.nanmedian(matrix, axis=1)
+        session_means = np.nanmean(matrix, axis=1)
+        session_sds = np.nanstd(matrix, axis=1)
+
+    # Coefficient of variation needs at least two responses in a session
+    varied = counts > 1
+    if varied.any():
+        summary["mean_icv"] = _finite_or_none(np.mean(session_sds[varied] / session_means[varied]))
+    if len(session_medians) > 1:
+        summary["between_session_cv"] = _finite_or_none(np.std(session_medians) / np.mean(session_medians))
+
+    if len(session_medians) >= MIN_TREND_SESSIONS:
+        days = (seconds - seconds.min()) / SECONDS_PER_DAY
+        spread = days - days.mean()
+        variance = np.dot(spread, spread)
+        if variance > 0:
+            slope = np.dot(spread, session_medians - session_medians.mean()) / variance
+            summary["slowing_ms_per_month"] = _finite_or_none(slope * 30)
+
+    return summary
@@ -1,6 +1,7 @@
 """
 Security utilities for JWT authentication and password handling.
 """
+import logging
 import os
 from datetime import datetime, timedelta
 from typing import Optional, Union, Dict, Any
@@ -8,16 +9,21 @@ from typing import Optional, Union, Dict, Any
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import ValidationError
 from dotenv import load_dotenv
 
-from app.models.user import UserInDB
+from app.models.user import UserInDB, AuthenticatedUser
 from app.db import connect_to_mongodb, get_database, COLLECTION_USERS
+from app.utils.cache import TTLCache
+from app.utils.passwords import pwd_context, verify_password_and_update
+from app.services.token_service import revocation_list
 
 # Load environment variables
 load_dotenv()
 
+# Initialize logger (auth failures are sampled, see app/utils/logging_config.py)
+logger = logging.getLogger(__name__)
+
 # JWT configuration
 SECRET_KEY = os.getenv("JWT_SECRET")
 if not SECRET_KEY:
@@ -26,20 +32,42 @@ if not SECRET_KEY:
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
+# Short-lived cache of users loaded for authentication, keyed by user ID
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+_user_cache: TTLCache[UserInDB] = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
 # OAuth2 scheme for token validation
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-# Password context for hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify if the provided password matches the hashed password."""
+    """Verify if the provided password matches the hashed password (blocking)."""
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Generate a hash for the provided password."""
+    """Generate a hash for the provided password (blocking, use hash_password in handlers)."""
     return pwd_context.hash(password)
 
+def user_token_claims(user: UserInDB, family_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the access token claims for a user.
+
+    Besides the subject, the token carries the active flag and roles so that
+    most routes can authorize the caller without loading the user, and the
+    refresh token family ('fam') so that logging out revokes it.
+
+    Args:
+        user: The authenticated user
+        family_id: Session family of the accompanying refresh token
+
+    Returns:
+        Claims to pass to create_access_token
+    """
+    claims = {"sub": user.id, "act": user.is_active, "roles": list(user.roles)}
+    if family_id:
+        claims["fam"] = family_id
+    return claims
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token with the provided data and expiration.
@@ -79,41 +107,105 @@ async def get_user_by_email(email: str) -> Optional[UserInDB]:
     user_data = await db[COLLECTION_USERS].find_one({"email": email})
     
     if user_data:
-        return UserInDB(**user_data)
+        return _user_from_document(user_data)
     return None
 
+def _user_from_document(user_data: Dict[str, Any]) -> UserInDB:
+    """Build a UserInDB, using _id as the ID for users stored without an 'id' field."""
+    if "id" not in user_data and "_id" in user_data:
+        user_data = {**user_data, "id": str(user_data["_id"])}
+    return UserInDB(**user_data)
+
+async def get_user_by_id(user_id: str) -> Optional[UserInDB]:
+    """
+    Get a user by ID, served from the in-process cache when possible.
+    
+    Args:
+        user_id: The user's ID ('id' field, or '_id' for legacy users)
+        
+    Returns:
+        The user if found, otherwise None
+    """
+    user = _user_cache.get(user_id)
+    if user is not None:
+        return user
+    
+    db = get_database()
+    user_data = await db[COLLECTION_USERS].find_one({"id": user_id})
+    
+    if user_data is None:
+        # Try with _id field if id field doesn't work
+        user_data = await db[COLLECTION_USERS].find_one({"_id": user_id})
+    
+    if user_data is None:
+        return None
+    
+    user = _user_from_document(user_data)
+    _user_cache.set(user_id, user)
+    return user
+
+def invalidate_user_cache(user_id: str) -> None:
+    """
+    Drop a user from the authentication cache.
+    
+    Must be called after every write to a user document so the next request
+    sees the change instead of a cached copy.
+    
+    Args:
+        user_id: The ID of the updated user
+    """
+    _user_cache.invalidate(user_id)
+
 async def authenticate_user(email: str, password: str) -> Optional[UserInDB]:
     """
     Authenticate a user with email and password.
     
+    Verification runs on the password hashing pool. If the stored hash was
+    created with different bcrypt parameters it is transparently replaced.
+    
     Args:
         email: The user's email
         password: The user's password
         
     Returns:
         The authenticated user if credentials are valid, otherwise None
+        
+    Raises:
+        PasswordHashingBusyError: If the password hashing queue is full
     """
     user = await get_user_by_email(email)
     
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    
+    valid, new_hash = await verify_password_and_update(password, user.hashed_password)
+    if not valid:
         return None
     
+    if new_hash:
+        db = get_database()
+        await db[COLLECTION_USERS].update_one(
+            {"$or": [{"id": user.id}, {"_id": user.id}]},
+            {"$set": {"hashed_password": new_hash}}
+        )
+        invalidate_user_cache(user.id)
+        user.hashed_password = new_hash
+        logger.info("Rehashed password for user %s with updated parameters", user.id)
+    
     return user
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserInDB:
+def _decode_token(token: str) -> Dict[str, Any]:
     """
-    Get the current user from a JWT token.
+    Decode and validate a JWT access token.
     
     Args:
         token: The JWT token from the request
         
     Returns:
-        The current user
+        The token payload (always containing 'sub')
         
     Raises:
-        HTTPException: If the token is invalid or the user is not found
+        HTTPException: If the token is invalid
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -128,32 +220,117 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserInDB:
         
         if user_id is None:
             raise credentials_exception
+    except HTTPException:
+        raise
     except JWTError as e:
         # Log the specific error
-        print(f"JWT Error: {str(e)}")
+        logger.info("JWT error: %s", e)
         raise credentials_exception
     except ValidationError as e:
         # Log validation errors
-        print(f"Validation Error: {str(e)}")
+        logger.info("Token validation error: %s", e)
         raise credentials_exception
     except Exception as e:
         # Log unexpected errors
-        print(f"Unexpected error in token validation: {str(e)}")
+        logger.warning("Unexpected error in token validation: %s", e)
         raise credentials_exception
     
-    # Get the user from the database
-    db = get_database()
-    user_data = await db[COLLECTION_USERS].find_one({"id": user_id})
+    return payload
+
+async def _authenticate_token(token: str) -> Dict[str, Any]:
+    """
+    Decode a JWT access token and reject it if its session was revoked.
     
-    if user_data is None:
-        # Try with _id field if id field doesn't work
-        user_data = await db[COLLECTION_USERS].find_one({"_id": user_id})
+    Args:
+        token: The JWT token from the request
         
-    if user_data is None:
-        print(f"User with ID {user_id} not found in database")
-        raise credentials_exception
+    Returns:
+        The token payload
+        
+    Raises:
+        HTTPException: If the token is invalid or revoked
+    """
+    payload = _decode_token(token)
+    family_id = payload.get("fam")
+    if family_id and await revocation_list.is_revoked(family_id):
+        logger.info("Rejected access token for revoked session %s", family_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserInDB:
+    """
+    Get the current user from a JWT token.
     
-    return UserInDB(**user_data)
+    Args:
+        token: The JWT token from the request
+        
+    Returns:
+        The current user
+        
+    Raises:
+        HTTPException: If the token is invalid or the user is not found
+    """
+    payload = await _authenticate_token(token)
+    user_id = payload["sub"]
+    
+    user = await get_user_by_id(user_id)
+    if user is None:
+        logger.info("User with ID %s not found in database", user_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return user
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> AuthenticatedUser:
+    """
+    Get the caller's identity from JWT claims without a database lookup.
+    
+    Tokens issued before the 'act'/'roles' claims were added fall back to
+    loading the (cached) user. Role or status changes take effect for
+    claim-carrying tokens when they are reissued.
+    
+    Args:
+        token: The JWT token from the request
+        
+    Returns:
+        The authenticated caller
+        
+    Raises:
+        HTTPException: If the token is invalid, the user is not found or inactive
+    """
+    payload = await _authenticate_token(token)
+    
+    if "act" in payload:
+        principal = AuthenticatedUser(
+            id=payload["sub"],
+            is_active=bool(payload["act"]),
+            roles=payload.get("roles") or [],
+        )
+    else:
+        user = await get_user_by_id(payload["sub"])
+        if user is None:
+            logger.info("User with ID %s not found in database", payload["sub"])
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        principal = AuthenticatedUser(id=user.id, is_active=user.is_active, roles=user.roles)
+    
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+    
+    return principal
 
 async def get_current_active_user(current_user: UserInDB = Depends(get_current_user)) -> UserInDB:
     """
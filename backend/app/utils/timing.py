@@ -0,0 +1,68 @@
+"""
+Lightweight per-request stage timing.
+
+A StageTimer records how long each named stage of a request takes (upload,
+preprocessing, transcription, analysis, database insert, ...) so that slow
+requests can be attributed to a stage without external tracing.
+"""
+import time
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator, Optional
+
+from app.utils.tracing import span
+
+
+class StageTimer:
+    """Records the duration of named processing stages for a single request."""
+
+    def __init__(self):
+        """Start the timer; the total time is measured from construction."""
+        self._started = time.perf_counter()
+        self._stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a block of code as the named stage.
+
+        Repeated stages with the same name are accumulated. Each stage is also
+        a trace span when tracing is enabled.
+
+        Args:
+            name: Stage name (e.g. 'upload', 'transcription')
+        """
+        start = time.perf_counter()
+        try:
+            with span(f"stage.{name}"):
+                yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add an externally measured duration (in seconds) to a stage."""
+        self._stages[name] = self._stages.get(name, 0.0) + seconds
+
+    @property
+    def total(self) -> float:
+        """Seconds elapsed since the timer was created."""
+        return time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return stage durations in seconds, rounded for JSON responses."""
+        return {name: round(seconds, 4) for name, seconds in self._stages.items()}
+
+
+def timed_stage(timer: Optional[StageTimer], name: str) -> ContextManager[None]:
+    """
+    Time a stage when a timer is provided, otherwise do nothing.
+
+    Args:
+        timer: Optional StageTimer threaded through from the request
+        name: Stage name
+
+    Returns:
+        Context manager timing the enclosed block
+    """
+    if timer is None:
+        return nullcontext()
+    return timer.stage(name)
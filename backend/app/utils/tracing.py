@@ -0,0 +1,148 @@
+"""
+Optional OpenTelemetry tracing.
+
+Tracing is disabled unless OTEL_TRACING_ENABLED=true. When enabled, spans
+cover every HTTP request, every MongoDB command, every request made by the
+shared OpenAI client and the ffmpeg/pydub work done while preprocessing audio.
+
+Spans are exported either to an OTLP/HTTP collector (OTEL_TRACES_EXPORTER=otlp,
+endpoint taken from OTEL_EXPORTER_OTLP_ENDPOINT, default http://localhost:4318)
+or appended as JSON lines to a file (OTEL_TRACES_EXPORTER=file, path taken
+from OTEL_TRACES_FILE).
+"""
+import logging
+import os
+from contextlib import nullcontext
+from typing import Any, ContextManager, Optional
+
+# Import OpenTelemetry only when available to keep it an optional dependency
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Active tracer provider, set by setup_tracing()
+_tracer_provider = None
+_traces_file = None
+
+
+def tracing_enabled() -> bool:
+    """Return True when tracing has been set up successfully."""
+    return _tracer_provider is not None
+
+
+def _create_exporter(exporter_name: str):
+    """Create the span exporter selected by OTEL_TRACES_EXPORTER."""
+    global _traces_file
+
+    if exporter_name == "file":
+        traces_path = os.getenv("OTEL_TRACES_FILE", "traces.jsonl")
+        _traces_file = open(traces_path, "a", encoding="utf-8")
+        logger.info(f"Exporting traces to file: {traces_path}")
+        return ConsoleSpanExporter(
+            out=_traces_file,
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    logger.info("Exporting traces to OTLP collector")
+    return OTLPSpanExporter()
+
+
+def setup_tracing() -> bool:
+    """
+    Configure the tracer provider and instrument MongoDB.
+
+    Must be called before the MongoDB client is created so that the pymongo
+    command listener is registered for it.
+
+    Returns:
+        True if tracing was enabled, False otherwise
+    """
+    global _tracer_provider
+
+    if os.getenv("OTEL_TRACING_ENABLED", "false").lower() != "true":
+        return False
+    if not OTEL_AVAILABLE:
+        logger.warning("OTEL_TRACING_ENABLED is set but OpenTelemetry is not installed; tracing disabled.")
+        return False
+    if _tracer_provider is not None:
+        return True
+
+    try:
+        provider = TracerProvider(
+            resource=Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", "neuroaegis-api")})
+        )
+        exporter_name = os.getenv("OTEL_TRACES_EXPORTER", "otlp").lower()
+        provider.add_span_processor(BatchSpanProcessor(_create_exporter(exporter_name)))
+        trace.set_tracer_provider(provider)
+
+        # Every command issued by Motor goes through pymongo's monitoring hooks
+        from opentelemetry.instrumentation.pymongo import PymongoInstrumentor
+        PymongoInstrumentor().instrument()
+
+        _tracer_provider = provider
+        logger.info("OpenTelemetry tracing enabled")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to set up OpenTelemetry tracing: {str(e)}", exc_info=True)
+        return False
+
+
+def instrument_app(app: Any) -> None:
+    """Create a span for every request handled by the FastAPI application."""
+    if not tracing_enabled():
+        return
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="metrics,health")
+
+
+def instrument_http_client(client: Any) -> Any:
+    """
+    Create a span for every request sent by an httpx client.
+
+    Args:
+        client: httpx.Client instance (e.g. the OpenAI client's transport)
+
+    Returns:
+        The same client, instrumented when tracing is enabled
+    """
+    if tracing_enabled():
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+        HTTPXClientInstrumentor.instrument_client(client)
+    return client
+
+
+def span(name: str, **attributes: Any) -> ContextManager[Optional[Any]]:
+    """
+    Start a span as the current span, or do nothing when tracing is disabled.
+
+    Args:
+        name: Span name
+        **attributes: Span attributes
+
+    Returns:
+        Context manager yielding the span (or None)
+    """
+    if not tracing_enabled():
+        return nullcontext()
+    return trace.get_tracer(__name__).start_as_current_span(name, attributes=attributes or None)
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and release exporter resources."""
+    global _tracer_provider, _traces_file
+
+    if _tracer_provider is not None:
+        _tracer_provider.shutdown()
+        _tracer_provider = None
+    if _traces_file is not None:
+        _traces_file.close()
+        _traces_file = None
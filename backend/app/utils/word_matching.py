@@ -0,0 +1,238 @@
+"""
+Typo-tolerant matching of recalled words against a target list.
+
+A WordMatcher is built once per target list (and cached), with:
+
+- an exact index of normalized targets,
+- a variant index of light stems, so plurals and simple inflections
+  ("apples", "running" vs. "run") match their target,
+- a symmetric-deletion index for near misses within an edit-distance
+  bound set by the length of the shorter word, confirmed with a banded
+  Levenshtein that gives up as soon as the bound is exceeded.
+
+Each target can be matched once; every answer is reported with its match
+type so the frontend can explain the score.
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from app.utils.lexicon import normalize_word
+
+# Match types reported per answer
+MATCH_EXACT = "exact"
+MATCH_VARIANT = "variant"
+MATCH_TYPO = "typo"
+MATCH_DUPLICATE = "duplicate"
+MATCH_NONE = "none"
+
+# Inflection suffixes removed by the light stemmer
+_SUFFIXES = (("ies", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", ""))
+_SIBILANTS = ("s", "x", "z", "ch", "sh")
+
+# Largest edit distance accepted as a typo (see max_typo_distance)
+MAX_TYPO_DISTANCE = 2
+
+# Number of cached matchers (one per distinct target list)
+MATCHER_CACHE_SIZE = 1024
+
+
+def max_typo_distance(word: str) -> int:
+    """Allowed edit distance for a word: none for short words, 1 up to 8 letters, else 2."""
+    if len(word) <= 4:
+        return 0
+    if len(word) <= 8:
+        return 1
+    return 2
+
+
+def stem(word: str) -> str:
+    """
+    Reduce a word to a light stem shared by its plural and simple inflections.
+
+    The stem is only used as an index key, so it need not be a real word
+    ("houses" and "house" both become "hous").
+    """
+    for suffix, replacement in _SUFFIXES:
+        if not word.endswith(suffix) or len(word) - len(suffix) < 3 or word.endswith(("ss", "us", "is")):
+            continue
+        base = word[:-len(suffix)]
+        if suffix == "es" and not base.endswith(_SIBILANTS):
+            base = word[:-1]
+        if suffix in ("ing", "ed") and len(base) > 3 and base[-1] == base[-2] and base[-1] not in "lsz":
+            base = base[:-1]  # running -> run
+        word = base + replacement
+        break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def bounded_levenshtein(a: str, b: str, bound: int) -> Optional[int]:
+    """
+    Levenshtein distance between `a` and `b` if it is at most `bound`.
+
+    Only the diagonal band of width 2 * bound + 1 is computed, and the
+    computation stops as soon as every cell in a row exceeds the bound.
+
+    Returns:
+        The distance, or None if it exceeds `bound`
+    """
+    if abs(len(a) - len(b)) > bound:
+        return None
+    # A shared prefix and suffix never change the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return len(b) if len(b) <= bound else None
+    too_far = bound + 1
+    previous = [j if j <= bound else too_far for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        low, high = max(1, i - bound), min(len(b), i + bound)
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= bound else too_far
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value if value <= bound else too_far
+            row_min = min(row_min, current[j])
+        if row_min > bound:
+            return None
+        previous = current
+    return previous[len(b)] if previous[len(b)] <= bound else None
+
+
+def _deletions(word: str, depth: int) -> Set[str]:
+    """All strings obtained from `word` by deleting up to `depth` characters (including itself)."""
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {
+            variant[:i] + variant[i + 1:]
+            for variant in frontier if len(variant) > 1
+            for i in range(len(variant))
+        }
+        found |= frontier
+    return found
+
+
+class DeletionIndex:
+    """
+    Symmetric-deletion index for bounded edit-distance search.
+
+    Two words within edit distance d share a string reachable from each by
+    at most d deletions, so candidates are found with a few dictionary
+    lookups and then confirmed with bounded_levenshtein.
+    """
+
+    def __init__(self, words: Sequence[str], max_distance: int):
+        self.max_distance = max_distance
+        self._index: Dict[str, Set[str]] = {}
+        for word in words:
+            for variant in _deletions(word, max_distance):
+                self._index.setdefault(variant, set()).add(word)
+
+    def search(self, word: str, bound: int) -> List[Tuple[int, str]]:
+        """Return (distance, word) pairs within `bound` of `word`, closest first."""
+        bound = min(bound, self.max_distance)
+        candidates = set()
+        for variant in _deletions(word, bound):
+            candidates |= self._index.get(variant, set())
+        results = []
+        for candidate in candidates:
+            distance = bounded_levenshtein(word, candidate, bound)
+            if distance is not None:
+                results.append((distance, candidate))
+        return sorted(results)
+
+
+class WordMatcher:
+    """Matches answers against a fixed list of target words."""
+
+    def __init__(self, targets: Sequence[str]):
+        self.targets = list(targets)
+        self._exact: Dict[str, int] = {}
+        self._variants: Dict[str, int] = {}
+        for index, target in enumerate(self.targets):
+            normalized = normalize_word(target)
+            self._exact.setdefault(normalized, index)
+            self._variants.setdefault(stem(normalized), index)
+        self._near = DeletionIndex(list(self._exact), MAX_TYPO_DISTANCE)
+
+    def candidates(self, answer: str) -> List[Tuple[int, str]]:
+        """
+        Targets an answer may refer to, best first.
+
+        Args:
+            answer: Word as entered by the user
+
+        Returns:
+            (target index, match type) pairs
+        """
+        normalized = normalize_word(answer)
+        if not normalized:
+            return []
+        if normalized in self._exact:
+            return [(self._exact[normalized], MATCH_EXACT)]
+        found = []
+        variant = self._variants.get(stem(normalized))
+        if variant is not None:
+            found.append((variant, MATCH_VARIANT))
+        bound = max_typo_distance(normalized)
+        if bound:
+            for distance, word in self._near.search(normalized, bound):
+                # The bound of the shorter word applies, so "treez" is not "tree"
+                if distance <= max_typo_distance(word):
+                    found.append((self._exact[word], MATCH_TYPO))
+        return found
+
+    def match(self, answers: Sequence[str]) -> Tuple[List[int], List[Dict]]:
+        """
+        Match answers to targets, each target at most once.
+
+        Args:
+            answers: Words as entered by the user, in order
+
+        Returns:
+            Tuple of (matched target indexes in answer order, per-answer
+            report with answer, target and match_type)
+        """
+        matched: List[int] = []
+        taken = set()
+        report = []
+        for answer in answers:
+            target_index, match_type = None, MATCH_NONE
+            candidates = self.candidates(answer)
+            for index, candidate_type in candidates:
+                if index not in taken:
+                    target_index, match_type = index, candidate_type
+                    break
+            if target_index is None and candidates:
+                target_index, match_type = candidates[0][0], MATCH_DUPLICATE
+            elif target_index is not None:
+                taken.add(target_index)
+                matched.append(target_index)
+            report.append({
+                "answer": answer,
+                "target": self.targets[target_index] if target_index is not None else None,
+                "match_type": match_type
+            })
+        return matched, report
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def _cached_matcher(targets: Tuple[str, ...]) -> WordMatcher:
+    return WordMatcher(targets)
+
+
+def get_word_matcher(targets: Sequence[str]) -> WordMatcher:
+    """Get the (cached) matcher for a target list; indexes are built once per exercise."""
+    return _cached_matcher(tuple(targets))
@@ -8,7 +8,7 @@ import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.staticfiles import StaticFiles
@@ -19,28 +19,52 @@ from dotenv import load_dotenv
 from app.api import auth_router, language_router, cognitive_training_router, resources_router, ai_router
 
 # Import database utilities
-from app.db import connect_to_mongodb, close_mongodb_connection
+from app.db import connect_to_mongodb, close_mongodb_connection, ensure_indexes, verify_query_plans
 
 # Import OpenAI initialization
 from app.ai.openai_init import initialize_openai_api
 
+# Import monitoring utilities
+from app.utils.metrics import PROMETHEUS_AVAILABLE, PrometheusMiddleware, render_metrics
+from app.utils.tracing import setup_tracing, instrument_app, shutdown_tracing
+from app.utils.logging_config import configure_logging, shutdown_logging
+from app.utils.passwords import warm_password_pool, shutdown_password_pool
+from app.services.session_writer import flush_session_writes
+from app.services.exercise_pool import start_exercise_pool, close_exercise_pool
+from app.services.cohort_percentiles import start_cohort_percentiles, close_cohort_percentiles
+
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.getLevelName(os.getenv("LOG_LEVEL", "INFO")),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+# Configure structured, queue-based logging (see app/utils/logging_config.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Set up optional tracing before the MongoDB client is created
+setup_tracing()
+
 # Define lifespan context manager for database connections
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan events for database connections and API initialization."""
     # Startup: Connect to MongoDB
     logger.info("Connecting to MongoDB...")
-    await connect_to_mongodb()
+    db = await connect_to_mongodb()
+
+    # Create required indexes (idempotent) and optionally verify hot query plans
+    if os.getenv("MONGODB_ENSURE_INDEXES", "true").lower() == "true":
+        await ensure_indexes(db)
+    if os.getenv("MONGODB_VERIFY_QUERY_PLANS", "false").lower() == "true":
+        await verify_query_plans(db)
+    
+    # Start the password hashing workers before the first login arrives
+    warm_password_pool()
+    
+    # Pre-generate exercises so /exercises only has to take one
+    await start_exercise_pool()
+    
+    # Load the cohort score sketches used for percentiles
+    await start_cohort_percentiles()
     
     # Initialize OpenAI API
     logger.info("Initializing OpenAI API with your API key...")
@@ -61,9 +85,22 @@ async def lifespan(app: FastAPI):
     
     yield
     
-    # Shutdown: Close MongoDB connection
+    # Shutdown: Write buffered training sessions, pooled exercises and cohort
+    # scores while the database is still connected
+    await flush_session_writes()
+    await close_exercise_pool()
+    await close_cohort_percentiles()
+    
+    # Close MongoDB connection
     logger.info("Closing MongoDB connection...")
     await close_mongodb_connection()
+    
+    # Stop password hashing workers
+    shutdown_password_pool()
+    
+    # Flush any pending trace spans and log records
+    shutdown_tracing()
+    shutdown_logging()
 
 # Create FastAPI app
 app = FastAPI(
@@ -73,6 +110,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Trace every request when tracing is enabled
+instrument_app(app)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -92,6 +132,12 @@ app.add_middleware(
     max_age=86400,  # Cache CORS preflight responses for 24 hours
 )
 
+# Record per-route latency and in-flight requests for /metrics
+if PROMETHEUS_AVAILABLE:
+    app.add_middleware(PrometheusMiddleware)
+else:
+    logger.warning("prometheus_client not installed; /metrics will be unavailable.")
+
 # Mount static files directory
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -157,15 +203,30 @@ async def diagnostic():
         "message": "API is functioning properly"
     }
 
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose Prometheus metrics for routes, AI calls and MongoDB commands."""
+    if not PROMETHEUS_AVAILABLE:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"message": "Metrics are not available: prometheus_client is not installed"},
+        )
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
 # Log all registered routes for debugging
-for route in app.routes:
-    logger.info(f"Registered route: {route.path}")
+if logger.isEnabledFor(logging.DEBUG):
+    logger.debug("Registered routes: %s", ", ".join(route.path for route in app.routes))
 
 # Error handling
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions."""
-    logger.error(f"HTTP error: {exc.detail}")
+    if exc.status_code >= 500:
+        logger.error("HTTP error %s: %s", exc.status_code, exc.detail)
+    else:
+        logger.info("HTTP error %s: %s", exc.status_code, exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
         content={"message": exc.detail},
@@ -174,7 +235,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors."""
-    logger.error(f"Validation error: {exc.errors()}")
+    logger.info("Validation error on %s: %s", request.url.path, exc.errors())
     
     # Convert validation errors to a serializable format
     error_details = []
@@ -194,7 +255,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions."""
-    logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
+    logger.error("Unexpected error: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"message": "Internal server error"},
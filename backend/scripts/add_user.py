@@ -12,8 +12,8 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from datetime import datetime
-from passlib.context import CryptContext
 from app.db import connect_to_mongodb, close_mongodb_connection, COLLECTION_USERS
+from app.utils.passwords import pwd_context
 
 # Configure logging
 logging.basicConfig(
@@ -22,9 +22,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 async def add_user(email, full_name, password):
     """Add a user to the database."""
     try:
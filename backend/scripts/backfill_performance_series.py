@@ -0,0 +1,99 @@
+"""
+Add training sessions missing from the performance time series (performance_series).
+
+Run once after deploying the time series to import existing history, or at
+any time to repair points whose write failed. Sessions already in the series
+are skipped, so the script is safe to rerun. Usage:
+    python scripts/backfill_performance_series.py            # all users
+    python scripts/backfill_performance_series.py --user ID  # a single user
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import (
+    connect_to_mongodb,
+    close_mongodb_connection,
+    COLLECTION_PERFORMANCE_SERIES,
+    COLLECTION_TRAINING_SESSIONS
+)
+from app.db.indexes import ensure_time_series_collections
+from app.services.performance_series import series_point
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Only the fields a series point is built from
+SESSION_PROJECTION = {
+    "user_id": 1, "exercise_type": 1, "difficulty": 1, "score": 1,
+    "accuracy": 1, "duration": 1, "end_time": 1, "created_at": 1
+}
+
+async def backfill_user(db, user_id, batch_size):
+    """Insert the points of one user's sessions that are not in the series yet."""
+    recorded = set(await db[COLLECTION_PERFORMANCE_SERIES].distinct("session_id", {"user_id": user_id}))
+    added = 0
+    batch = []
+    cursor = db[COLLECTION_TRAINING_SESSIONS].find({"user_id": user_id}, SESSION_PROJECTION)
+    async for session in cursor:
+        if session["_id"] in recorded:
+            continue
+        try:
+            batch.append(series_point(session))
+        except KeyError as e:
+            logger.warning(f"Skipping session {session['_id']} without {e}")
+            continue
+        if len(batch) >= batch_size:
+            await db[COLLECTION_PERFORMANCE_SERIES].insert_many(batch, ordered=False)
+            added += len(batch)
+            batch = []
+    if batch:
+        await db[COLLECTION_PERFORMANCE_SERIES].insert_many(batch, ordered=False)
+        added += len(batch)
+    return added
+
+async def backfill(user_id=None, batch_size=1000):
+    """Backfill the series for one user or for every user with sessions."""
+    try:
+        db = await connect_to_mongodb()
+        # The collection must exist as a time-series collection before the first insert
+        await ensure_time_series_collections(db)
+
+        if user_id:
+            user_ids = [user_id]
+        else:
+            user_ids = await db[COLLECTION_TRAINING_SESSIONS].distinct("user_id")
+        logger.info(f"Backfilling performance series for {len(user_ids)} users")
+
+        added = 0
+        for uid in user_ids:
+            added += await backfill_user(db, uid, batch_size)
+        logger.info(f"Added {added} performance series points")
+        return True
+    except Exception as e:
+        logger.error(f"Error backfilling performance series: {e}")
+        return False
+    finally:
+        await close_mongodb_connection()
+
+def main():
+    """Parse arguments and run the backfill."""
+    parser = argparse.ArgumentParser(description="Add missing training sessions to the performance time series")
+    parser.add_argument("--user", help="Only backfill the sessions of this user ID")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Points per insert")
+    args = parser.parse_args()
+
+    if not asyncio.run(backfill(args.user, args.batch_size)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
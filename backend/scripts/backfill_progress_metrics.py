@@ -0,0 +1,66 @@
+"""
+Rebuild per-user progress aggregates (user_metrics) from training sessions.
+
+Run once after deploying incremental progress aggregation, or at any time to
+repair aggregates. Usage:
+    python scripts/backfill_progress_metrics.py            # all users
+    python scripts/backfill_progress_metrics.py --user ID  # a single user
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import connect_to_mongodb, close_mongodb_connection, COLLECTION_TRAINING_SESSIONS
+from app.services.cognitive_training_service import CognitiveTrainingService
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+async def backfill(user_id=None, concurrency=8):
+    """Rebuild aggregates for one user or for every user with sessions."""
+    try:
+        db = await connect_to_mongodb()
+
+        if user_id:
+            user_ids = [user_id]
+        else:
+            user_ids = await db[COLLECTION_TRAINING_SESSIONS].distinct("user_id")
+        logger.info(f"Rebuilding progress metrics for {len(user_ids)} users")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def rebuild(uid):
+            async with semaphore:
+                return await CognitiveTrainingService.rebuild_progress_metrics(uid)
+
+        results = await asyncio.gather(*(rebuild(uid) for uid in user_ids))
+        rebuilt = sum(1 for result in results if result is not None)
+        logger.info(f"Rebuilt {rebuilt} aggregates ({len(user_ids) - rebuilt} users without sessions)")
+        return True
+    except Exception as e:
+        logger.error(f"Error rebuilding progress metrics: {e}")
+        return False
+    finally:
+        await close_mongodb_connection()
+
+def main():
+    """Parse arguments and run the backfill."""
+    parser = argparse.ArgumentParser(description="Rebuild progress aggregates from training sessions")
+    parser.add_argument("--user", help="Only rebuild the aggregate of this user ID")
+    parser.add_argument("--concurrency", type=int, default=8, help="Users rebuilt in parallel")
+    args = parser.parse_args()
+
+    if not asyncio.run(backfill(args.user, args.concurrency)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
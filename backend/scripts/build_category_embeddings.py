@@ -0,0 +1,162 @@
+"""
+Build the local embedding index used to validate Category Naming answers.
+
+Loads a spaCy model with word vectors (en_core_web_md or en_core_web_lg),
+exports the vectors of its lowercase vocabulary as a float16 matrix and
+computes a centroid and a similarity threshold for every category of the
+frontend's Category Naming data. The output directory is memory-mapped by
+the API (see app/utils/embeddings.py). Usage:
+    python scripts/build_category_embeddings.py
+    python scripts/build_category_embeddings.py --model en_core_web_lg --max-vocab 200000
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.embeddings import CATEGORY_EMBEDDINGS_DIR
+from app.utils.lexicon import normalize_word
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORY_DATA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "frontend", "src", "data", "categoryNamingData.js"
+)
+
+# Vocabulary entries exported from the model: lowercase words and simple compounds
+VOCAB_PATTERN = re.compile(r"^[a-z][a-z'-]{0,29}$")
+
+def load_categories(path):
+    """Read category IDs, names and word lists from categoryNamingData.js."""
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    categories = {}
+    pattern = re.compile(r"id:\s*'([^']+)',\s*name:\s*'([^']+)',\s*words:\s*(\[[^\]]*\])", re.S)
+    for category_id, name, words in pattern.findall(source):
+        categories[category_id] = {"name": name, "words": json.loads(words)}
+    return categories
+
+def build(model_name, category_data_path, output_dir, max_vocab, percentile, min_threshold):
+    """Export the vectors and category centroids to `output_dir`."""
+    try:
+        import marisa_trie
+        import numpy as np
+        import spacy
+    except ImportError as e:
+        logger.error(f"Missing dependency ({e}); install requirements.txt")
+        return False
+
+    try:
+        nlp = spacy.load(model_name)
+    except OSError as e:
+        logger.error(f"Error loading spaCy model {model_name}: {e}")
+        return False
+    if nlp.vocab.vectors.shape[0] == 0:
+        logger.error(f"Model {model_name} has no word vectors")
+        return False
+
+    categories = load_categories(category_data_path)
+    if not categories:
+        logger.error(f"No categories found in {category_data_path}")
+        return False
+
+    # Vocabulary -> row in the model's vector table
+    table = nlp.vocab.vectors
+    vocab_rows = {}
+    for key, row in table.key2row.items():
+        if len(vocab_rows) >= max_vocab:
+            break
+        try:
+            word = nlp.vocab.strings[key]
+        except KeyError:
+            continue
+        if VOCAB_PATTERN.match(word):
+            vocab_rows.setdefault(word, int(row))
+    # Banked words must be present even if they fall outside max_vocab
+    for info in categories.values():
+        for word in info["words"]:
+            for token in normalize_word(word).split():
+                if token not in vocab_rows and nlp.vocab.has_vector(token):
+                    vocab_rows[token] = int(table.key2row[nlp.vocab.strings[token]])
+    logger.info(f"Exporting {len(vocab_rows)} words from {model_name}")
+
+    # Keep only the rows in use, normalized so dot products are cosine similarities
+    used_rows = sorted(set(vocab_rows.values()))
+    compact = {row: index for index, row in enumerate(used_rows)}
+    vectors = np.asarray(table.data[used_rows], dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms > 0, norms, 1)
+
+    vocab = marisa_trie.Trie(vocab_rows.keys())
+    rows = np.empty(len(vocab), dtype=np.int32)
+    for word, row in vocab_rows.items():
+        rows[vocab.key_id(word)] = compact[row]
+
+    def phrase_vector(text):
+        token_vectors = [
+            vectors[compact[vocab_rows[token]]]
+            for token in normalize_word(text).split() if token in vocab_rows
+        ]
+        if not token_vectors:
+            return None
+        vector = np.mean(token_vectors, axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+    # Centroid of each category's banked words, and the similarity most of them reach
+    centroids = []
+    for category_id, info in list(categories.items()):
+        word_vectors = [v for v in (phrase_vector(word) for word in info["words"]) if v is not None]
+        if not word_vectors:
+            logger.warning(f"{category_id}: no words with vectors, skipping category")
+            del categories[category_id]
+            continue
+        centroid = np.mean(word_vectors, axis=0)
+        centroid = centroid / np.linalg.norm(centroid)
+        similarities = np.asarray(word_vectors) @ centroid
+        info["threshold"] = float(max(min_threshold, np.percentile(similarities, percentile)))
+        centroids.append(centroid)
+        logger.info(
+            f"{category_id}: {len(word_vectors)}/{len(info['words'])} words with vectors, "
+            f"threshold {info['threshold']:.3f}"
+        )
+
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, "vectors.npy"), vectors.astype(np.float16))
+    np.save(os.path.join(output_dir, "rows.npy"), rows)
+    np.save(os.path.join(output_dir, "centroids.npy"), np.asarray(centroids, dtype=np.float32))
+    vocab.save(os.path.join(output_dir, "vocab.marisa"))
+    with open(os.path.join(output_dir, "categories.json"), "w", encoding="utf-8") as f:
+        json.dump({"model": model_name, "categories": categories}, f, indent=2)
+
+    logger.info(f"Wrote embedding index to {output_dir} ({vectors.shape[0]} vectors x {vectors.shape[1]} dims)")
+    return True
+
+def main():
+    """Parse arguments and build the index."""
+    parser = argparse.ArgumentParser(description="Build the Category Naming embedding index")
+    parser.add_argument("--model", default="en_core_web_md", help="spaCy model with word vectors")
+    parser.add_argument("--category-data", default=DEFAULT_CATEGORY_DATA, help="Path to categoryNamingData.js")
+    parser.add_argument("--output", default=CATEGORY_EMBEDDINGS_DIR, help="Output directory")
+    parser.add_argument("--max-vocab", type=int, default=200000, help="Maximum number of vocabulary words")
+    parser.add_argument("--percentile", type=float, default=5.0,
+                        help="Percentile of banked words' similarity used as the category threshold")
+    parser.add_argument("--min-threshold", type=float, default=0.25, help="Lowest allowed threshold")
+    args = parser.parse_args()
+
+    if not build(args.model, args.category_data, args.output, args.max_vocab, args.percentile, args.min_threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Build the category lexicon used to validate Language Fluency answers.
+
+Reads the Language Fluency word banks shipped with the frontend and writes a
+marisa-trie file that the API memory-maps at runtime (see
+app/utils/lexicon.py). Rerun after changing the word banks.
+Usage:
+    python scripts/build_category_lexicon.py
+    python scripts/build_category_lexicon.py --word-banks path/to/languageFluencyWordBanks.js --output data/category_lexicon.marisa
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.lexicon import CATEGORY_LEXICON_PATH, lexicon_key, normalize_word
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORD_BANKS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "frontend", "src", "components", "cognitive-games", "languageFluencyWordBanks.js"
+)
+
+def load_word_banks(path):
+    """Load the word banks object literal from the frontend JS module."""
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    # The module is a single JSON-compatible object literal
+    return json.loads(source[source.index("{"):source.rindex("}") + 1])
+
+def lexicon_keys(word_banks):
+    """Yield trie keys for every banked word (difficulty -> category -> letter -> words)."""
+    for categories in word_banks.values():
+        for category, letters in categories.items():
+            for words in letters.values():
+                for word in words:
+                    normalized = normalize_word(word)
+                    if normalized:
+                        yield lexicon_key(category, normalized)
+
+def build(word_banks_path, output_path):
+    """Build the trie and write it to `output_path`."""
+    try:
+        import marisa_trie
+    except ImportError:
+        logger.error("marisa-trie is not installed (pip install -r requirements.txt)")
+        return False
+
+    try:
+        keys = set(lexicon_keys(load_word_banks(word_banks_path)))
+    except (OSError, ValueError) as e:
+        logger.error(f"Error reading word banks from {word_banks_path}: {e}")
+        return False
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    trie = marisa_trie.Trie(keys)
+    trie.save(output_path)
+    logger.info(f"Wrote {len(trie)} lexicon entries to {output_path} ({os.path.getsize(output_path)} bytes)")
+    return True
+
+def main():
+    """Parse arguments and build the lexicon."""
+    parser = argparse.ArgumentParser(description="Build the Language Fluency category lexicon")
+    parser.add_argument("--word-banks", default=DEFAULT_WORD_BANKS, help="Path to languageFluencyWordBanks.js")
+    parser.add_argument("--output", default=CATEGORY_LEXICON_PATH, help="Output marisa-trie file")
+    args = parser.parse_args()
+
+    if not build(args.word_banks, args.output):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ import argparse
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db import connect_to_mongodb, close_mongodb_connection
+from app.db import ensure_indexes, verify_query_plans, QueryPlanError
 from app.db import (
     COLLECTION_USERS,
     COLLECTION_ANALYSIS_RESULTS,
@@ -87,6 +88,35 @@ async def delete_collection(collection_name):
     except Exception as e:
         logger.error(f"Error deleting collection: {e}")
 
+async def create_indexes():
+    """Create the required indexes on every collection."""
+    try:
+        db = await connect_to_mongodb()
+        created = await ensure_indexes(db)
+        for collection_name, index_names in created.items():
+            logger.info(f"Collection '{collection_name}' indexes: {index_names}")
+        await close_mongodb_connection()
+    except Exception as e:
+        logger.error(f"Error creating indexes: {e}")
+
+async def explain_queries():
+    """Explain the hot queries and fail if any of them uses a COLLSCAN."""
+    try:
+        db = await connect_to_mongodb()
+        plans = await verify_query_plans(db)
+        for query, stages in plans.items():
+            logger.info(f"{query}: {' <- '.join(stages)}")
+        logger.info("All hot queries use an index.")
+        return True
+    except QueryPlanError as e:
+        logger.error(str(e))
+        return False
+    except Exception as e:
+        logger.error(f"Error explaining queries: {e}")
+        return False
+    finally:
+        await close_mongodb_connection()
+
 def main():
     """Parse arguments and run the appropriate function."""
     parser = argparse.ArgumentParser(description="Database utilities")
@@ -102,6 +132,10 @@ def main():
     delete_parser = subparsers.add_parser("delete", help="Delete a collection")
     delete_parser.add_argument("collection", help="Collection name or 'all' to delete all collections")
     
+    # Index commands
+    subparsers.add_parser("indexes", help="Create required indexes (idempotent)")
+    subparsers.add_parser("explain", help="Check that hot queries do not use a COLLSCAN")
+    
     args = parser.parse_args()
     
     if args.command == "list":
@@ -110,6 +144,11 @@ def main():
         asyncio.run(count_documents())
     elif args.command == "delete":
         asyncio.run(delete_collection(args.collection))
+    elif args.command == "indexes":
+        asyncio.run(create_indexes())
+    elif args.command == "explain":
+        if not asyncio.run(explain_queries()):
+            sys.exit(1)
     else:
         parser.print_help()
 
@@ -0,0 +1,91 @@
+"""
+Rebuild the cohort percentile sketches (cohort_sketches) from stored history.
+
+Run once after deploying cohort percentiles to seed the sketches with every
+existing analysis and training session, or at any time to rebuild them after
+users' ages changed. Scores that running servers add during the rebuild are
+merged on top of the rebuilt sketches. Usage:
+    python scripts/rebuild_cohort_sketches.py
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import (
+    connect_to_mongodb,
+    close_mongodb_connection,
+    COLLECTION_ANALYSES,
+    COLLECTION_TRAINING_SESSIONS,
+    COLLECTION_USERS
+)
+from app.services.cohort_percentiles import (
+    COHORT_SKETCH_K,
+    CohortPercentiles,
+    SOURCE_ANALYSIS,
+    SOURCE_TRAINING,
+    training_domain_score
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+async def load_ages(db):
+    """Age of every user who has one, by user ID."""
+    ages = {}
+    async for user in db[COLLECTION_USERS].find({"age": {"$ne": None}}, {"id": 1, "age": 1}):
+        ages[user.get("id") or str(user["_id"])] = user["age"]
+    return ages
+
+async def rebuild(k):
+    """Rebuild every cohort sketch from analyses and training sessions."""
+    try:
+        db = await connect_to_mongodb()
+        ages = await load_ages(db)
+        cohorts = CohortPercentiles(k, flush_interval=0, min_size=0)
+
+        analyses = 0
+        async for analysis in db[COLLECTION_ANALYSES].find({}, {"user_id": 1, "domain_scores": 1}):
+            age = ages.get(analysis.get("user_id"))
+            for domain, score in (analysis.get("domain_scores") or {}).items():
+                cohorts.add(SOURCE_ANALYSIS, domain, age, score)
+            analyses += 1
+
+        sessions = 0
+        cursor = db[COLLECTION_TRAINING_SESSIONS].find({}, {"user_id": 1, "exercise_type": 1, "accuracy": 1})
+        async for session in cursor:
+            domain_score = training_domain_score(session)
+            if domain_score is None:
+                continue
+            domain, score = domain_score
+            cohorts.add(SOURCE_TRAINING, domain, ages.get(session.get("user_id")), score)
+            sessions += 1
+
+        stored = await cohorts.replace_stored()
+        logger.info(f"Rebuilt {stored} cohort sketches from {analyses} analyses and {sessions} sessions")
+        return True
+    except Exception as e:
+        logger.error(f"Error rebuilding cohort sketches: {e}")
+        return False
+    finally:
+        await close_mongodb_connection()
+
+def main():
+    """Parse arguments and run the rebuild."""
+    parser = argparse.ArgumentParser(description="Rebuild cohort percentile sketches from stored scores")
+    parser.add_argument("--k", type=int, default=COHORT_SKETCH_K, help="Sketch accuracy parameter")
+    args = parser.parse_args()
+
+    if not asyncio.run(rebuild(args.k)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
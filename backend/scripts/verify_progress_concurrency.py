@@ -0,0 +1,122 @@
+"""
+Verify that progress aggregation does not lose updates under concurrency.
+
+Submits many sessions for a throwaway user concurrently through
+CognitiveTrainingService.record_sessions_progress and checks that the
+resulting aggregate matches the sessions exactly. The test user's aggregate
+is deleted afterwards. Usage:
+    python scripts/verify_progress_concurrency.py --sessions 200
+"""
+import argparse
+import asyncio
+import logging
+import math
+import os
+import random
+import sys
+import uuid
+from datetime import datetime
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import connect_to_mongodb, close_mongodb_connection, COLLECTION_USER_METRICS
+from app.models.training import ExerciseType
+from app.services.cognitive_training_service import (
+    CognitiveTrainingService,
+    PERFORMANCE_TREND_LENGTH,
+    _accuracy_percent,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+EXERCISE_TYPES = [
+    ExerciseType.WORD_RECALL,
+    ExerciseType.LANGUAGE_FLUENCY,
+    ExerciseType.MEMORY_MATCH,
+    ExerciseType.CATEGORY_NAMING,
+    ExerciseType.SEQUENCE_ORDERING,
+]
+
+async def verify(session_count):
+    """Run the concurrent submissions and compare the aggregate with the expected values."""
+    user_id = f"concurrency-check-{uuid.uuid4()}"
+    rng = random.Random(42)
+    submissions = []
+    for _ in range(session_count):
+        exercise_type = rng.choice(EXERCISE_TYPES)
+        accuracy = rng.randint(0, 100)
+        duration = rng.randint(10, 300)
+        submissions.append((exercise_type, accuracy, duration))
+
+    db = await connect_to_mongodb()
+    try:
+        async def submit(exercise_type, accuracy, duration):
+            session = {
+                "user_id": user_id,
+                "exercise_id": str(uuid.uuid4()),
+                "exercise_type": exercise_type.value,
+                "accuracy": accuracy,
+                "duration": duration,
+                "end_time": datetime.utcnow(),
+            }
+            await CognitiveTrainingService.record_sessions_progress(user_id, [session])
+
+        # All submissions start together, including the very first upsert
+        await asyncio.gather(*(submit(*submission) for submission in submissions))
+
+        aggregate = await db[COLLECTION_USER_METRICS].find_one({"user_id": user_id})
+        duplicates = await db[COLLECTION_USER_METRICS].count_documents({"user_id": user_id})
+
+        errors = []
+        if duplicates != 1:
+            errors.append(f"expected 1 aggregate document, found {duplicates}")
+        if aggregate["total_sessions"] != session_count:
+            errors.append(f"total_sessions {aggregate['total_sessions']} != {session_count}")
+        expected_time = sum(duration for _, _, duration in submissions)
+        if not math.isclose(aggregate["total_time_spent"], expected_time, abs_tol=1e-3 * session_count):
+            errors.append(f"total_time_spent {aggregate['total_time_spent']} != {expected_time}")
+
+        for exercise_type in EXERCISE_TYPES:
+            # Stored as percentages: an accuracy of 0 or 1 is read as a fraction
+            accuracies = [_accuracy_percent(acc) for ex, acc, _ in submissions if ex == exercise_type]
+            if not accuracies:
+                continue
+            stats = aggregate["exercise_stats"][exercise_type.value]
+            if stats["count"] != len(accuracies):
+                errors.append(f"{exercise_type.value} count {stats['count']} != {len(accuracies)}")
+            if not math.isclose(stats["accuracy_sum"], sum(accuracies)):
+                errors.append(f"{exercise_type.value} accuracy_sum {stats['accuracy_sum']} != {sum(accuracies)}")
+            expected_average = sum(accuracies) / len(accuracies)
+            if not math.isclose(aggregate["average_scores"][exercise_type.value], expected_average):
+                errors.append(f"{exercise_type.value} average {aggregate['average_scores'][exercise_type.value]} != {expected_average}")
+            trend = aggregate["performance_trends"][exercise_type.value]
+            if len(trend) != min(len(accuracies), PERFORMANCE_TREND_LENGTH):
+                errors.append(f"{exercise_type.value} trend length {len(trend)}")
+
+        if errors:
+            for error in errors:
+                logger.error(error)
+            return False
+        logger.info(f"Aggregate is exact after {session_count} concurrent submissions")
+        return True
+    finally:
+        await db[COLLECTION_USER_METRICS].delete_many({"user_id": user_id})
+        await close_mongodb_connection()
+
+def main():
+    """Parse arguments and run the verification."""
+    parser = argparse.ArgumentParser(description="Verify progress aggregation under concurrent submissions")
+    parser.add_argument("--sessions", type=int, default=200, help="Number of concurrent submissions")
+    args = parser.parse_args()
+
+    if not asyncio.run(verify(args.sessions)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()